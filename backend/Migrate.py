@@ -1,5 +1,7 @@
 from sqlalchemy import create_engine, text
 from dotenv import load_dotenv
+from datetime import datetime, timedelta, timezone
+import hashlib
 import os
 
 load_dotenv()
@@ -7,6 +9,10 @@ load_dotenv()
 DATABASE_URL = os.getenv("DATABASE_URL")
 engine = create_engine(DATABASE_URL)
 
+BACKFILL_BATCH_SIZE = int(os.getenv("MIGRATION_BATCH_SIZE", 1000))
+AUDIT_PARTITION_PREMAKE_MONTHS = int(os.getenv("AUDIT_PARTITION_PREMAKE_MONTHS", 2))
+SIGNING_TOKEN_EXPIRE_HOURS = int(os.getenv("SIGNING_TOKEN_EXPIRE_HOURS", 72))
+
 
 def find_signer_table(conn):
     result = conn.execute(text("""
@@ -31,6 +37,185 @@ def find_signer_table(conn):
     return None
 
 
+def column_exists(conn, table, column):
+    return conn.execute(text("""
+        SELECT 1 FROM information_schema.columns
+        WHERE table_name = :table AND column_name = :column
+    """), {"table": table, "column": column}).scalar() is not None
+
+
+def move_signing_links(conn, signer_table):
+    """
+    Move links stored on signer rows into signing_links as sha256 digests,
+    one committed batch at a time so the table is never locked for the
+    whole backfill. Digests written in place by an earlier version of
+    this step (signing_token_hash) are moved too.
+    """
+    default_expiry = datetime.utcnow() + timedelta(hours=SIGNING_TOKEN_EXPIRE_HOURS)
+    sources = (
+        ("signing_token", lambda token: hashlib.sha256(token.encode("utf-8")).hexdigest()),
+        ("signing_token_hash", lambda digest: digest),
+    )
+
+    total = 0
+    for column, to_digest in sources:
+        if not column_exists(conn, signer_table, column):
+            continue
+
+        while True:
+            rows = conn.execute(text(f"""
+                SELECT id, {column}, token_expires_at FROM {signer_table}
+                WHERE {column} IS NOT NULL
+                ORDER BY id
+                LIMIT :limit
+            """), {"limit": BACKFILL_BATCH_SIZE}).fetchall()
+            if not rows:
+                break
+
+            conn.execute(
+                text("""
+                    INSERT INTO signing_links (digest, signer_id, expires_at)
+                    VALUES (:digest, :signer_id, :expires_at)
+                    ON CONFLICT (digest) DO NOTHING
+                """),
+                [
+                    {"digest": to_digest(value), "signer_id": row_id, "expires_at": expires_at or default_expiry}
+                    for row_id, value, expires_at in rows
+                ]
+            )
+            conn.execute(
+                text(f"UPDATE {signer_table} SET {column} = NULL WHERE id = :id"),
+                [{"id": row_id} for row_id, _, _ in rows]
+            )
+            conn.commit()
+            total += len(rows)
+            print(f"  🔄 Moved {total} signing link(s)")
+
+    return total
+
+
+def add_months(month, months):
+    index = month.year * 12 + month.month - 1 + months
+    return month.replace(year=index // 12, month=index % 12 + 1, day=1)
+
+
+def month_bound(month):
+    # Explicit UTC, so bounds don't depend on the session's TimeZone.
+    return datetime(month.year, month.month, 1, tzinfo=timezone.utc)
+
+
+def utc_date(moment):
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc)
+    return moment.date()
+
+
+def partition_audit_logs(conn):
+    """
+    Rebuild audit_logs as a table partitioned by month on created_at.
+    The old table is renamed and its rows copied one month per
+    transaction, then it is dropped. The id sequence is kept, so ids
+    continue. Safe to re-run if interrupted during the copy.
+    """
+    relkind = conn.execute(text(
+        "SELECT relkind FROM pg_class WHERE oid = to_regclass('audit_logs')"
+    )).scalar()
+    if relkind is None:
+        print("  ⚠️  audit_logs does not exist - start the app once, then re-run")
+        return
+
+    if relkind != "p":
+        conn.execute(text("ALTER TABLE audit_logs RENAME TO audit_logs_unpartitioned"))
+        index_names = conn.execute(text(
+            "SELECT indexname FROM pg_indexes WHERE tablename = 'audit_logs_unpartitioned'"
+        )).scalars().all()
+        for index_name in index_names:
+            conn.execute(text(f"ALTER INDEX {index_name} RENAME TO {index_name}_unpartitioned"))
+
+        conn.execute(text("""
+            CREATE TABLE audit_logs (
+                id INTEGER NOT NULL DEFAULT nextval('audit_logs_id_seq'),
+                action VARCHAR(100) NOT NULL,
+                description TEXT,
+                ip_address VARCHAR(50),
+                user_agent VARCHAR(500),
+                user_id INTEGER REFERENCES users(id),
+                document_id INTEGER REFERENCES documents(id),
+                created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+                chain_seq INTEGER,
+                prev_hash VARCHAR(64),
+                entry_hash VARCHAR(64),
+                PRIMARY KEY (id, created_at)
+            ) PARTITION BY RANGE (created_at)
+        """))
+        conn.execute(text("ALTER SEQUENCE audit_logs_id_seq OWNED BY audit_logs.id"))
+        conn.execute(text("CREATE INDEX ix_audit_logs_id ON audit_logs (id)"))
+        conn.execute(text("CREATE INDEX ix_audit_logs_user_keyset ON audit_logs (user_id, created_at, id)"))
+        conn.execute(text("CREATE INDEX ix_audit_logs_document_keyset ON audit_logs (document_id, created_at, id)"))
+        conn.execute(text("CREATE INDEX ix_audit_logs_created_at ON audit_logs (created_at)"))
+        conn.execute(text("CREATE INDEX ix_audit_logs_document_chain ON audit_logs (document_id, chain_seq)"))
+        conn.execute(text("CREATE TABLE audit_logs_default PARTITION OF audit_logs DEFAULT"))
+
+        oldest = conn.execute(text(
+            "SELECT min(created_at) FROM audit_logs_unpartitioned"
+        )).scalar() or datetime.utcnow()
+        first_month = utc_date(oldest).replace(day=1)
+        last_month = add_months(datetime.utcnow().date().replace(day=1), AUDIT_PARTITION_PREMAKE_MONTHS)
+
+        month = first_month
+        while month <= last_month:
+            conn.execute(text(
+                f"CREATE TABLE audit_logs_y{month.year}m{month.month:02d} PARTITION OF audit_logs "
+                f"FOR VALUES FROM ('{month_bound(month).isoformat()}') "
+                f"TO ('{month_bound(add_months(month, 1)).isoformat()}')"
+            ))
+            month = add_months(month, 1)
+        conn.commit()
+        print(f"  ✅ Created monthly partitions {first_month:%Y-%m} → {last_month:%Y-%m}")
+
+    if conn.execute(text("SELECT to_regclass('audit_logs_unpartitioned')")).scalar() is None:
+        print("  ✅ audit_logs is already partitioned")
+        return
+
+    # A table created by the app already carries the hash chain columns.
+    has_chain = conn.execute(text("""
+        SELECT 1 FROM information_schema.columns
+        WHERE table_name = 'audit_logs_unpartitioned' AND column_name = 'entry_hash'
+    """)).scalar() is not None
+    chain_columns = ", chain_seq, prev_hash, entry_hash" if has_chain else ""
+
+    copy_sql = f"""
+        INSERT INTO audit_logs
+            (id, action, description, ip_address, user_agent, user_id, document_id, created_at{chain_columns})
+        SELECT id, action, description, ip_address, user_agent, user_id, document_id, COALESCE(created_at, now()){chain_columns}
+        FROM audit_logs_unpartitioned
+        WHERE {{condition}}
+        ON CONFLICT DO NOTHING
+    """
+    bounds = conn.execute(text(
+        "SELECT min(created_at), max(created_at) FROM audit_logs_unpartitioned"
+    )).one()
+
+    copied = 0
+    if bounds[0] is not None:
+        month = utc_date(bounds[0]).replace(day=1)
+        while month <= utc_date(bounds[1]):
+            result = conn.execute(
+                text(copy_sql.format(condition="created_at >= :start AND created_at < :end")),
+                {"start": month_bound(month), "end": month_bound(add_months(month, 1))}
+            )
+            conn.commit()
+            copied += result.rowcount
+            month = add_months(month, 1)
+
+    result = conn.execute(text(copy_sql.format(condition="created_at IS NULL")))
+    copied += result.rowcount
+
+    conn.execute(text("DROP TABLE audit_logs_unpartitioned"))
+    conn.commit()
+    print(f"  ✅ Copied {copied} audit log row(s) into partitions")
+
+
 def run_migration(conn, description, sql):
     try:
         conn.execute(text(sql))
@@ -49,7 +234,7 @@ def migrate():
 
     with engine.connect() as conn:
 
-        print("\n📐 [1/4] Signatures table - width & height columns")
+        print("\n📐 [1/13] Signatures table - width & height columns")
         run_migration(conn,
             "Add 'width' column",
             "ALTER TABLE signatures ADD COLUMN IF NOT EXISTS width FLOAT DEFAULT 150.0"
@@ -60,7 +245,7 @@ def migrate():
         )
 
 
-        print("\n🔐 [2/4] Users table - Google OAuth columns")
+        print("\n🔐 [2/13] Users table - Google OAuth columns")
         run_migration(conn,
             "Add 'google_id' column",
             "ALTER TABLE users ADD COLUMN IF NOT EXISTS google_id VARCHAR UNIQUE"
@@ -71,7 +256,7 @@ def migrate():
         )
 
 
-        print("\n🔑 [3/4] Users table - Password reset columns")
+        print("\n🔑 [3/13] Users table - Password reset columns")
         run_migration(conn,
             "Add 'reset_token' column",
             "ALTER TABLE users ADD COLUMN IF NOT EXISTS reset_token VARCHAR(255) UNIQUE"
@@ -82,7 +267,7 @@ def migrate():
         )
 
 
-        print("\n❌ [4/4] Document signers table - Rejection columns")
+        print("\n❌ [4/13] Document signers table - Rejection columns")
         signer_table = find_signer_table(conn)
 
         if signer_table:
@@ -100,7 +285,7 @@ def migrate():
 
         conn.commit()
 
-        print("\n🏷️  [5/5] Document status enum - adding 'rejected'")
+        print("\n🏷️  [5/13] Document status enum - adding 'rejected'")
         try:
             with engine.connect() as enum_conn:
                 enum_conn.execute(text(
@@ -112,6 +297,103 @@ def migrate():
             err = str(e).split('\n')[0]
             print(f"  ⚠️  Enum update → {err}")
 
+        print("\n✍️  [6/13] Signatures table - vector stroke column")
+        run_migration(conn,
+            "Add 'signature_strokes' column",
+            "ALTER TABLE signatures ADD COLUMN IF NOT EXISTS signature_strokes TEXT"
+        )
+        conn.commit()
+
+        print("\n⏰ [7/13] Document signers table - reminder digest column")
+        signer_table = find_signer_table(conn)
+        if signer_table:
+            run_migration(conn,
+                "Add 'last_reminded_at' column",
+                f"ALTER TABLE {signer_table} ADD COLUMN IF NOT EXISTS last_reminded_at TIMESTAMP"
+            )
+        else:
+            print("  ❌ Could not detect signer table - skipping reminder column")
+        conn.commit()
+
+
+        print("\n🔑 [8/13] Users table - access token version column")
+        run_migration(conn,
+            "Add 'token_version' column",
+            "ALTER TABLE users ADD COLUMN IF NOT EXISTS token_version INTEGER NOT NULL DEFAULT 0"
+        )
+        conn.commit()
+
+
+        print("\n🔒 [9/13] Signing links - sha256 digests")
+        signer_table = find_signer_table(conn)
+        if not signer_table:
+            print("  ❌ Could not detect signer table - skipping signing links")
+        elif conn.execute(text("SELECT to_regclass('signing_links')")).scalar() is None:
+            print("  ⚠️  signing_links table missing - start the app once, then re-run")
+        else:
+            try:
+                moved = move_signing_links(conn, signer_table)
+                print(f"  ✅ Moved {moved} signing link(s) to signing_links")
+            except Exception as e:
+                conn.rollback()
+                err = str(e).split('\n')[0]
+                print(f"  ⚠️  Signing link backfill → {err}")
+
+            run_migration(conn,
+                "Drop unique constraint on raw 'signing_token'",
+                f"ALTER TABLE {signer_table} DROP CONSTRAINT IF EXISTS {signer_table}_signing_token_key"
+            )
+            run_migration(conn,
+                "Drop 'signing_token_hash' column",
+                f"ALTER TABLE {signer_table} DROP COLUMN IF EXISTS signing_token_hash"
+            )
+        conn.commit()
+
+
+        print("\n📊 [10/13] Audit logs - per-user keyset index")
+        run_migration(conn,
+            "Add index on audit_logs (user_id, created_at, id)",
+            "CREATE INDEX IF NOT EXISTS ix_audit_logs_user_keyset ON audit_logs (user_id, created_at, id)"
+        )
+        # Created by an earlier version of this step; its columns are a
+        # prefix of ix_audit_logs_user_keyset.
+        run_migration(conn,
+            "Drop index ix_audit_logs_user_created",
+            "DROP INDEX IF EXISTS ix_audit_logs_user_created"
+        )
+        conn.commit()
+
+
+        print("\n🗂️  [11/13] Audit logs - monthly partitions")
+        try:
+            partition_audit_logs(conn)
+        except Exception as e:
+            conn.rollback()
+            err = str(e).split('\n')[0]
+            print(f"  ⚠️  Audit log partitioning → {err}")
+        conn.commit()
+
+
+        print("\n📑 [12/13] Audit logs - per-document keyset index")
+        run_migration(conn,
+            "Add index on audit_logs (document_id, created_at, id)",
+            "CREATE INDEX IF NOT EXISTS ix_audit_logs_document_keyset ON audit_logs (document_id, created_at, id)"
+        )
+        conn.commit()
+
+
+        print("\n🔗 [13/13] Audit logs - per-document hash chain")
+        for column, col_type in [("chain_seq", "INTEGER"), ("prev_hash", "VARCHAR(64)"), ("entry_hash", "VARCHAR(64)")]:
+            run_migration(conn,
+                f"Add '{column}' to audit_logs",
+                f"ALTER TABLE audit_logs ADD COLUMN IF NOT EXISTS {column} {col_type}"
+            )
+        run_migration(conn,
+            "Add index on audit_logs (document_id, chain_seq)",
+            "CREATE INDEX IF NOT EXISTS ix_audit_logs_document_chain ON audit_logs (document_id, chain_seq)"
+        )
+        conn.commit()
+
     print("\n" + "=" * 55)
     print("  ✅ All migrations completed!")
     print("=" * 55)
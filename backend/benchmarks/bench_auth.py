@@ -0,0 +1,146 @@
+"""
+Auth throughput: bcrypt cost per round setting, and a login burst with
+a cheap endpoint probed alongside it.
+
+The probe shows whether password hashing starves unrelated requests:
+with hashing on the dedicated executor, /health latency should stay
+flat while logins queue.
+
+Run from the backend directory:
+    python -m benchmarks.bench_auth
+"""
+import asyncio
+import contextlib
+import io
+import os
+import statistics
+from time import perf_counter
+
+BENCH_DB = "./bench_auth.db"
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{BENCH_DB}")
+os.environ.setdefault("SECRET_KEY", "bench-secret")
+
+import httpx
+from fastapi import FastAPI
+from passlib.context import CryptContext
+
+from database import Base, SessionLocal, engine
+from models import User
+from routers import auth
+from utils.security import BCRYPT_ROUNDS, PASSWORD_HASH_WORKERS, hash_password
+
+ROUNDS = (10, 11, 12, 13)
+HASHES_PER_ROUND = 5
+LOGINS = 160
+# Above the 40-thread AnyIO request threadpool, so a handler that held a
+# thread while waiting on bcrypt would starve the sync /health probe.
+LOGIN_CONCURRENCY = 80
+PROBE_INTERVAL = 0.01
+PROBE_MAX_MS = float(os.getenv("BENCH_AUTH_PROBE_MAX_MS", 250))
+
+
+def bench_cost():
+    print(f"  {'rounds':<8} {'ms/hash':>8}")
+    for rounds in ROUNDS:
+        context = CryptContext(schemes=["bcrypt"], bcrypt__rounds=rounds)
+        start = perf_counter()
+        for _ in range(HASHES_PER_ROUND):
+            context.hash("correct horse battery staple")
+        elapsed = perf_counter() - start
+        marker = "  <- BCRYPT_ROUNDS" if rounds == BCRYPT_ROUNDS else ""
+        print(f"  {rounds:<8} {elapsed * 1000 / HASHES_PER_ROUND:8.1f}{marker}")
+
+
+def seed_user():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        if not db.query(User).filter(User.email == "bench@example.com").first():
+            db.add(User(name="Bench", email="bench@example.com", password=hash_password("bench-password")))
+            db.commit()
+    finally:
+        db.close()
+
+
+async def bench_login_burst(client):
+    probe_latencies = []
+    done = asyncio.Event()
+
+    async def probe():
+        while not done.is_set():
+            start = perf_counter()
+            await client.get("/health")
+            probe_latencies.append(perf_counter() - start)
+            await asyncio.sleep(PROBE_INTERVAL)
+
+    semaphore = asyncio.Semaphore(LOGIN_CONCURRENCY)
+    login_latencies = []
+
+    async def login():
+        async with semaphore:
+            start = perf_counter()
+            response = await client.post(
+                "/api/auth/login",
+                json={"email": "bench@example.com", "password": "bench-password"},
+            )
+            response.raise_for_status()
+            login_latencies.append(perf_counter() - start)
+
+    probe_task = asyncio.create_task(probe())
+    start = perf_counter()
+    await asyncio.gather(*(login() for _ in range(LOGINS)))
+    elapsed = perf_counter() - start
+    done.set()
+    await probe_task
+
+    login_latencies.sort()
+    probe_latencies.sort()
+    print(f"  logins      {LOGINS / elapsed:8.1f} /s  "
+          f"p50 {statistics.median(login_latencies) * 1000:7.1f} ms  "
+          f"p95 {login_latencies[int(len(login_latencies) * 0.95) - 1] * 1000:7.1f} ms")
+    print(f"  /health     {len(probe_latencies):8d} probes  "
+          f"p50 {statistics.median(probe_latencies) * 1000:7.1f} ms  "
+          f"max {probe_latencies[-1] * 1000:7.1f} ms")
+    return probe_latencies[-1] * 1000
+
+
+async def main():
+    app = FastAPI()
+    app.include_router(auth.router)
+
+    @app.get("/health")
+    def health():
+        return {"status": "healthy"}
+
+    print("=" * 60)
+    print("  Password hashing cost and login throughput")
+    print("=" * 60)
+    bench_cost()
+
+    print(f"\n  Login burst: {LOGINS} logins, concurrency {LOGIN_CONCURRENCY}, "
+          f"{PASSWORD_HASH_WORKERS} hash workers, cost {BCRYPT_ROUNDS}\n")
+
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            seed_user()
+
+        transport = httpx.ASGITransport(app=app, client=("127.0.0.1", 50000))
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            buffer = io.StringIO()
+            with contextlib.redirect_stdout(buffer):
+                probe_max_ms = await bench_login_burst(client)
+            print("\n".join(line for line in buffer.getvalue().splitlines()
+                            if line.startswith("  ")))
+    finally:
+        if os.environ["DATABASE_URL"] == f"sqlite:///{BENCH_DB}" and os.path.exists(BENCH_DB):
+            os.remove(BENCH_DB)
+
+    print("=" * 60)
+    assert probe_max_ms < PROBE_MAX_MS, (
+        f"/health max latency {probe_max_ms:.1f} ms during the login burst exceeds {PROBE_MAX_MS:.0f} ms"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,248 @@
+"""
+End-to-end email pipeline throughput against local stand-ins.
+
+Drives send_signing_request_email, the batch API and the
+send-multiple-signing-requests endpoint against an aiosmtpd server and a
+mock SendGrid endpoint, and reports messages/sec, per-message latency
+percentiles and how long the event loop was blocked.
+
+Run from the backend directory (requires aiosmtpd):
+    python -m benchmarks.bench_email_pipeline
+"""
+import asyncio
+import contextlib
+import io
+import os
+import statistics
+from time import perf_counter
+
+BENCH_DB = "./bench_email_pipeline.db"
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{BENCH_DB}")
+os.environ.setdefault("SECRET_KEY", "bench-secret")
+os.environ["EMAIL_RATE_LIMIT_SMTP"] = "0"
+os.environ["EMAIL_RATE_LIMIT_SENDGRID"] = "0"
+
+import httpx
+from fastapi import FastAPI
+
+from database import Base, SessionLocal, engine
+from models import User, Document
+from routers import documents
+from services import email_service
+from services.email_fanout import fan_out
+from utils.security import create_user_access_token
+from benchmarks.standins import MockSendGridServer, start_smtp_standin
+
+HOST = "127.0.0.1"
+SMTP_PORT = 8025
+SENDGRID_PORT = 8026
+SENDGRID_LATENCY = 0.02
+MESSAGES = 200
+CONCURRENCY = 10
+ENDPOINT_SIGNERS = 50
+ENDPOINT_REQUESTS = 5
+
+
+class LoopLagMonitor:
+    """
+    Sleeps in short ticks and records how late each wake-up is. Lateness
+    means something held the event loop (sync DB calls, file reads,
+    CPU-heavy rendering) instead of awaiting.
+    """
+
+    def __init__(self, interval: float = 0.005, threshold: float = 0.002):
+        self.interval = interval
+        self.threshold = threshold
+        self.blocked = 0.0
+        self.max_lag = 0.0
+        self._task = None
+
+    async def _run(self):
+        while True:
+            start = perf_counter()
+            await asyncio.sleep(self.interval)
+            lag = perf_counter() - start - self.interval
+            if lag > self.threshold:
+                self.blocked += lag
+            self.max_lag = max(self.max_lag, lag)
+
+    def __enter__(self):
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        return self
+
+    def __exit__(self, *exc):
+        self._task.cancel()
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+def report(label, messages, elapsed, latencies, monitor):
+    print(f"  {label:<26} {messages / elapsed:8.1f} msg/s  "
+          f"p50 {percentile(latencies, 50) * 1000:7.1f}  "
+          f"p95 {percentile(latencies, 95) * 1000:7.1f}  "
+          f"p99 {percentile(latencies, 99) * 1000:7.1f} ms  "
+          f"loop blocked {monitor.blocked * 1000:7.1f} ms "
+          f"(max {monitor.max_lag * 1000:5.1f})")
+
+
+def use_provider(provider: str, sendgrid: MockSendGridServer):
+    email_service.EMAIL_PROVIDER = provider
+    email_service.SENDGRID_API_KEY = "bench-key" if provider == "sendgrid" else None
+    email_service.SENDGRID_API_BASE_URL = sendgrid.base_url
+    email_service.SMTP_HOST = HOST
+    email_service.SMTP_PORT = SMTP_PORT
+    email_service.SMTP_START_TLS = False
+    email_service.SMTP_USERNAME = None
+    email_service.SMTP_PASSWORD = None
+
+
+async def bench_single_sends(label, concurrency):
+    latencies = []
+
+    async def send_one(i):
+        start = perf_counter()
+        ok = await email_service.send_signing_request_email(
+            signer_email=f"signer{i}@example.com",
+            signer_name=f"Signer {i}",
+            document_title="Master Services Agreement",
+            document_id=1,
+            sender_name="Bench Owner",
+            token=f"bench-link-{i}",
+        )
+        latencies.append(perf_counter() - start)
+        return ok
+
+    with LoopLagMonitor() as monitor:
+        start = perf_counter()
+        results = await fan_out(range(MESSAGES), send_one, recipient=str, concurrency=concurrency)
+        elapsed = perf_counter() - start
+
+    failed = sum(1 for r in results if not r["success"])
+    report(label + (f" ({failed} failed)" if failed else ""), MESSAGES, elapsed, latencies, monitor)
+
+
+async def bench_batch_send(label):
+    recipients = [
+        {
+            "to_email": f"signer{i}@example.com",
+            "to_name": f"Signer {i}",
+            "download_url": f"http://localhost:8000/api/documents/public/token-{i}/download-signed",
+        }
+        for i in range(MESSAGES)
+    ]
+
+    with LoopLagMonitor() as monitor:
+        start = perf_counter()
+        await email_service.send_signer_download_batch("Master Services Agreement", recipients)
+        elapsed = perf_counter() - start
+
+    # Every recipient in a batch completes when the batch does.
+    report(label, MESSAGES, elapsed, [elapsed] * MESSAGES, monitor)
+
+
+def seed_owner():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        owner = db.query(User).filter(User.email == "owner@example.com").first()
+        if not owner:
+            owner = User(name="Bench Owner", email="owner@example.com", password="not-a-real-hash")
+            db.add(owner)
+            db.commit()
+
+        document = Document(
+            title="Master Services Agreement",
+            original_filename="msa.pdf",
+            file_path="uploads/msa.pdf",
+            owner_id=owner.id,
+        )
+        db.add(document)
+        db.commit()
+        return create_user_access_token(owner), document.id
+    finally:
+        db.close()
+
+
+async def bench_endpoint(label, client, token, document_id):
+    body = {
+        "signers": [
+            {"signer_name": f"Signer {i}", "signer_email": f"signer{i}@example.com"}
+            for i in range(ENDPOINT_SIGNERS)
+        ],
+        "custom_message": "Please sign by Friday.",
+    }
+    latencies = []
+
+    with LoopLagMonitor() as monitor:
+        start = perf_counter()
+        for _ in range(ENDPOINT_REQUESTS):
+            request_start = perf_counter()
+            response = await client.post(
+                f"/api/documents/{document_id}/send-multiple-signing-requests",
+                json=body,
+                headers={"Authorization": f"Bearer {token}"},
+            )
+            response.raise_for_status()
+            latencies.append(perf_counter() - request_start)
+        elapsed = perf_counter() - start
+
+    report(label, ENDPOINT_REQUESTS * ENDPOINT_SIGNERS, elapsed, latencies, monitor)
+
+
+async def main():
+    controller, _ = start_smtp_standin(HOST, SMTP_PORT)
+    sendgrid = await MockSendGridServer(HOST, SENDGRID_PORT, latency=SENDGRID_LATENCY).start()
+
+    app = FastAPI()
+    app.include_router(documents.router)
+
+    print("=" * 110)
+    print("  Email pipeline throughput (local aiosmtpd + mock SendGrid)")
+    print("=" * 110)
+    print(f"  {MESSAGES} messages, fan-out concurrency {CONCURRENCY}, "
+          f"mock SendGrid latency {SENDGRID_LATENCY * 1000:.0f} ms\n")
+
+    # The pipeline prints a line per message; keep it out of the report.
+    quiet = contextlib.redirect_stdout(io.StringIO())
+
+    try:
+        with quiet:
+            token, document_id = seed_owner()
+
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+            for provider in ("smtp", "sendgrid"):
+                rows = []
+                for label, run in (
+                        (f"{provider} serial", lambda: bench_single_sends(f"{provider} serial", 1)),
+                        (f"{provider} fan-out", lambda: bench_single_sends(f"{provider} fan-out", CONCURRENCY)),
+                        (f"{provider} batch", lambda: bench_batch_send(f"{provider} batch")),
+                        (f"{provider} endpoint x{ENDPOINT_SIGNERS}",
+                         lambda: bench_endpoint(f"{provider} endpoint x{ENDPOINT_SIGNERS}", client, token, document_id)),
+                ):
+                    use_provider(provider, sendgrid)
+                    buffer = io.StringIO()
+                    with contextlib.redirect_stdout(buffer):
+                        await run()
+                    await email_service.close_email_transports()
+                    rows.append(buffer.getvalue().splitlines()[-1])
+
+                for row in rows:
+                    print(row)
+                print()
+    finally:
+        await email_service.close_email_transports()
+        await sendgrid.stop()
+        controller.stop()
+        if os.environ["DATABASE_URL"] == f"sqlite:///{BENCH_DB}" and os.path.exists(BENCH_DB):
+            os.remove(BENCH_DB)
+
+    print("=" * 110)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
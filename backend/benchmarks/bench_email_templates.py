@@ -0,0 +1,80 @@
+"""
+Measure per-message email render cost at bulk-send volumes.
+
+Compares rendering from the compiled, cached template environment
+against parsing and compiling the template source on every message
+(what an uncached engine, or rebuilding the template per send, costs).
+
+Run from the backend directory:
+    python -m benchmarks.bench_email_templates
+"""
+from time import perf_counter
+
+from jinja2 import Environment, FileSystemLoader, StrictUndefined, select_autoescape
+
+from services.email_templates import EMAIL_TEMPLATES_DIR, render_email, warm_email_templates
+
+MESSAGES = 5000
+
+
+def context_for(i: int) -> dict:
+    return {
+        "signer_name": f"Signer {i} <script>",
+        "signer_email": f"signer{i}@example.com",
+        "sender_name": "Alice & Co",
+        "document_title": f"Master Services Agreement #{i}",
+        "custom_message": "Please sign by Friday.\nThanks!",
+        "signing_url": f"https://app.signflow.local/sign/token-{i}",
+        "expire_hours": 72,
+    }
+
+
+def render_uncached(i: int):
+    env = Environment(
+        loader=FileSystemLoader(EMAIL_TEMPLATES_DIR),
+        autoescape=select_autoescape(enabled_extensions=("html",)),
+        cache_size=0,
+        undefined=StrictUndefined,
+    )
+    context = dict(context_for(i), routed_from=None)
+    html = env.get_template("signing_request.html").render(context)
+    text = env.get_template("signing_request.txt").render(context)
+    return html, text
+
+
+def render_cached(i: int):
+    return render_email("signing_request", **context_for(i))
+
+
+def run(label, render, messages):
+    start = perf_counter()
+    total_bytes = 0
+    for i in range(messages):
+        html, text = render(i)
+        total_bytes += len(html) + len(text)
+    elapsed = perf_counter() - start
+
+    print(f"  {label:<10} {elapsed * 1_000_000 / messages:8.1f} µs/msg  "
+          f"{messages / elapsed:9.0f} msg/s  "
+          f"{total_bytes / messages / 1024:5.1f} KB/msg")
+
+
+def main():
+    warm_email_templates()
+
+    html, _ = render_cached(0)
+    assert "&lt;script&gt;" in html and "<script>" not in html, "autoescape is not active"
+
+    print("=" * 55)
+    print("  Email rendering: compiled templates vs per-message compile")
+    print("=" * 55)
+    print(f"  signing_request, html + text parts\n")
+
+    run("uncached", render_uncached, MESSAGES // 10)
+    run("compiled", render_cached, MESSAGES)
+
+    print("\n" + "=" * 55)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Google sign-in callback throughput against a local mock OAuth server.
+
+Each login costs one token exchange; the id_token is verified locally
+against the cached JWKS, so the mock should see a single /certs fetch
+and roughly max_connections connections for the whole run.
+
+Run from the backend directory (requires aiosmtpd for the standins module):
+    python -m benchmarks.bench_google_oauth
+"""
+import asyncio
+import contextlib
+import io
+import os
+from time import perf_counter
+
+BENCH_DB = "./bench_google_oauth.db"
+HOST = "127.0.0.1"
+PORT = 8027
+CLIENT_ID = "bench-client.apps.googleusercontent.com"
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{BENCH_DB}")
+os.environ.setdefault("SECRET_KEY", "bench-secret")
+os.environ["GOOGLE_CLIENT_ID"] = CLIENT_ID
+os.environ["GOOGLE_CLIENT_SECRET"] = "bench-secret"
+os.environ["GOOGLE_TOKEN_URL"] = f"http://{HOST}:{PORT}/token"
+os.environ["GOOGLE_JWKS_URL"] = f"http://{HOST}:{PORT}/certs"
+os.environ["GOOGLE_ISSUERS"] = f"http://{HOST}:{PORT}"
+
+import httpx
+from fastapi import FastAPI
+
+from benchmarks.standins import MockGoogleOAuthServer
+from database import Base, engine
+from routers import oauth_router
+from services.google_oauth import close_google_oauth_client, get_google_oauth_stats
+
+LOGINS = 200
+CONCURRENCY = 20
+LATENCY = 0.02
+
+
+async def bench_callbacks(client):
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+
+    async def login(i):
+        async with semaphore:
+            response = await client.post("/api/auth/google/callback", json={"code": f"code-{i}"})
+            response.raise_for_status()
+
+    start = perf_counter()
+    await asyncio.gather(*(login(i) for i in range(LOGINS)))
+    return perf_counter() - start
+
+
+async def main():
+    app = FastAPI()
+    app.include_router(oauth_router.router)
+
+    print("=" * 60)
+    print(f"  Google sign-in: {LOGINS} callbacks, concurrency {CONCURRENCY}, "
+          f"{LATENCY * 1000:.0f} ms provider latency")
+    print("=" * 60)
+
+    server = await MockGoogleOAuthServer(CLIENT_ID, HOST, PORT, latency=LATENCY).start()
+    try:
+        Base.metadata.create_all(bind=engine)
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            with contextlib.redirect_stdout(io.StringIO()):
+                elapsed = await bench_callbacks(client)
+
+        print(f"  callbacks   {LOGINS / elapsed:8.1f} /s  ({elapsed:.2f} s)")
+        print(f"  mock server {server.token_requests} token requests, "
+              f"{server.jwks_requests} JWKS fetches, {server.connections} connections")
+        print(f"  client      {get_google_oauth_stats()}")
+    finally:
+        await close_google_oauth_client()
+        await server.stop()
+        if os.environ["DATABASE_URL"] == f"sqlite:///{BENCH_DB}" and os.path.exists(BENCH_DB):
+            os.remove(BENCH_DB)
+
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,109 @@
+"""
+Credential-stuffing burst against /api/auth/login with the rate limiter
+in front, on the in-memory backend and on the shared Redis backend
+(through a local stand-in).
+
+Throttled requests should come back in well under a millisecond because
+they are answered before the router opens a DB session or runs bcrypt.
+
+Run from the backend directory (requires aiosmtpd for the standins module):
+    python -m benchmarks.bench_rate_limit
+"""
+import asyncio
+import contextlib
+import io
+import os
+import statistics
+from time import perf_counter
+
+BENCH_DB = "./bench_rate_limit.db"
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{BENCH_DB}")
+os.environ.setdefault("SECRET_KEY", "bench-secret")
+
+import httpx
+import redis.asyncio as redis
+from fastapi import FastAPI
+
+from benchmarks.standins import RedisStandin
+from database import Base, SessionLocal, engine
+from middleware.rate_limit import (
+    MemoryRateLimitBackend, RateLimitMiddleware, RateLimiter, RedisRateLimitBackend
+)
+from models import User
+from routers import auth
+from utils.security import hash_password
+
+ATTEMPTS = 200
+CONCURRENCY = 20
+
+
+def seed_user():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        if not db.query(User).filter(User.email == "bench@example.com").first():
+            db.add(User(name="Bench", email="bench@example.com", password=hash_password("bench-password")))
+            db.commit()
+    finally:
+        db.close()
+
+
+async def bench_burst(label, limiter):
+    app = FastAPI()
+    app.include_router(auth.router)
+    app.add_middleware(RateLimitMiddleware, limiter=limiter)
+
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+    latencies = {200: [], 401: [], 429: []}
+
+    async def attempt(client, i):
+        async with semaphore:
+            start = perf_counter()
+            response = await client.post(
+                "/api/auth/login",
+                json={"email": "bench@example.com", "password": f"guess-{i}"},
+            )
+            latencies.setdefault(response.status_code, []).append(perf_counter() - start)
+
+    transport = httpx.ASGITransport(app=app, client=("203.0.113.7", 50000))
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        start = perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            await asyncio.gather(*(attempt(client, i) for i in range(ATTEMPTS)))
+        elapsed = perf_counter() - start
+
+    def p50(values):
+        return f"{statistics.median(values) * 1000:7.2f} ms" if values else "      -   "
+
+    print(f"  {label:<8} {elapsed:6.2f} s  "
+          f"401 x{len(latencies[401]):<4} p50 {p50(latencies[401])}  "
+          f"429 x{len(latencies[429]):<4} p50 {p50(latencies[429])}")
+
+
+async def main():
+    print("=" * 72)
+    print(f"  Login burst: {ATTEMPTS} wrong-password attempts from one IP, concurrency {CONCURRENCY}")
+    print("=" * 72)
+
+    standin = await RedisStandin().start()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            seed_user()
+
+        await bench_burst("memory", RateLimiter(backend=MemoryRateLimitBackend()))
+
+        redis_backend = RedisRateLimitBackend(redis.from_url(standin.url))
+        await bench_burst("redis", RateLimiter(backend=redis_backend))
+        await redis_backend.close()
+        print(f"  redis stand-in: {standin.commands} commands over {standin.connections} connections")
+    finally:
+        await standin.stop()
+        if os.environ["DATABASE_URL"] == f"sqlite:///{BENCH_DB}" and os.path.exists(BENCH_DB):
+            os.remove(BENCH_DB)
+
+    print("=" * 72)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
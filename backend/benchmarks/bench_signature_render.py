@@ -0,0 +1,105 @@
+"""
+Compare embedding hand-drawn signatures as PNG images vs vector strokes.
+
+Run from the backend directory:
+    python -m benchmarks.bench_signature_render
+"""
+import math
+import os
+import tempfile
+from io import BytesIO
+from time import perf_counter
+
+import fitz
+from PIL import Image, ImageDraw
+
+from services.pdf_service import normalize_signature_strokes, draw_signature_strokes
+
+CANVAS_WIDTH = 600
+CANVAS_HEIGHT = 200
+FIELDS_PER_PAGE = 6
+PAGES = 20
+
+
+def make_strokes(seed: int = 0, stroke_count: int = 4, points_per_stroke: int = 120):
+    strokes = []
+    for s in range(stroke_count):
+        stroke = []
+        for i in range(points_per_stroke):
+            t = i / (points_per_stroke - 1)
+            x = 0.05 + 0.9 * (s + t) / stroke_count
+            y = 0.5 + 0.3 * math.sin(t * math.pi * 3 + s + seed * 0.37) * math.cos(t * 7)
+            stroke.extend([x, y])
+        strokes.append(stroke)
+    return strokes
+
+
+def rasterize(strokes) -> bytes:
+    img = Image.new("RGBA", (CANVAS_WIDTH, CANVAS_HEIGHT), (255, 255, 255, 0))
+    draw = ImageDraw.Draw(img)
+    for stroke in strokes:
+        points = [
+            (stroke[i] * CANVAS_WIDTH, stroke[i + 1] * CANVAS_HEIGHT)
+            for i in range(0, len(stroke), 2)
+        ]
+        draw.line(points, fill="black", width=3, joint="curve")
+    buf = BytesIO()
+    img.save(buf, format="PNG")
+    return buf.getvalue()
+
+
+def field_rects(page):
+    width = page.rect.width * 0.3
+    height = page.rect.height * 0.08
+    for i in range(FIELDS_PER_PAGE):
+        x = 40 + (i % 2) * (width + 20)
+        y = 60 + (i // 2) * (height + 40)
+        yield fitz.Rect(x, y, x + width, y + height)
+
+
+def run(label, embed, payloads):
+    doc = fitz.open()
+    for _ in range(PAGES):
+        doc.new_page()
+
+    payload_iter = iter(payloads)
+    start = perf_counter()
+    for page in doc:
+        for rect in field_rects(page):
+            embed(page, rect, next(payload_iter))
+    embed_time = perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as tmp:
+        out_path = os.path.join(tmp, "out.pdf")
+        doc.save(out_path, garbage=4, deflate=True, clean=True)
+        size = os.path.getsize(out_path)
+    doc.close()
+
+    fields = PAGES * FIELDS_PER_PAGE
+    print(f"  {label:<8} {embed_time * 1000:9.1f} ms total  "
+          f"{embed_time / fields * 1e6:8.1f} µs/field  {size / 1024:9.1f} KB pdf")
+
+
+def main():
+    # Every field gets a distinct signature so identical images are not
+    # deduplicated by the PDF writer.
+    fields = PAGES * FIELDS_PER_PAGE
+    raw_strokes = [make_strokes(seed) for seed in range(fields)]
+    png_payloads = [rasterize(strokes) for strokes in raw_strokes]
+    vector_payloads = [normalize_signature_strokes(strokes) for strokes in raw_strokes]
+
+    png_avg = sum(map(len, png_payloads)) / fields
+    vector_avg = sum(map(len, vector_payloads)) / fields
+
+    print("=" * 55)
+    print("  Signature embedding: PNG vs vector strokes")
+    print("=" * 55)
+    print(f"  Stored payload: PNG {png_avg / 1024:.1f} KB, strokes {vector_avg / 1024:.1f} KB (avg)")
+    print(f"  {PAGES} pages x {FIELDS_PER_PAGE} fields\n")
+
+    run("png", lambda page, rect, png: page.insert_image(rect, stream=png), png_payloads)
+    run("vector", lambda page, rect, strokes: draw_signature_strokes(page, rect, strokes), vector_payloads)
+
+
+if __name__ == "__main__":
+    main()
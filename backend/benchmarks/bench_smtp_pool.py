@@ -0,0 +1,70 @@
+"""
+Compare per-message aiosmtplib.send against the pooled SMTP client.
+
+Run from the backend directory (requires aiosmtpd):
+    python -m benchmarks.bench_smtp_pool
+"""
+import asyncio
+from email.mime.text import MIMEText
+from time import perf_counter
+
+import aiosmtplib
+
+from services.smtp_pool import SMTPConnectionPool
+from benchmarks.standins import start_smtp_standin
+
+HOST = "127.0.0.1"
+PORT = 8025
+MESSAGES = 500
+CONCURRENCY = 10
+
+
+def build_message(i: int):
+    message = MIMEText(f"<p>Signing request #{i}</p>", "html")
+    message["From"] = "SignFlow <noreply@signflow.local>"
+    message["To"] = f"signer{i}@example.com"
+    message["Subject"] = f"Signature Request #{i}"
+    return message
+
+
+async def send_unpooled(i: int):
+    await aiosmtplib.send(build_message(i), hostname=HOST, port=PORT, start_tls=False)
+
+
+async def run(label, send_one, handler):
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+    connections_before = handler.connections
+
+    async def bounded(i):
+        async with semaphore:
+            await send_one(i)
+
+    start = perf_counter()
+    await asyncio.gather(*(bounded(i) for i in range(MESSAGES)))
+    elapsed = perf_counter() - start
+
+    print(f"  {label:<10} {MESSAGES / elapsed:8.1f} msg/s  "
+          f"{elapsed * 1000 / MESSAGES:6.2f} ms/msg  "
+          f"{handler.connections - connections_before:4d} SMTP sessions")
+
+
+async def main():
+    controller, handler = start_smtp_standin(HOST, PORT)
+    pool = SMTPConnectionPool(HOST, PORT, start_tls=False, max_size=CONCURRENCY)
+
+    print("=" * 55)
+    print("  SMTP delivery: per-message connect vs pooled")
+    print("=" * 55)
+    print(f"  {MESSAGES} messages, concurrency {CONCURRENCY}\n")
+
+    try:
+        await run("unpooled", send_unpooled, handler)
+        await run("pooled", lambda i: pool.send_message(build_message(i)), handler)
+        print(f"\n  Pool stats: {pool.stats()}")
+    finally:
+        await pool.close()
+        controller.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,362 @@
+"""
+Local stand-ins for external services (email, Google OAuth, Redis), used
+by the benchmarks.
+
+Requires the dev-only package aiosmtpd (pip install aiosmtpd).
+"""
+import asyncio
+import json
+import time
+
+from aiosmtpd.controller import Controller
+
+
+class CountingHandler:
+    def __init__(self):
+        self.messages = 0
+        self.connections = 0
+
+    async def handle_EHLO(self, server, session, envelope, hostname, responses):
+        self.connections += 1
+        session.host_name = hostname
+        return responses
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages += 1
+        return "250 Message accepted for delivery"
+
+
+def start_smtp_standin(hostname: str = "127.0.0.1", port: int = 8025):
+    """
+    Start an in-process SMTP sink. Returns (controller, handler); call
+    controller.stop() when done.
+    """
+    handler = CountingHandler()
+    controller = Controller(handler, hostname=hostname, port=port)
+    controller.start()
+    return controller, handler
+
+
+class MockSendGridServer:
+    """
+    Minimal HTTP/1.1 keep-alive server that accepts POST /v3/mail/send.
+    latency simulates the provider round-trip; status can be set to 429
+    to exercise rate-limit handling.
+    """
+
+    def __init__(self, hostname: str = "127.0.0.1", port: int = 8026, latency: float = 0.0, status: int = 202):
+        self.hostname = hostname
+        self.port = port
+        self.latency = latency
+        self.status = status
+        self.requests = 0
+        self.recipients = 0
+        self.connections = 0
+        self._server = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.hostname}:{self.port}"
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                headers = {}
+                for line in head.decode("latin-1").split("\r\n")[1:]:
+                    if ":" in line:
+                        name, value = line.split(":", 1)
+                        headers[name.strip().lower()] = value.strip()
+
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                self.requests += 1
+                try:
+                    self.recipients += len(json.loads(body).get("personalizations", []))
+                except ValueError:
+                    pass
+
+                if self.latency:
+                    await asyncio.sleep(self.latency)
+
+                reason = "Accepted" if self.status < 400 else "Error"
+                extra = "Retry-After: 1\r\n" if self.status == 429 else ""
+                writer.write(
+                    f"HTTP/1.1 {self.status} {reason}\r\nContent-Length: 0\r\n{extra}\r\n".encode()
+                )
+                await writer.drain()
+
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.hostname, self.port)
+        return self
+
+    async def stop(self):
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+
+
+class MockGoogleOAuthServer:
+    """
+    Minimal keep-alive stand-in for Google's token and JWKS endpoints.
+
+    POST /token accepts any code and returns an RS256 id_token signed with
+    a key generated at startup; GET /certs serves that key. Point
+    GOOGLE_TOKEN_URL, GOOGLE_JWKS_URL and GOOGLE_ISSUERS at token_url,
+    jwks_url and issuer.
+    """
+
+    def __init__(
+            self,
+            client_id: str,
+            hostname: str = "127.0.0.1",
+            port: int = 8027,
+            latency: float = 0.0,
+            jwks_max_age: int = 3600
+    ):
+        from cryptography.hazmat.primitives import serialization
+        from cryptography.hazmat.primitives.asymmetric import rsa
+        from jose import jwk
+
+        self.client_id = client_id
+        self.hostname = hostname
+        self.port = port
+        self.latency = latency
+        self.jwks_max_age = jwks_max_age
+        self.kid = "mock-key-1"
+
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        # Parsed once: loading the PEM per token costs far more than signing.
+        self._signing_key = jwk.construct(private_key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        ).decode(), "RS256")
+        public_pem = private_key.public_key().public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo,
+        ).decode()
+        public_jwk = jwk.construct(public_pem, "RS256").to_dict()
+        public_jwk.update({"kid": self.kid, "use": "sig", "alg": "RS256"})
+        self._jwks = json.dumps({"keys": [public_jwk]})
+
+        self.token_requests = 0
+        self.jwks_requests = 0
+        self.connections = 0
+        self._issued = 0
+        self._server = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.hostname}:{self.port}"
+
+    @property
+    def token_url(self) -> str:
+        return f"{self.base_url}/token"
+
+    @property
+    def jwks_url(self) -> str:
+        return f"{self.base_url}/certs"
+
+    @property
+    def issuer(self) -> str:
+        return self.base_url
+
+    def _id_token(self) -> str:
+        from jose import jwt
+
+        self._issued += 1
+        now = int(time.time())
+        claims = {
+            "iss": self.issuer,
+            "aud": self.client_id,
+            "sub": f"10000000000000{self._issued}",
+            "email": f"oauth-user-{self._issued}@example.com",
+            "email_verified": True,
+            "name": f"OAuth User {self._issued}",
+            "iat": now,
+            "exp": now + 3600,
+        }
+        return jwt.encode(claims, self._signing_key, algorithm="RS256", headers={"kid": self.kid})
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                lines = head.decode("latin-1").split("\r\n")
+                method, path = lines[0].split(" ")[:2]
+                headers = {}
+                for line in lines[1:]:
+                    if ":" in line:
+                        name, value = line.split(":", 1)
+                        headers[name.strip().lower()] = value.strip()
+                await reader.readexactly(int(headers.get("content-length", 0)))
+
+                if self.latency:
+                    await asyncio.sleep(self.latency)
+
+                extra = ""
+                if method == "POST" and path == "/token":
+                    self.token_requests += 1
+                    status, body = 200, json.dumps({
+                        "access_token": "mock-access-token",
+                        "id_token": self._id_token(),
+                        "expires_in": 3599,
+                        "token_type": "Bearer",
+                    })
+                elif method == "GET" and path == "/certs":
+                    self.jwks_requests += 1
+                    status, body = 200, self._jwks
+                    extra = f"Cache-Control: public, max-age={self.jwks_max_age}\r\n"
+                else:
+                    status, body = 404, json.dumps({"error": "not_found"})
+
+                payload = body.encode()
+                writer.write(
+                    f"HTTP/1.1 {status} OK\r\nContent-Type: application/json\r\n"
+                    f"Content-Length: {len(payload)}\r\n{extra}\r\n".encode() + payload
+                )
+                await writer.drain()
+
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.hostname, self.port)
+        return self
+
+    async def stop(self):
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+
+
+class RedisStandin:
+    """
+    In-memory RESP2 server implementing just the sorted-set commands the
+    rate limiter's Redis backend uses (plus MULTI/EXEC), so the shared
+    backend can be exercised with redis-py without a Redis install.
+    """
+
+    def __init__(self, hostname: str = "127.0.0.1", port: int = 6390):
+        self.hostname = hostname
+        self.port = port
+        self.commands = 0
+        self.connections = 0
+        self._zsets = {}
+        self._expires = {}
+        self._server = None
+
+    @property
+    def url(self) -> str:
+        return f"redis://{self.hostname}:{self.port}/0"
+
+    def _zset(self, key):
+        expires_at = self._expires.get(key)
+        if expires_at is not None and expires_at <= time.monotonic():
+            self._zsets.pop(key, None)
+            self._expires.pop(key, None)
+        return self._zsets.setdefault(key, {})
+
+    def _execute(self, name, args):
+        self.commands += 1
+        if name in ("PING",):
+            return "+PONG"
+        if name in ("CLIENT", "SELECT"):
+            return "+OK"
+        if name == "ZREMRANGEBYSCORE":
+            zset = self._zset(args[0])
+            low, high = float(args[1]), float(args[2])
+            doomed = [m for m, score in zset.items() if low <= score <= high]
+            for member in doomed:
+                del zset[member]
+            return len(doomed)
+        if name == "ZADD":
+            zset = self._zset(args[0])
+            added = 0
+            for score, member in zip(args[1::2], args[2::2]):
+                added += member not in zset
+                zset[member] = float(score)
+            return added
+        if name == "ZCARD":
+            return len(self._zset(args[0]))
+        if name == "ZREM":
+            zset = self._zset(args[0])
+            return sum(zset.pop(member, None) is not None for member in args[1:])
+        if name == "PEXPIRE":
+            self._expires[args[0]] = time.monotonic() + int(args[1]) / 1000
+            return 1
+        if name == "ZRANGE":
+            ordered = sorted(self._zset(args[0]).items(), key=lambda item: item[1])
+            start, stop = int(args[1]), int(args[2])
+            selected = ordered[start:(stop + 1) or None]
+            if len(args) > 3 and args[3].upper() == "WITHSCORES":
+                return [value for member, score in selected for value in (member, repr(score))]
+            return [member for member, _ in selected]
+        return f"-ERR unknown command '{name}'"
+
+    @staticmethod
+    def _encode(value) -> bytes:
+        if isinstance(value, str) and value[:1] in ("+", "-"):
+            return f"{value}\r\n".encode()
+        if isinstance(value, int):
+            return f":{value}\r\n".encode()
+        if isinstance(value, list):
+            return f"*{len(value)}\r\n".encode() + b"".join(RedisStandin._encode(v) for v in value)
+        data = str(value).encode()
+        return f"${len(data)}\r\n".encode() + data + b"\r\n"
+
+    async def _read_command(self, reader):
+        header = await reader.readline()
+        if not header:
+            raise asyncio.IncompleteReadError(b"", None)
+        parts = []
+        for _ in range(int(header[1:])):
+            length = int((await reader.readline())[1:])
+            parts.append((await reader.readexactly(length + 2))[:-2].decode())
+        return parts[0].upper(), parts[1:]
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        queued = None
+        try:
+            while True:
+                name, args = await self._read_command(reader)
+                if name == "MULTI":
+                    queued, reply = [], "+OK"
+                elif name == "EXEC":
+                    reply = [self._execute(n, a) for n, a in queued or []]
+                    queued = None
+                elif queued is not None:
+                    queued.append((name, args))
+                    reply = "+QUEUED"
+                else:
+                    reply = self._execute(name, args)
+
+                writer.write(self._encode(reply))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.hostname, self.port)
+        return self
+
+    async def stop(self):
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
@@ -0,0 +1,96 @@
+"""
+EXPLAIN the paginated audit-log queries against DATABASE_URL and fail if
+any of them falls back to a sequential scan of audit_logs.
+
+    python check_audit_indexes.py
+
+Sequential scans are disabled for the session, so on a small table a
+query still shows a Seq Scan only if no index can serve it.
+"""
+import sys
+from datetime import datetime, timedelta
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from database import engine
+from services.audit_query_service import (
+    user_audit_logs_query, document_audit_logs_query, keyset_page, encode_audit_cursor
+)
+
+
+class _CursorRow:
+    created_at = datetime.utcnow() - timedelta(days=1)
+    id = 1000
+
+
+CURSOR = encode_audit_cursor(_CursorRow)
+SINCE = datetime.utcnow() - timedelta(days=30)
+
+# Postgres names each partition's copy of an index after its columns,
+# e.g. audit_logs_y2026m01_user_id_created_at_id_idx.
+INDEX_COLUMNS = {
+    "ix_audit_logs_user_keyset": "user_id_created_at_id",
+    "ix_audit_logs_document_keyset": "document_id_created_at_id",
+}
+
+# label -> (statement, index expected to serve it)
+QUERIES = {
+    "user logs, first page": (keyset_page(user_audit_logs_query(1, since=SINCE)), "ix_audit_logs_user_keyset"),
+    "user logs, next page": (keyset_page(user_audit_logs_query(1, since=SINCE), CURSOR), "ix_audit_logs_user_keyset"),
+    "user logs by action": (
+        keyset_page(user_audit_logs_query(1, since=SINCE, action="USER_LOGIN"), CURSOR), "ix_audit_logs_user_keyset"
+    ),
+    "document logs, first page": (keyset_page(document_audit_logs_query(1)), "ix_audit_logs_document_keyset"),
+    "document logs, next page": (keyset_page(document_audit_logs_query(1), CURSOR), "ix_audit_logs_document_keyset"),
+}
+
+
+def explain(conn, statement):
+    """Plan lines for a statement, and whether it scans audit_logs without an index."""
+    dialect = conn.dialect
+    compiled = statement.compile(dialect=dialect)
+    if compiled.positional:
+        params = tuple(compiled.params[name] for name in compiled.positiontup)
+    else:
+        params = compiled.params
+
+    if dialect.name == "postgresql":
+        rows = conn.exec_driver_sql(f"EXPLAIN {compiled}", params).all()
+        plan = [row[0] for row in rows]
+        full_scan = any("Seq Scan" in line for line in plan)
+    else:
+        rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", params).all()
+        plan = [row[-1] for row in rows]
+        full_scan = any(line.startswith("SCAN audit_logs") and "INDEX" not in line for line in plan)
+    return plan, full_scan
+
+
+def check_plans(conn) -> list:
+    """Labels of the QUERIES that scan the table or miss their index."""
+    if conn.dialect.name == "postgresql":
+        conn.exec_driver_sql("SET enable_seqscan = off")
+
+    failures = []
+    print("🔍 Audit log query plans:")
+    for label, (statement, index) in QUERIES.items():
+        plan, full_scan = explain(conn, statement)
+        uses_index = any(index in line or f"_{INDEX_COLUMNS[index]}_idx" in line for line in plan)
+        ok = uses_index and not full_scan
+        print(f"\n  {'✅' if ok else '❌'} {label} (expects {index})")
+        for line in plan:
+            print(f"      {line}")
+        if not ok:
+            failures.append(label)
+    return failures
+
+
+if __name__ == "__main__":
+    with engine.connect() as conn:
+        failures = check_plans(conn)
+
+    if failures:
+        print(f"\n❌ {len(failures)} audit log quer{'y' if len(failures) == 1 else 'ies'} not served by their index")
+        sys.exit(1)
+    print("\n✅ Every audit log query is served by an index")
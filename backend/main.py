@@ -1,12 +1,24 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from database import engine, Base
 import os
 
-from models import User, Document, Signature, AuditLog, DocumentSigner
+from models import User, Document, Signature, AuditLog, DocumentSigner, SavedSignature, EmailOutbox, AuditDailyRollup
 
-from routers import auth, documents, signatures, audit_logs, oauth_router
+from routers import auth, documents, signatures, audit_logs, oauth_router, saved_signatures
+from services.pdf_service import get_text_signature_cache_stats
+from services.email_service import close_email_transports, get_email_transport_stats
+from services.signing_token_cache import get_signing_token_cache_stats
+from middleware.signing_session import get_signing_session_cache_stats
+from middleware.auth_middleware import get_token_version_cache_stats, require_metrics_access
+from middleware.rate_limit import RateLimitMiddleware, rate_limiter
+from services.outbox_service import outbox_worker
+from services.email_templates import warm_email_templates
+from services.reminder_service import reminder_digest_job
+from services.audit_rollup_service import audit_rollup_job
+from services.audit_archive_service import audit_maintenance_job
+from services.google_oauth import close_google_oauth_client, get_google_oauth_stats
 
 Base.metadata.create_all(bind=engine)
 
@@ -16,6 +28,9 @@ app = FastAPI(
     version="1.0.0"
 )
 
+# Added before CORS so throttled responses still carry CORS headers.
+app.add_middleware(RateLimitMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[
@@ -44,9 +59,30 @@ app.include_router(auth.router)
 app.include_router(oauth_router.router)
 app.include_router(documents.router)
 app.include_router(signatures.router)
+app.include_router(saved_signatures.router)
 app.include_router(audit_logs.router)
 
 
+@app.on_event("startup")
+async def start_background_workers():
+    warm_email_templates()
+    outbox_worker.start()
+    reminder_digest_job.start()
+    audit_rollup_job.start()
+    audit_maintenance_job.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_background_workers():
+    await audit_maintenance_job.stop()
+    await audit_rollup_job.stop()
+    await reminder_digest_job.stop()
+    await outbox_worker.stop()
+    await close_email_transports()
+    await close_google_oauth_client()
+    await rate_limiter.close()
+
+
 @app.get("/")
 def read_root():
     return {
@@ -71,6 +107,22 @@ def health_check():
         "tables": ["users", "documents", "signatures", "audit_logs"]
     }
 
+@app.get("/api/metrics", include_in_schema=False, dependencies=[Depends(require_metrics_access)])
+def get_metrics():
+    return {
+        "text_signature_cache": get_text_signature_cache_stats(),
+        "email": get_email_transport_stats(),
+        "outbox": outbox_worker.stats(),
+        "reminder_digest": reminder_digest_job.stats(),
+        "audit_rollup": audit_rollup_job.stats(),
+        "audit_maintenance": audit_maintenance_job.stats(),
+        "signing_tokens": get_signing_token_cache_stats(),
+        "signing_sessions": get_signing_session_cache_stats(),
+        "token_versions": get_token_version_cache_stats(),
+        "google_oauth": get_google_oauth_stats(),
+        "rate_limit": rate_limiter.stats()
+    }
+
 @app.get("/api/config/email-routing")
 def get_email_routing_config():
 
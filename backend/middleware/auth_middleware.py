@@ -1,54 +1,167 @@
+from dataclasses import dataclass
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import JWTError, jwt
 from sqlalchemy.orm import Session
 from database import get_db
 from models.user import User
-from utils.security import verify_token
+from utils.cache import LRUCache
+import hmac
 import os
 
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
 
 SECRET_KEY = os.getenv("SECRET_KEY")
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
 
+TOKEN_VERSION_CACHE_TTL = float(os.getenv("TOKEN_VERSION_CACHE_TTL", 30))
+TOKEN_VERSION_CACHE_SIZE = int(os.getenv("TOKEN_VERSION_CACHE_SIZE", 10000))
+# Operator bearer token for /api/metrics; the endpoint is off when unset.
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
+# user id -> current token_version. Bumps made in this process update it
+# immediately; other workers pick them up within the TTL.
+token_versions = LRUCache(max_entries=TOKEN_VERSION_CACHE_SIZE, ttl=TOKEN_VERSION_CACHE_TTL)
+
+
+@dataclass(frozen=True)
+class TokenUser:
+    """The authenticated user as described by their access token."""
+    id: int
+    email: str
+    name: str
+    token_version: int = 0
+
+
+def _decode_access_token(credentials: HTTPAuthorizationCredentials) -> dict:
+    try:
+        payload = jwt.decode(credentials.credentials, SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError as e:
+        print(f"JWT Error: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token"
+        )
+
+    if payload is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    if payload.get("sub") is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token payload"
+        )
+
+    return payload
+
+
+def _reject_stale_token():
+    raise HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Session has ended, please log in again",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+def current_token_version(db: Session, user_id: int):
+    """Current token_version for a user (None if they no longer exist), cached briefly."""
+    version = token_versions.get(user_id)
+    if version is None:
+        version = db.query(User.token_version).filter(User.id == user_id).scalar()
+        if version is not None:
+            token_versions.set(user_id, version)
+    return version
+
+
+def revoke_user_tokens(user: User):
+    """
+    Invalidate every access token issued to this user so far. The caller
+    commits; tokens created afterwards carry the new version.
+    """
+    user.token_version = (user.token_version or 0) + 1
+    token_versions.set(user.id, user.token_version)
+
+
+def _load_user(db: Session, payload: dict) -> User:
+    uid = payload.get("uid")
+    if uid is not None:
+        user = db.query(User).filter(User.id == uid).first()
+    else:
+        # Tokens issued before they carried the user id.
+        user = db.query(User).filter(User.email == payload["sub"]).first()
+
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found"
+        )
+    return user
 
 
 def get_current_user(
         credentials: HTTPAuthorizationCredentials = Depends(security),
         db: Session = Depends(get_db)
 ) -> User:
-    try:
+    payload = _decode_access_token(credentials)
+    user = _load_user(db, payload)
 
-        token = credentials.credentials
+    token_versions.set(user.id, user.token_version or 0)
+    if payload.get("ver", 0) != (user.token_version or 0):
+        _reject_stale_token()
 
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        if payload is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid or expired token",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
+    return user
 
-        email: str = payload.get("sub")
-        if email is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid token payload"
-            )
 
-        user = db.query(User).filter(User.email == email).first()
-        if user is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="User not found"
-            )
+def get_token_user(
+        credentials: HTTPAuthorizationCredentials = Depends(security),
+        db: Session = Depends(get_db)
+) -> TokenUser:
+    """
+    Lighter dependency for read-only endpoints: trusts the identity in the
+    token and only checks its version, which is usually a cache hit.
+    Endpoints that change state should keep using get_current_user.
+    """
+    payload = _decode_access_token(credentials)
 
-        return user
+    uid = payload.get("uid")
+    if uid is None:
+        user = _load_user(db, payload)
+        if payload.get("ver", 0) != (user.token_version or 0):
+            _reject_stale_token()
+        return TokenUser(id=user.id, email=user.email, name=user.name, token_version=user.token_version or 0)
 
-    except JWTError as e:
-        print(f"JWT Error: {e}")
+    version = current_token_version(db, uid)
+    if version is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token"
-        )
\ No newline at end of file
+            detail="User not found"
+        )
+    if payload.get("ver", 0) != version:
+        _reject_stale_token()
+
+    return TokenUser(
+        id=uid,
+        email=payload["sub"],
+        name=payload.get("name", ""),
+        token_version=version,
+    )
+
+
+def get_token_version_cache_stats() -> dict:
+    return token_versions.stats()
+
+
+def require_metrics_access(credentials: HTTPAuthorizationCredentials = Depends(optional_security)):
+    if not METRICS_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if credentials is None or not hmac.compare_digest(credentials.credentials, METRICS_TOKEN):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
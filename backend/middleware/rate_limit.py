@@ -0,0 +1,282 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import uuid
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from time import monotonic, time
+from typing import Optional, Tuple
+
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+RATE_LIMIT_REDIS_URL = os.getenv("RATE_LIMIT_REDIS_URL")
+RATE_LIMIT_REDIS_PREFIX = os.getenv("RATE_LIMIT_REDIS_PREFIX", "signflow:ratelimit:")
+# Only enable behind a proxy that overwrites X-Forwarded-For (e.g. Render).
+RATE_LIMIT_TRUST_FORWARDED = os.getenv("RATE_LIMIT_TRUST_FORWARDED", "false").lower() == "true"
+RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", 100000))
+
+PUBLIC_LINK_PATH = r"^/api/(?:documents|signatures)/public/(?P<token>[^/]+)(?:/.*)?$"
+
+
+@dataclass(frozen=True)
+class RateLimitRule:
+    """
+    At most `limit` requests per `window` seconds for each key, where the
+    key is the client IP or the signing-link token in the path.
+    """
+    name: str
+    methods: frozenset
+    path: re.Pattern
+    limit: int
+    window: float
+    key: str = "ip"
+
+
+def _rule(name: str, methods: str, path: str, default: str, key: str = "ip") -> RateLimitRule:
+    # Each rule is tunable as RATE_LIMIT_<NAME>="<requests>/<seconds>".
+    limit, window = os.getenv(f"RATE_LIMIT_{name.upper()}", default).split("/")
+    return RateLimitRule(
+        name=name,
+        methods=frozenset(methods.split(",")),
+        path=re.compile(path),
+        limit=int(limit),
+        window=float(window),
+        key=key,
+    )
+
+
+RATE_LIMIT_RULES = (
+    _rule("login", "POST", r"^/api/auth/login$", "10/60"),
+    _rule("register", "POST", r"^/api/auth/register$", "5/60"),
+    _rule("forgot_password", "POST", r"^/api/auth/forgot-password$", "5/900"),
+    _rule("reset_password", "POST", r"^/api/auth/reset-password$", "10/900"),
+    _rule("google_callback", "POST", r"^/api/auth/google/callback$", "20/60"),
+    _rule("public_link_ip", "GET,POST,PUT,DELETE", PUBLIC_LINK_PATH, "600/60"),
+    _rule("public_link_read", "GET", PUBLIC_LINK_PATH, "300/60", key="token"),
+    _rule("public_link_write", "POST,PUT,DELETE", PUBLIC_LINK_PATH, "120/60", key="token"),
+)
+
+
+class MemoryRateLimitBackend:
+    """
+    Sliding-window log per key, kept in this process. Only accepted
+    requests are recorded, so a client that keeps retrying is let back in
+    as soon as its oldest request leaves the window. Keys are kept in LRU
+    order and capped at max_keys, so a flood of distinct keys evicts the
+    least recently seen ones in O(1) instead of growing the map.
+    """
+
+    def __init__(self, max_keys: int = RATE_LIMIT_MAX_KEYS):
+        self.max_keys = max_keys
+        self._hits = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    async def hit(self, key: str, limit: int, window: float) -> float:
+        """Record a request; returns 0 if allowed, else seconds until retry."""
+        now = monotonic()
+        with self._lock:
+            hits = self._hits.get(key)
+            if hits is None:
+                hits = self._hits[key] = deque()
+                if len(self._hits) > self.max_keys:
+                    self._hits.popitem(last=False)
+                    self.evictions += 1
+            else:
+                self._hits.move_to_end(key)
+
+            while hits and hits[0] <= now - window:
+                hits.popleft()
+
+            if len(hits) >= limit:
+                return hits[0] + window - now
+
+            hits.append(now)
+            return 0.0
+
+    async def forget(self, key: str):
+        """Take back the latest recorded request for a key."""
+        with self._lock:
+            hits = self._hits.get(key)
+            if hits:
+                hits.pop()
+
+    async def close(self):
+        pass
+
+    def stats(self) -> dict:
+        return {"backend": "memory", "keys": len(self._hits), "evictions": self.evictions}
+
+
+class RedisRateLimitBackend:
+    """
+    The same sliding-window log shared by every worker, as one sorted set
+    per key scored by timestamp. `client` is a redis.asyncio client (or
+    anything speaking the same commands).
+    """
+
+    def __init__(self, client, prefix: str = RATE_LIMIT_REDIS_PREFIX):
+        self.client = client
+        self.prefix = prefix
+
+    async def hit(self, key: str, limit: int, window: float) -> float:
+        redis_key = self.prefix + key
+        now = time()
+        member = f"{now}:{uuid.uuid4().hex[:8]}"
+
+        pipe = self.client.pipeline(transaction=True)
+        pipe.zremrangebyscore(redis_key, 0, now - window)
+        pipe.zadd(redis_key, {member: now})
+        pipe.zcard(redis_key)
+        pipe.pexpire(redis_key, int(window * 1000))
+        _, _, count, _ = await pipe.execute()
+
+        if count <= limit:
+            return 0.0
+
+        # Over the limit: take this request back out so rejected retries
+        # don't extend the lockout, and report when the oldest one expires.
+        await self.client.zrem(redis_key, member)
+        oldest = await self.client.zrange(redis_key, 0, 0, withscores=True)
+        if not oldest:
+            return 0.0
+        return max(float(oldest[0][1]) + window - now, 0.0)
+
+    async def forget(self, key: str):
+        await self.client.zpopmax(self.prefix + key)
+
+    async def close(self):
+        await self.client.aclose()
+
+    def stats(self) -> dict:
+        return {"backend": "redis", "prefix": self.prefix}
+
+
+def create_rate_limit_backend():
+    if RATE_LIMIT_REDIS_URL:
+        import redis.asyncio as redis
+
+        print("✅ Rate limiting uses the shared Redis backend")
+        return RedisRateLimitBackend(redis.from_url(RATE_LIMIT_REDIS_URL))
+    return MemoryRateLimitBackend()
+
+
+def client_ip(scope) -> str:
+    if RATE_LIMIT_TRUST_FORWARDED:
+        for name, value in scope.get("headers", []):
+            if name == b"x-forwarded-for":
+                return value.decode("latin-1").split(",")[0].strip()
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+class RateLimiter:
+    """
+    Matches requests against RATE_LIMIT_RULES and records them in the
+    backend. IP rules run first, so token-keyed rules (whose keys come
+    from unverified path segments) are only consulted once the client's
+    IP is within its limit. A request rejected by a later rule is taken
+    back out of the rules it already passed. If the backend fails,
+    requests are let through rather than locking everyone out.
+    """
+
+    def __init__(self, backend=None, rules: Tuple[RateLimitRule, ...] = RATE_LIMIT_RULES):
+        self.backend = backend or create_rate_limit_backend()
+        self.rules = tuple(sorted(rules, key=lambda rule: rule.key != "ip"))
+
+        self.allowed = 0
+        self.rejected = {}
+        self.backend_errors = 0
+
+    def _key(self, rule: RateLimitRule, scope, match) -> Optional[str]:
+        if rule.key == "token":
+            token = match.groupdict().get("token")
+            if not token:
+                return None
+            return f"{rule.name}:{hashlib.sha256(token.encode('utf-8')).hexdigest()}"
+        return f"{rule.name}:{client_ip(scope)}"
+
+    async def check(self, scope) -> float:
+        """0 if the request may proceed, else seconds until it may be retried."""
+        method, path = scope["method"], scope["path"]
+        recorded = []
+        for rule in self.rules:
+            if method not in rule.methods:
+                continue
+            match = rule.path.match(path)
+            if not match:
+                continue
+            key = self._key(rule, scope, match)
+            if key is None:
+                continue
+
+            try:
+                retry_after = await self.backend.hit(key, rule.limit, rule.window)
+            except Exception as e:
+                self.backend_errors += 1
+                print(f"⚠️ Rate limit backend error, allowing request: {e}")
+                continue
+
+            if retry_after > 0:
+                self.rejected[rule.name] = self.rejected.get(rule.name, 0) + 1
+                for earlier in recorded:
+                    try:
+                        await self.backend.forget(earlier)
+                    except Exception:
+                        self.backend_errors += 1
+                return retry_after
+            recorded.append(key)
+
+        self.allowed += 1
+        return 0.0
+
+    async def close(self):
+        await self.backend.close()
+
+    def stats(self) -> dict:
+        return {
+            "enabled": RATE_LIMIT_ENABLED,
+            "allowed": self.allowed,
+            "rejected": dict(self.rejected),
+            "backend_errors": self.backend_errors,
+            **self.backend.stats(),
+        }
+
+
+rate_limiter = RateLimiter()
+
+
+class RateLimitMiddleware:
+    """
+    ASGI middleware in front of the routers, so a throttled request is
+    answered with 429 before it opens a DB session or reaches password
+    hashing.
+    """
+
+    def __init__(self, app, limiter: RateLimiter = None):
+        self.app = app
+        self.limiter = limiter or rate_limiter
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not RATE_LIMIT_ENABLED:
+            return await self.app(scope, receive, send)
+
+        retry_after = await self.limiter.check(scope)
+        if retry_after > 0:
+            return await self._reject(send, retry_after)
+
+        await self.app(scope, receive, send)
+
+    async def _reject(self, send, retry_after: float):
+        body = json.dumps({"detail": "Too many requests, please try again later."}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(max(1, int(retry_after + 0.999))).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
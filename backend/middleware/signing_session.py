@@ -0,0 +1,146 @@
+import os
+from datetime import datetime
+from dataclasses import dataclass
+from typing import Optional
+
+from fastapi import Depends, HTTPException, status
+from sqlalchemy.orm import Session
+
+from database import get_db
+from models.document import Document
+from models.document_signer import DocumentSigner
+from models.signing_link import SigningLink
+from models.user import User
+from services.email_service import verify_signing_token
+from services.signing_token_cache import token_digest
+from utils.cache import LRUCache
+
+SIGNING_SESSION_CACHE_TTL = float(os.getenv("SIGNING_SESSION_CACHE_TTL", 5))
+SIGNING_SESSION_CACHE_SIZE = int(os.getenv("SIGNING_SESSION_CACHE_SIZE", 1024))
+
+DOCUMENT_FIELDS = (
+    "id", "title", "original_filename", "file_path", "signed_file_path",
+    "status", "owner_id", "created_at", "updated_at",
+)
+
+
+@dataclass(frozen=True)
+class SigningSession:
+    """
+    Everything a public signing endpoint needs about the link holder,
+    as plain values so it can be cached across requests and DB sessions.
+    """
+    token: str
+    document_id: int
+    signer_email: str
+    document: dict
+    signer_id: Optional[int] = None
+    signer_name: Optional[str] = None
+    signer_status: Optional[str] = None
+    signing_order: Optional[int] = None
+    user_id: Optional[int] = None
+    user_name: Optional[str] = None
+
+
+# Short TTL: the public flow fires bursts of requests per token (dragging
+# and resizing fields), and mutations below invalidate explicitly.
+signing_session_cache = LRUCache(max_entries=SIGNING_SESSION_CACHE_SIZE, ttl=SIGNING_SESSION_CACHE_TTL)
+
+
+def _verify(token: str) -> dict:
+    payload = verify_signing_token(token)
+    if not payload:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired signing link"
+        )
+    return payload
+
+
+def load_signing_entities(db: Session, digest: str, document_id: int, signer_email: str):
+    """
+    Document, the DocumentSigner row the link was issued to and the User
+    with the signer's email, in a single joined query on the link digest.
+    Returns None if the link was never issued, has been revoked or has
+    expired; a validly signed token alone is not enough.
+    """
+    return db.query(Document, DocumentSigner, User).select_from(SigningLink).join(
+        DocumentSigner, DocumentSigner.id == SigningLink.signer_id
+    ).join(
+        Document, Document.id == DocumentSigner.document_id
+    ).outerjoin(
+        User, User.email == DocumentSigner.signer_email
+    ).filter(
+        SigningLink.digest == digest,
+        SigningLink.expires_at > datetime.utcnow(),
+        Document.id == document_id,
+        DocumentSigner.signer_email == signer_email
+    ).first()
+
+
+def _unknown_link():
+    raise HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid or expired signing link"
+    )
+
+
+def get_signing_session(token: str, db: Session = Depends(get_db)) -> SigningSession:
+    """
+    Dependency for read-mostly public endpoints. Verifies the link and
+    returns a cached SigningSession, loading it with one query on a miss.
+    """
+    payload = _verify(token)
+    digest = token_digest(token)
+
+    session = signing_session_cache.get(digest)
+    if session is not None:
+        return session
+
+    document_id = payload.get("document_id")
+    signer_email = payload.get("signer_email")
+
+    row = load_signing_entities(db, digest, document_id, signer_email)
+    if row is None:
+        _unknown_link()
+
+    document, signer, user = row
+    session = SigningSession(
+        token=token,
+        document_id=document_id,
+        signer_email=signer_email,
+        document={field: getattr(document, field) for field in DOCUMENT_FIELDS},
+        signer_id=signer.id if signer else None,
+        signer_name=signer.signer_name if signer else None,
+        signer_status=signer.status if signer else None,
+        signing_order=signer.signing_order if signer else None,
+        user_id=user.id if user else None,
+        user_name=user.name if user else None,
+    )
+    signing_session_cache.set(digest, session)
+    return session
+
+
+def get_signing_entities(token: str, db: Session = Depends(get_db)):
+    """
+    Dependency for endpoints that change document or signer state: always
+    reads fresh, attached ORM objects (one query) instead of the cache.
+    Returns (payload, document, signer, user).
+    """
+    payload = _verify(token)
+
+    row = load_signing_entities(db, token_digest(token), payload.get("document_id"), payload.get("signer_email"))
+    if row is None:
+        _unknown_link()
+
+    document, signer, user = row
+    return payload, document, signer, user
+
+
+def invalidate_signing_sessions(document_id: int) -> int:
+    """Drop cached sessions for a document after its state changes."""
+    return signing_session_cache.pop_matching(lambda session: session.document_id == document_id)
+
+
+def get_signing_session_cache_stats() -> dict:
+    return signing_session_cache.stats()
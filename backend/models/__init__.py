@@ -3,5 +3,12 @@ from .document import Document, DocumentStatus
 from .signature import Signature, SignatureStatus, SignatureType
 from .audit_log import AuditLog
 from .document_signer import DocumentSigner  # NEW
+from .saved_signature import SavedSignature
+from .email_outbox import EmailOutbox
+from .audit_daily_rollup import AuditDailyRollup
+from .audit_rollup_watermark import AuditRollupWatermark
+from .audit_chain_head import AuditChainHead
+from .audit_checkpoint import AuditCheckpoint
+from .signing_link import SigningLink
 
-__all__ = ["User", "Document", "DocumentStatus", "Signature", "SignatureStatus", "SignatureType", "AuditLog", "DocumentSigner"]
\ No newline at end of file
+__all__ = ["User", "Document", "DocumentStatus", "Signature", "SignatureStatus", "SignatureType", "AuditLog", "DocumentSigner", "SavedSignature", "EmailOutbox", "AuditDailyRollup", "AuditRollupWatermark", "AuditChainHead", "AuditCheckpoint", "SigningLink"]
\ No newline at end of file
@@ -0,0 +1,13 @@
+from sqlalchemy import Column, Integer, String, ForeignKey
+from database import Base
+
+
+class AuditChainHead(Base):
+    __tablename__ = "audit_chain_heads"
+
+    # Latest link of each document's audit hash chain. Kept apart from
+    # audit_logs so the chain survives archival of its oldest entries.
+    document_id = Column(Integer, ForeignKey("documents.id", ondelete="CASCADE"), primary_key=True)
+    seq = Column(Integer, nullable=False)
+    entry_hash = Column(String(64), nullable=False)
+    signature = Column(String(64), nullable=False)
@@ -0,0 +1,13 @@
+from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey
+from database import Base
+
+
+class AuditDailyRollup(Base):
+    __tablename__ = "audit_daily_rollups"
+
+    # One row per user, UTC day and action; rebuilt for each completed day.
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    day = Column(Date, primary_key=True, index=True)
+    action = Column(String(100), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+    last_at = Column(DateTime(timezone=True), nullable=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from database import Base
@@ -18,5 +18,19 @@ class AuditLog(Base):
 
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    # Per-document hash chain (see services/audit_chain_service.py);
+    # NULL for entries without a document and for entries older than the chain.
+    chain_seq = Column(Integer, nullable=True)
+    prev_hash = Column(String(64), nullable=True)
+    entry_hash = Column(String(64), nullable=True)
+
     user = relationship("User", back_populates="audit_logs")
-    document = relationship("Document", back_populates="audit_logs")
\ No newline at end of file
+    document = relationship("Document", back_populates="audit_logs")
+
+    __table_args__ = (
+        # Keyset pagination seeks on (created_at, id) within one user or document.
+        Index("ix_audit_logs_user_keyset", "user_id", "created_at", "id"),
+        Index("ix_audit_logs_document_keyset", "document_id", "created_at", "id"),
+        Index("ix_audit_logs_created_at", "created_at"),
+        Index("ix_audit_logs_document_chain", "document_id", "chain_seq"),
+    )
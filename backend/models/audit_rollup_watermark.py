@@ -0,0 +1,13 @@
+from sqlalchemy import Column, String, Date, DateTime
+from sqlalchemy.sql import func
+from database import Base
+
+
+class AuditRollupWatermark(Base):
+    __tablename__ = "audit_rollup_watermarks"
+
+    # Last UTC day each rollup has covered. Advances over days with no
+    # activity too, so those are not re-scanned on every run.
+    name = Column(String(50), primary_key=True)
+    through_day = Column(Date, nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
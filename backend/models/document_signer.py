@@ -14,11 +14,12 @@ class DocumentSigner(Base):
     signing_order = Column(Integer, default=0)
     status = Column(String(50), default="pending")
     signed_at = Column(DateTime, nullable=True)
-    signing_token = Column(String(500), unique=True, nullable=True)
     token_expires_at = Column(DateTime, nullable=True)
     rejection_reason = Column(Text, nullable=True)
     rejected_at = Column(DateTime, nullable=True)
+    last_reminded_at = Column(DateTime, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
-    document = relationship("Document", back_populates="signers")
\ No newline at end of file
+    document = relationship("Document", back_populates="signers")
+    links = relationship("SigningLink", back_populates="signer", cascade="all, delete-orphan", passive_deletes=True)
\ No newline at end of file
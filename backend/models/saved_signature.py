@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text
+from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
+from database import Base
+
+
+class SavedSignature(Base):
+    __tablename__ = "saved_signatures"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    kind = Column(String(20), nullable=False, default="signature")  # signature | initials
+    label = Column(String(100), nullable=True)
+    image_path = Column(String(500), nullable=True)  # Pre-normalized PNG
+    signature_strokes = Column(Text, nullable=True)
+    signature_text = Column(String(500), nullable=True)
+    signature_font = Column(String(100), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    user = relationship("User", back_populates="saved_signatures")
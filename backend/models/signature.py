@@ -1,5 +1,5 @@
 import enum
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Text, Enum as SQLEnum
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from database import Base
@@ -32,6 +32,7 @@ class Signature(Base):
     height = Column(Float, default=50.0)
     signature_text = Column(String(500), nullable=True)
     signature_image_path = Column(String(500), nullable=True)
+    signature_strokes = Column(Text, nullable=True)  # JSON point arrays for vector signatures
     signature_font = Column(String(100), default="cursive")
     signature_type = Column(String(20), default="signature")
     status = Column(SQLEnum(SignatureStatus), default=SignatureStatus.PENDING)
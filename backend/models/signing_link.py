@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
+from database import Base
+
+
+class SigningLink(Base):
+    __tablename__ = "signing_links"
+
+    # sha256 of an issued signing link; the bearer token itself is never stored.
+    # A link resolves only while its row exists, so deleting rows revokes.
+    digest = Column(String(64), primary_key=True)
+    signer_id = Column(Integer, ForeignKey("document_signers.id", ondelete="CASCADE"), nullable=False, index=True)
+    expires_at = Column(DateTime, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    signer = relationship("DocumentSigner", back_populates="links")
@@ -16,9 +16,12 @@ class User(Base):
     profile_picture = Column(String, nullable=True)
     reset_token = Column(String(255), unique=True, nullable=True)
     reset_token_expires = Column(DateTime, nullable=True)
+    # Bumped on logout and password reset; access tokens carry the value they were issued with.
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     documents = relationship("Document", back_populates="owner", cascade="all, delete-orphan")
     signatures = relationship("Signature", back_populates="signer", cascade="all, delete-orphan")
-    audit_logs = relationship("AuditLog", back_populates="user", cascade="all, delete-orphan")
\ No newline at end of file
+    audit_logs = relationship("AuditLog", back_populates="user", cascade="all, delete-orphan")
+    saved_signatures = relationship("SavedSignature", back_populates="user", cascade="all, delete-orphan")
\ No newline at end of file
@@ -1,42 +1,58 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from database import get_db
-from models.user import User
-from models.audit_log import AuditLog
-from middleware.auth_middleware import get_current_user
+from models.document import Document
+from middleware.auth_middleware import get_token_user, TokenUser
+from services.audit_rollup_service import summarize_audit_activity
+from services.audit_export_service import build_export_query, stream_csv, stream_ndjson
+from services.audit_service import create_audit_log, AuditActions
+from services.audit_chain_service import verify_document_chain
+from services.audit_query_service import (
+    AUDIT_PAGE_SIZE, AUDIT_MAX_PAGE_SIZE, InvalidCursor,
+    user_audit_logs_query, document_audit_logs_query, keyset_page, split_page
+)
 from typing import List, Optional
 from datetime import datetime, timedelta
 
 router = APIRouter(prefix="/api/audit-logs", tags=["Audit Logs"])
 
 
+def _fetch_page(db: Session, query, cursor: Optional[str], limit: int):
+    try:
+        page = keyset_page(query, cursor, limit)
+    except InvalidCursor:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+    return split_page(db.execute(page).scalars().all(), limit)
+
+
 @router.get("/")
 def get_audit_logs(
         document_id: Optional[int] = None,
         action: Optional[str] = None,
         days: int = Query(default=30, ge=1, le=365),
-        limit: int = Query(default=100, ge=1, le=1000),
-        current_user: User = Depends(get_current_user),
+        limit: int = Query(default=AUDIT_PAGE_SIZE, ge=1, le=AUDIT_MAX_PAGE_SIZE),
+        cursor: Optional[str] = None,
+        current_user: TokenUser = Depends(get_token_user),
         db: Session = Depends(get_db)
 ):
 
     since_date = datetime.utcnow() - timedelta(days=days)
 
-    query = db.query(AuditLog).filter(
-        AuditLog.user_id == current_user.id,
-        AuditLog.created_at >= since_date
+    query = user_audit_logs_query(
+        current_user.id,
+        since=since_date,
+        document_id=document_id,
+        action=action
     )
-
-    if document_id:
-        query = query.filter(AuditLog.document_id == document_id)
-
-    if action:
-        query = query.filter(AuditLog.action == action)
-
-    logs = query.order_by(AuditLog.created_at.desc()).limit(limit).all()
+    logs, next_cursor = _fetch_page(db, query, cursor, limit)
 
     return {
         "total": len(logs),
+        "next_cursor": next_cursor,
         "logs": [
             {
                 "id": log.id,
@@ -52,10 +68,66 @@ def get_audit_logs(
     }
 
 
+@router.get("/export")
+def export_audit_logs(
+        request: Request,
+        format: str = Query(default="csv", pattern="^(csv|ndjson)$"),
+        document_id: Optional[int] = None,
+        user_id: Optional[int] = None,
+        action: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        current_user: TokenUser = Depends(get_token_user),
+        db: Session = Depends(get_db)
+):
+
+    query = build_export_query(
+        owner_id=current_user.id,
+        document_id=document_id,
+        user_id=user_id,
+        action=action,
+        since=since,
+        until=until
+    )
+
+    # Only attach the export to a document's trail (and its hash chain)
+    # when the caller owns it; otherwise log it against the user alone.
+    owned_document_id = None
+    if document_id is not None:
+        owned_document_id = db.query(Document.id).filter(
+            Document.id == document_id,
+            Document.owner_id == current_user.id
+        ).scalar()
+
+    create_audit_log(
+        db=db,
+        action=AuditActions.AUDIT_LOG_EXPORTED,
+        description=f"Audit log exported as {format} by {current_user.email}",
+        user_id=current_user.id,
+        document_id=owned_document_id,
+        ip_address=request.client.host,
+        user_agent=request.headers.get("user-agent")
+    )
+
+    filename = f"audit_logs_{datetime.utcnow():%Y%m%dT%H%M%S}.{format}"
+    if format == "ndjson":
+        body, media_type = stream_ndjson(query), "application/x-ndjson"
+    else:
+        body, media_type = stream_csv(query), "text/csv"
+
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
 @router.get("/document/{document_id}")
 def get_document_audit_logs(
         document_id: int,
-        current_user: User = Depends(get_current_user),
+        limit: int = Query(default=AUDIT_PAGE_SIZE, ge=1, le=AUDIT_MAX_PAGE_SIZE),
+        cursor: Optional[str] = None,
+        current_user: TokenUser = Depends(get_token_user),
         db: Session = Depends(get_db)
 ):
 
@@ -71,14 +143,13 @@ def get_document_audit_logs(
             detail="Document not found"
         )
 
-    logs = db.query(AuditLog).filter(
-        AuditLog.document_id == document_id
-    ).order_by(AuditLog.created_at.desc()).all()
+    logs, next_cursor = _fetch_page(db, document_audit_logs_query(document_id), cursor, limit)
 
     return {
         "document_id": document_id,
         "document_title": document.title,
         "total_logs": len(logs),
+        "next_cursor": next_cursor,
         "logs": [
             {
                 "id": log.id,
@@ -92,27 +163,41 @@ def get_document_audit_logs(
     }
 
 
+@router.get("/document/{document_id}/verify")
+def verify_document_audit_trail(
+        document_id: int,
+        full: bool = False,
+        current_user: TokenUser = Depends(get_token_user),
+        db: Session = Depends(get_db)
+):
+
+    from models.document import Document
+    document = db.query(Document.id).filter(
+        Document.id == document_id,
+        Document.owner_id == current_user.id
+    ).first()
+
+    if not document:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Document not found"
+        )
+
+    return verify_document_chain(db, document_id, full=full)
+
+
 @router.get("/summary")
 def get_audit_summary(
         days: int = Query(default=7, ge=1, le=365),
-        current_user: User = Depends(get_current_user),
+        current_user: TokenUser = Depends(get_token_user),
         db: Session = Depends(get_db)
 ):
 
     since_date = datetime.utcnow() - timedelta(days=days)
 
-    logs = db.query(AuditLog).filter(
-        AuditLog.user_id == current_user.id,
-        AuditLog.created_at >= since_date
-    ).all()
-
-    action_counts = {}
-    for log in logs:
-        action_counts[log.action] = action_counts.get(log.action, 0) + 1
+    summary = summarize_audit_activity(db, current_user.id, since_date)
 
     return {
         "period_days": days,
-        "total_activities": len(logs),
-        "action_breakdown": action_counts,
-        "most_recent": logs[0].created_at if logs else None
-    }
\ No newline at end of file
+        **summary
+    }
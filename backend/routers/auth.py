@@ -1,25 +1,24 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from database import get_db
 from models.user import User
-from middleware.auth_middleware import get_current_user
+from middleware.auth_middleware import get_current_user, revoke_user_tokens
 from schemas.user import UserCreate, UserLogin, UserResponse, Token
-from utils.security import hash_password, verify_password, create_access_token
+from utils.security import hash_password_in_executor, verify_and_update_password_in_executor, create_user_access_token
 from datetime import datetime, timedelta
 from services.audit_service import create_audit_log, AuditActions
 from fastapi import APIRouter, HTTPException, Depends
 from sqlalchemy.orm import Session
 from pydantic import BaseModel, EmailStr
-from passlib.context import CryptContext
 import secrets
+from typing import Optional
 from services.email_service import send_password_reset_email
 import os
 
 
 router = APIRouter(prefix="/api/auth", tags=["Authentication"])
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 class ForgotPasswordRequest(BaseModel):
     email: EmailStr
 
@@ -28,21 +27,22 @@ class ResetPasswordRequest(BaseModel):
     new_password: str
 
 
-@router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def register(
-        user_data: UserCreate,
-        request: Request,
-        db: Session = Depends(get_db)
-):
+def _email_taken(db: Session, email: str) -> bool:
+    return db.query(User.id).filter(User.email == email).first() is not None
 
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
-    if existing_user:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Email already registered"
-        )
 
-    hashed_password = hash_password(user_data.password)
+def _user_response(user: User) -> dict:
+    return {
+        "id": user.id,
+        "name": user.name,
+        "email": user.email,
+        "created_at": user.created_at,
+        "access_token": create_user_access_token(user),
+        "token_type": "bearer"
+    }
+
+
+def _create_user(db: Session, user_data: UserCreate, hashed_password: str, ip_address: str, user_agent: str) -> dict:
     new_user = User(
         name=user_data.name,
         email=user_data.email,
@@ -58,28 +58,61 @@ def register(
         action=AuditActions.USER_REGISTERED,
         description=f"New user registered: {user_data.email}",
         user_id=new_user.id,
-        ip_address=request.client.host,
-        user_agent=request.headers.get("user-agent")
+        ip_address=ip_address,
+        user_agent=user_agent
     )
+    return _user_response(new_user)
 
-    access_token = create_access_token(data={"sub": new_user.email})
-    return {
-        "id": new_user.id,
-        "name": new_user.name,
-        "email": new_user.email,
-        "created_at": new_user.created_at,
-        "access_token": access_token,
-        "token_type": "bearer"
-    }
+
+@router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
+async def register(
+        user_data: UserCreate,
+        request: Request,
+        db: Session = Depends(get_db)
+):
+    # DB work runs in the threadpool and bcrypt on its own executor, so
+    # neither blocks the event loop nor holds a threadpool thread while
+    # the other runs.
+    if await run_in_threadpool(_email_taken, db, user_data.email):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered"
+        )
+
+    hashed_password = await hash_password_in_executor(user_data.password)
+    return await run_in_threadpool(
+        _create_user, db, user_data, hashed_password,
+        request.client.host, request.headers.get("user-agent")
+    )
+
+
+def _find_user(db: Session, email: str):
+    return db.query(User).filter(User.email == email).first()
+
+
+def _record_login(db: Session, user: User, new_hash: Optional[str], ip_address: str, user_agent: str) -> dict:
+    if new_hash:
+        # Cost changed since this hash was made; committed with the audit log.
+        user.password = new_hash
+
+    create_audit_log(
+        db=db,
+        action=AuditActions.USER_LOGIN,
+        description=f"User logged in: {user.email}",
+        user_id=user.id,
+        ip_address=ip_address,
+        user_agent=user_agent
+    )
+    return _user_response(user)
 
 
 @router.post("/login", response_model=UserResponse)
-def login(
+async def login(
         credentials: UserLogin,
         request: Request,
         db: Session = Depends(get_db)
 ):
-    user = db.query(User).filter(User.email == credentials.email).first()
+    user = await run_in_threadpool(_find_user, db, credentials.email)
 
     if not user:
         raise HTTPException(
@@ -87,31 +120,28 @@ def login(
             detail="Incorrect email or password"
         )
 
-    if not verify_password(credentials.password, user.password):
+    valid, new_hash = await verify_and_update_password_in_executor(credentials.password, user.password)
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password"
         )
 
-    create_audit_log(
-        db=db,
-        action=AuditActions.USER_LOGIN,
-        description=f"User logged in: {user.email}",
-        user_id=user.id,
-        ip_address=request.client.host,
-        user_agent=request.headers.get("user-agent")
+    return await run_in_threadpool(
+        _record_login, db, user, new_hash,
+        request.client.host, request.headers.get("user-agent")
     )
 
-    access_token = create_access_token(data={"sub": user.email})
 
-    return {
-        "id": user.id,
-        "name": user.name,
-        "email": user.email,
-        "created_at": user.created_at,
-        "access_token": access_token,
-        "token_type": "bearer"
-    }
+def _issue_reset_token(db: Session, email: str):
+    user = db.query(User).filter(User.email == email).first()
+    if not user:
+        return None
+
+    user.reset_token = secrets.token_urlsafe(32)
+    user.reset_token_expires = datetime.utcnow() + timedelta(hours=1)
+    db.commit()
+    return user.email, user.name, user.reset_token
 
 
 @router.post("/forgot-password")
@@ -120,25 +150,20 @@ async def forgot_password(
         db: Session = Depends(get_db)
 ):
 
-    user = db.query(User).filter(User.email == request.email).first()
+    # Sync DB work stays off the event loop; only the send is awaited here.
+    issued = await run_in_threadpool(_issue_reset_token, db, request.email)
 
-    if not user:
+    if not issued:
         return {"message": "If that email exists, a reset link has been sent"}
 
-    reset_token = secrets.token_urlsafe(32)
-    reset_expires = datetime.utcnow() + timedelta(hours=1)
-
-    user.reset_token = reset_token
-    user.reset_token_expires = reset_expires
-    db.commit()
-
+    user_email, user_name, reset_token = issued
     try:
         frontend_url = os.getenv("FRONTEND_URL", "http://localhost:5173")
         reset_link = f"{frontend_url}/reset-password?token={reset_token}"
 
         await send_password_reset_email(
-            user_email=user.email,
-            user_name=user.name,
+            user_email=user_email,
+            user_name=user_name,
             reset_link=reset_link
         )
     except Exception as e:
@@ -147,13 +172,9 @@ async def forgot_password(
     return {"message": "If that email exists, a reset link has been sent"}
 
 
-@router.post("/reset-password")
-def reset_password(
-        request: ResetPasswordRequest,
-        db: Session = Depends(get_db)
-):
+def _find_reset_user(db: Session, token: str) -> User:
     user = db.query(User).filter(
-        User.reset_token == request.token
+        User.reset_token == token
     ).first()
 
     if not user:
@@ -167,18 +188,50 @@ def reset_password(
             status_code=400,
             detail="Reset token has expired. Please request a new one."
         )
+    return user
 
-    hashed_password = pwd_context.hash(request.new_password)
 
+def _set_new_password(db: Session, user: User, hashed_password: str):
     user.password = hashed_password
     user.reset_token = None
     user.reset_token_expires = None
+    revoke_user_tokens(user)
 
     db.commit()
 
+
+@router.post("/reset-password")
+async def reset_password(
+        request: ResetPasswordRequest,
+        db: Session = Depends(get_db)
+):
+    user = await run_in_threadpool(_find_reset_user, db, request.token)
+    hashed_password = await hash_password_in_executor(request.new_password)
+    await run_in_threadpool(_set_new_password, db, user, hashed_password)
+
     return {"message": "Password reset successfully"}
 
 
+@router.post("/logout")
+def logout(
+        request: Request,
+        current_user: User = Depends(get_current_user),
+        db: Session = Depends(get_db)
+):
+    revoke_user_tokens(current_user)
+
+    create_audit_log(
+        db=db,
+        action=AuditActions.USER_LOGOUT,
+        description=f"User logged out: {current_user.email}",
+        user_id=current_user.id,
+        ip_address=request.client.host,
+        user_agent=request.headers.get("user-agent")
+    )
+
+    return {"message": "Logged out successfully"}
+
+
 @router.get("/me", response_model=UserResponse)
 def get_current_user_info(current_user: User = Depends(get_current_user)):
 
@@ -8,22 +8,23 @@ import shutil
 from models.document import Document, DocumentStatus
 from schemas.document import DocumentResponse, DocumentListResponse
 from services.pdf_service import generate_signed_pdf
+from services.saved_signature_service import remove_signature_image
 from models.signature import Signature
-from middleware.auth_middleware import get_current_user
+from middleware.auth_middleware import get_current_user, get_token_user, TokenUser
 from fastapi.responses import FileResponse
 import os
 import uuid
 from typing import List, Optional
-from services.email_service import (
-    send_signing_request_email,
-    send_document_signed_email,
-    verify_signing_token, generate_signing_token, SIGNING_TOKEN_EXPIRE_HOURS, send_document_rejected_email,send_signer_download_email
-)
+from services.email_service import SIGNING_TOKEN_EXPIRE_HOURS
 from services.audit_service import create_audit_log, AuditActions
+from services.outbox_service import enqueue_email, outbox_worker
+from services.signing_links import issue_signing_link, revoke_signing_links
+from middleware.signing_session import (
+    SigningSession, get_signing_session, get_signing_entities, invalidate_signing_sessions
+)
 from schemas.signer import SignerCreate, SignerResponse
 from models.document_signer import DocumentSigner
 from pydantic import BaseModel,EmailStr
-from services.email_service import BACKEND_URL
 
 router = APIRouter(prefix="/api/documents", tags=["Documents"])
 
@@ -168,7 +169,7 @@ async def upload_document(
 
 @router.get("/", response_model=DocumentListResponse)
 def get_documents(
-        current_user: User = Depends(get_current_user),
+        current_user: TokenUser = Depends(get_token_user),
         db: Session = Depends(get_db)
 ):
 
@@ -182,7 +183,7 @@ def get_documents(
 
 @router.get("/received")
 def get_received_documents(
-        current_user: User = Depends(get_current_user),
+        current_user: TokenUser = Depends(get_token_user),
         db: Session = Depends(get_db)
 ):
 
@@ -258,7 +259,7 @@ def debug_document(
 @router.get("/{document_id}/signers")
 def get_document_signers(
         document_id: int,
-        current_user: User = Depends(get_current_user),
+        current_user: TokenUser = Depends(get_token_user),
         db: Session = Depends(get_db)
 ):
     document = db.query(Document).filter(
@@ -284,7 +285,6 @@ def get_document_signers(
             "id": signer.id,
             "signer_email": signer.signer_email,
             "signer_name": signer.signer_name,
-            "signing_token": signer.signing_token,
             "signing_order": signer.signing_order,
             "status": signer.status,
             "signed_at": signer.signed_at,
@@ -295,11 +295,33 @@ def get_document_signers(
     return result
 
 
+@router.post("/{document_id}/signing-link")
+def create_own_signing_link(
+        document_id: int,
+        current_user: TokenUser = Depends(get_token_user),
+        db: Session = Depends(get_db)
+):
+    """
+    Mint a signing link for the caller's own signer row, e.g. when they
+    open a received document from the dashboard. Only its digest is kept.
+    """
+    signer = db.query(DocumentSigner).filter(
+        DocumentSigner.document_id == document_id,
+        DocumentSigner.signer_email == current_user.email
+    ).first()
+    if not signer:
+        raise HTTPException(status_code=404, detail="Document not found")
+
+    token = issue_signing_link(db, signer)
+    db.commit()
+    return {"signing_token": token}
+
+
 @router.get("/{document_id}", response_model=DocumentResponse)
 def get_document(
         document_id: int,
         request: Request,
-        current_user: User = Depends(get_current_user),
+        current_user: TokenUser = Depends(get_token_user),
         db: Session = Depends(get_db)
 ):
 
@@ -427,7 +449,7 @@ def finalize_document(
 def download_signed_document(
         document_id: int,
         request: Request,
-        current_user: User = Depends(get_current_user),
+        current_user: TokenUser = Depends(get_token_user),
         db: Session = Depends(get_db)
 ):
 
@@ -470,29 +492,19 @@ def download_signed_document(
     )
 
 @router.get("/public/{token}/download-signed")
-def download_signed_public(token: str, db: Session = Depends(get_db)):
-
-    payload = verify_signing_token(token)
-    if not payload:
-        raise HTTPException(status_code=401, detail="Invalid or expired signing link")
-
-    document_id = payload.get("document_id")
-    signer_email = payload.get("signer_email")
-
-    document = db.query(Document).filter(Document.id == document_id).first()
-    if not document:
-        raise HTTPException(status_code=404, detail="Document not found")
+def download_signed_public(session: SigningSession = Depends(get_signing_session)):
+    document = session.document
 
-    if document.status != DocumentStatus.SIGNED:
+    if document["status"] != DocumentStatus.SIGNED:
         raise HTTPException(status_code=400, detail="Document has not been fully signed yet")
 
-    if not document.signed_file_path or not os.path.exists(document.signed_file_path):
+    if not document["signed_file_path"] or not os.path.exists(document["signed_file_path"]):
         raise HTTPException(status_code=404, detail="Signed file not found on server")
 
     return FileResponse(
-        path=document.signed_file_path,
+        path=document["signed_file_path"],
         media_type="application/pdf",
-        filename=f"signed_{document.original_filename}",
+        filename=f"signed_{document['original_filename']}",
         headers={"Access-Control-Allow-Origin": "*"}
     )
 
@@ -522,20 +534,24 @@ def delete_document(
         os.remove(document.signed_file_path)
 
 
-    signatures = db.query(Signature).filter(Signature.document_id == document_id).all()
-    for sig in signatures:
-        if sig.signature_image_path and os.path.exists(sig.signature_image_path):
-            os.remove(sig.signature_image_path)
+    image_paths = {
+        path for (path,) in db.query(Signature.signature_image_path).filter(Signature.document_id == document_id)
+    }
 
 
+    revoke_signing_links(db, document_id)
     db.delete(document)
     db.commit()
 
+    for path in image_paths:
+        remove_signature_image(db, path)
+    invalidate_signing_sessions(document_id)
+
     return None
 
 
 @router.post("/{document_id}/send-signing-request")
-async def send_signing_request(
+def send_signing_request(
         document_id: int,
         signer_email: str,
         signer_name: str,
@@ -554,92 +570,64 @@ async def send_signing_request(
         )
 
 
-    success = await send_signing_request_email(
+    # The link is minted at delivery and must resolve to a signer row.
+    signer = db.query(DocumentSigner).filter(
+        DocumentSigner.document_id == document_id,
+        DocumentSigner.signer_email == signer_email
+    ).first()
+    if not signer:
+        db.add(DocumentSigner(
+            document_id=document_id,
+            signer_name=signer_name,
+            signer_email=signer_email,
+            signing_order=0,
+            token_expires_at=datetime.utcnow() + timedelta(hours=SIGNING_TOKEN_EXPIRE_HOURS),
+            status="pending"
+        ))
+
+    enqueue_email(
+        db,
+        "signing_request",
+        signer_email,
         signer_email=signer_email,
         signer_name=signer_name,
         document_title=document.title,
         document_id=document.id,
         sender_name=current_user.name
     )
-
-    if not success:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to send email"
-        )
+    db.commit()
+    outbox_worker.wake()
 
     return {
-        "message": "Signing request sent successfully",
+        "message": "Signing request queued for delivery",
         "signer_email": signer_email
     }
 
 
 
 @router.get("/public/{token}")
-def get_document_by_token(
-        token: str,
-        db: Session = Depends(get_db)
-):
-    payload = verify_signing_token(token)
-
-    if not payload:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid or expired signing link"
-        )
-
-    document_id = payload.get("document_id")
-    signer_email = payload.get("signer_email")
-
-    document = db.query(Document).filter(Document.id == document_id).first()
-
-    if not document:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Document not found"
-        )
-
+def get_document_by_token(session: SigningSession = Depends(get_signing_session)):
     return {
-        "document": document,
-        "signer_email": signer_email,
-        "token": token
+        "document": session.document,
+        "signer_email": session.signer_email,
+        "token": session.token
     }
 
 
 @router.get("/public/{token}/file")
-async def get_public_document_file(
-        token: str,
-        db: Session = Depends(get_db)
-):
-    from services.email_service import verify_signing_token
-
-    payload = verify_signing_token(token)
-
-    if not payload:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid or expired signing link"
-        )
-
-    document_id = payload.get("document_id")
-    document = db.query(Document).filter(Document.id == document_id).first()
-
-    if not document:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Document not found"
-        )
+async def get_public_document_file(session: SigningSession = Depends(get_signing_session)):
+    document = session.document
 
-    if not os.path.exists(document.file_path):
+    if not os.path.exists(document["file_path"]):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="File not found on server"
         )
 
     return FileResponse(
-        path=document.file_path,
+        path=document["file_path"],
         media_type="application/pdf",
-        filename=document.original_filename,
+        filename=document["original_filename"],
         headers={
             "Access-Control-Allow-Origin": "*",
             "Access-Control-Allow-Methods": "GET",
@@ -648,15 +636,12 @@ async def get_public_document_file(
     )
 
 @router.get("/public/{token}/signers")
-def get_public_document_signers(token: str, db: Session = Depends(get_db)):
-    payload = verify_signing_token(token)
-    if not payload:
-        raise HTTPException(status_code=401, detail="Invalid or expired signing link")
-
-    document_id = payload.get("document_id")
-
+def get_public_document_signers(
+        session: SigningSession = Depends(get_signing_session),
+        db: Session = Depends(get_db)
+):
     signers = db.query(DocumentSigner).filter(
-        DocumentSigner.document_id == document_id
+        DocumentSigner.document_id == session.document_id
     ).all()
 
     return [
@@ -675,19 +660,18 @@ def get_public_document_signers(token: str, db: Session = Depends(get_db)):
 
 @router.put("/public/{token}/{signature_id}/size")
 async def update_signature_size_public(
-    token: str,
     signature_id: int,
     width: float,
     height: float,
     x_position: float,
     y_position: float,
+    session: SigningSession = Depends(get_signing_session),
     db: Session = Depends(get_db)
 ):
-    payload = verify_signing_token(token)
-    if not payload:
-        raise HTTPException(status_code=401, detail="Invalid or expired signing link")
-
-    sig = db.query(Signature).filter(Signature.id == signature_id).first()
+    sig = db.query(Signature).filter(
+        Signature.id == signature_id,
+        Signature.document_id == session.document_id
+    ).first()
     if not sig:
         raise HTTPException(status_code=404, detail="Signature not found")
 
@@ -701,39 +685,24 @@ async def update_signature_size_public(
     return {"message": "Size updated", "width": sig.width, "height": sig.height}
 
 @router.post("/public/{token}/finalize")
-async def finalize_public_document(
-        token: str,
+def finalize_public_document(
         request: Request,
+        entities=Depends(get_signing_entities),
         db: Session = Depends(get_db)
 ):
-    payload = verify_signing_token(token)
-    if not payload:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid or expired signing link"
-        )
-
-    document_id = payload.get("document_id")
+    payload, document, signer, _ = entities
+    document_id = document.id
     signer_email = payload.get("signer_email")
 
-    document = db.query(Document).filter(Document.id == document_id).first()
-    if not document:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Document not found"
-        )
-    signer = db.query(DocumentSigner).filter(
-        DocumentSigner.document_id == document_id,
-        DocumentSigner.signer_email == signer_email
-    ).first()
-
     if signer:
         signer.status = "signed"
         signer.signed_at = datetime.utcnow()
-        db.commit()
+        db.flush()
 
         if signer.signing_order > 0:
-            await notify_next_signer(document_id, db)
+            notify_next_signer(document_id, db)
+
+        db.commit()
 
     all_signers = db.query(DocumentSigner).filter(
         DocumentSigner.document_id == document_id
@@ -764,8 +733,32 @@ async def finalize_public_document(
             document.signed_file_path = signed_pdf_path
             document.status = DocumentStatus.SIGNED
 
-            db.commit()
+            owner = db.query(User).filter(User.id == document.owner_id).first()
+            if owner:
+                enqueue_email(
+                    db,
+                    "document_signed",
+                    owner.email,
+                    owner_email=owner.email,
+                    owner_name=owner.name,
+                    document_title=document.title,
+                    signer_name=signer_email
+                )
 
+            enqueue_email(
+                db,
+                "signer_download_batch",
+                ", ".join(s.signer_email for s in all_signers)[:255],
+                document_title=document.title,
+                document_id=document.id,
+                # Download links are minted per recipient at delivery.
+                recipients=[
+                    {"to_email": s.signer_email, "to_name": s.signer_name or s.signer_email}
+                    for s in all_signers
+                ],
+            )
+
+            # Commits the state change, outbox rows and audit entry together.
             create_audit_log(
                 db=db,
                 action=AuditActions.DOCUMENT_FINALIZED,
@@ -775,27 +768,8 @@ async def finalize_public_document(
                 ip_address=request.client.host,
                 user_agent=request.headers.get("user-agent")
             )
-
-            owner = db.query(User).filter(User.id == document.owner_id).first()
-            if owner:
-                await send_document_signed_email(
-                    owner_email=owner.email,
-                    owner_name=owner.name,
-                    document_title=document.title,
-                    signer_name=signer_email
-                )
-
-            all_signers_final = db.query(DocumentSigner).filter(
-                   DocumentSigner.document_id == document_id
-            ).all()
-            for s in all_signers_final:
-                download_url = f"{BACKEND_URL}/api/documents/public/{s.signing_token}/download-signed"
-                await send_signer_download_email(
-                    to_email=s.signer_email,
-                    to_name=s.signer_name or s.signer_email,
-                    document_title=document.title,
-                    download_url=download_url,
-                   )
+            outbox_worker.wake()
+            invalidate_signing_sessions(document_id)
 
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Failed to generate PDF: {str(e)}")
@@ -810,7 +784,7 @@ async def finalize_public_document(
 
         pending_signers = [s for s in all_signers if s.status == "pending"]
         if pending_signers:
-            await notify_next_signer(document_id, db)
+            notify_next_signer(document_id, db)
 
         create_audit_log(
             db=db,
@@ -821,6 +795,8 @@ async def finalize_public_document(
             ip_address=request.client.host,
             user_agent=request.headers.get("user-agent")
         )
+        outbox_worker.wake()
+        invalidate_signing_sessions(document_id)
 
         return {
             "message": f"Signature recorded. {len(pending_signers)} signer(s) still pending.",
@@ -840,7 +816,7 @@ class MultipleSigningRequestInput(BaseModel):
     enable_signing_order: bool = False
 
 @router.post("/{document_id}/send-multiple-signing-requests")
-async def send_multiple_signing_requests(
+def send_multiple_signing_requests(
     document_id: int,
     request_data: MultipleSigningRequestInput,
     current_user: User = Depends(get_current_user),
@@ -857,52 +833,44 @@ async def send_multiple_signing_requests(
             detail="Document not found"
         )
 
+    revoke_signing_links(db, document_id)
     db.query(DocumentSigner).filter(DocumentSigner.document_id == document_id).delete()
-    db.commit()
 
+    token_expires_at = datetime.utcnow() + timedelta(hours=SIGNING_TOKEN_EXPIRE_HOURS)
     created_signers = []
     for signer_data in request_data.signers:
-        token = generate_signing_token(document_id, signer_data.signer_email)
-        token_expires_at = datetime.utcnow() + timedelta(hours=int(os.getenv("SIGNING_TOKEN_EXPIRE_HOURS", 72)))
-
         document_signer = DocumentSigner(
             document_id=document_id,
             signer_name=signer_data.signer_name,
             signer_email=signer_data.signer_email,
             signing_order=signer_data.signing_order if request_data.enable_signing_order else 0,
-            signing_token=token,
             token_expires_at=token_expires_at,
             status="pending"
         )
         db.add(document_signer)
         created_signers.append(document_signer)
 
-    db.commit()
-
-    successful_sends = 0
-    failed_sends = []
-
-    for signer in created_signers:
-        if request_data.enable_signing_order and signer.signing_order > 1:
-            continue
-
-        try:
-            success = await send_signing_request_email(
-                signer_email=signer.signer_email,
-                signer_name=signer.signer_name,
-                document_title=document.title,
-                document_id=document.id,
-                sender_name=current_user.name,
-                custom_message=request_data.custom_message
-            )
+    # Later signers in an ordered flow are emailed by notify_next_signer.
+    queued = [
+        signer for signer in created_signers
+        if not (request_data.enable_signing_order and signer.signing_order > 1)
+    ]
+    for signer in queued:
+        enqueue_email(
+            db,
+            "signing_request",
+            signer.signer_email,
+            signer_email=signer.signer_email,
+            signer_name=signer.signer_name,
+            document_title=document.title,
+            document_id=document_id,
+            sender_name=current_user.name,
+            custom_message=request_data.custom_message
+        )
 
-            if success:
-                successful_sends += 1
-            else:
-                failed_sends.append(signer.signer_email)
-        except Exception as e:
-            print(f"Failed to send email to {signer.signer_email}: {e}")
-            failed_sends.append(signer.signer_email)
+    db.commit()
+    outbox_worker.wake()
+    invalidate_signing_sessions(document_id)
 
     create_audit_log(
         db=db,
@@ -915,17 +883,16 @@ async def send_multiple_signing_requests(
     )
 
     return {
-        "message": f"Signing requests sent",
+        "message": "Signing requests queued for delivery",
         "total_signers": len(created_signers),
-        "successful_sends": successful_sends,
-        "failed_sends": failed_sends,
+        "queued": [signer.signer_email for signer in queued],
         "signing_order_enabled": request_data.enable_signing_order
     }
 
 @router.get("/{document_id}/signers", response_model=List[SignerResponse])
-def get_document_signers(
+def get_document_signers_for_owner(
         document_id: int,
-        current_user: User = Depends(get_current_user),
+        current_user: TokenUser = Depends(get_token_user),
         db: Session = Depends(get_db)
 ):
     document = db.query(Document).filter(
@@ -950,41 +917,37 @@ class RejectDocumentInput(BaseModel):
     reason: str
 
 @router.post("/public/{token}/reject")
-async def reject_public_document(
-    token: str,
+def reject_public_document(
     rejection_data: RejectDocumentInput,
     request: Request,
+    entities=Depends(get_signing_entities),
     db: Session = Depends(get_db)
 ):
-    payload = verify_signing_token(token)
-    if not payload:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid or expired signing link"
-        )
-
-    document_id = payload.get("document_id")
+    payload, document, signer, _ = entities
+    document_id = document.id
     signer_email = payload.get("signer_email")
 
-    document = db.query(Document).filter(Document.id == document_id).first()
-    if not document:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Document not found"
-        )
-    signer = db.query(DocumentSigner).filter(
-        DocumentSigner.document_id == document_id,
-        DocumentSigner.signer_email == signer_email
-    ).first()
-
     if signer:
         signer.status = "rejected"
         signer.rejection_reason = rejection_data.reason
         signer.rejected_at = datetime.utcnow()
-        db.commit()
 
     document.status = DocumentStatus.REJECTED
-    db.commit()
+
+    owner = db.query(User).filter(User.id == document.owner_id).first()
+    if owner:
+        enqueue_email(
+            db,
+            "document_rejected",
+            owner.email,
+            owner_email=owner.email,
+            owner_name=owner.name,
+            document_title=document.title,
+            signer_email=signer_email,
+            rejection_reason=rejection_data.reason
+        )
+
+    revoke_signing_links(db, document_id, signer_email)
 
     create_audit_log(
         db=db,
@@ -995,23 +958,15 @@ async def reject_public_document(
         ip_address=request.client.host,
         user_agent=request.headers.get("user-agent")
     )
-
-    owner = db.query(User).filter(User.id == document.owner_id).first()
-    if owner:
-        await send_document_rejected_email(
-            owner_email=owner.email,
-            owner_name=owner.name,
-            document_title=document.title,
-            signer_email=signer_email,
-            rejection_reason=rejection_data.reason
-        )
+    outbox_worker.wake()
+    invalidate_signing_sessions(document_id)
 
     return {
         "message": "Document rejected successfully",
         "reason": rejection_data.reason
     }
 
-async def notify_next_signer(document_id: int, db: Session):
+def notify_next_signer(document_id: int, db: Session):
 
     next_signer = db.query(DocumentSigner).filter(
         DocumentSigner.document_id == document_id,
@@ -1027,19 +982,18 @@ async def notify_next_signer(document_id: int, db: Session):
     if not document or not owner:
         return False
 
-    try:
-        success = await send_signing_request_email(
-            signer_email=next_signer.signer_email,
-            signer_name=next_signer.signer_name,
-            document_title=document.title,
-            document_id=document.id,
-            sender_name=owner.name,
-            custom_message=None
-        )
-        return success
-    except Exception as e:
-        print(f"Failed to notify next signer: {e}")
-        return False
+    enqueue_email(
+        db,
+        "signing_request",
+        next_signer.signer_email,
+        signer_email=next_signer.signer_email,
+        signer_name=next_signer.signer_name,
+        document_title=document.title,
+        document_id=document.id,
+        sender_name=owner.name,
+        custom_message=None
+    )
+    return True
 
 
 
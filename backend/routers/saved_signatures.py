@@ -0,0 +1,104 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+from database import get_db
+from models.user import User
+from models.saved_signature import SavedSignature
+from schemas.saved_signature import SavedSignatureCreate, SavedSignatureResponse
+from services.pdf_service import normalize_signature_strokes
+from services.saved_signature_service import (
+    SAVED_SIGNATURE_KINDS, store_saved_signature_image, remove_signature_image
+)
+from middleware.auth_middleware import get_current_user, get_token_user, TokenUser
+from typing import List
+import base64
+
+router = APIRouter(prefix="/api/saved-signatures", tags=["Saved Signatures"])
+
+
+@router.get("/", response_model=List[SavedSignatureResponse])
+def get_saved_signatures(
+        current_user: TokenUser = Depends(get_token_user),
+        db: Session = Depends(get_db)
+):
+    return db.query(SavedSignature).filter(
+        SavedSignature.user_id == current_user.id
+    ).order_by(SavedSignature.created_at.desc()).all()
+
+
+@router.post("/", response_model=SavedSignatureResponse, status_code=status.HTTP_201_CREATED)
+def create_saved_signature(
+        signature_data: SavedSignatureCreate,
+        current_user: User = Depends(get_current_user),
+        db: Session = Depends(get_db)
+):
+    if signature_data.kind not in SAVED_SIGNATURE_KINDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Kind must be one of: {', '.join(SAVED_SIGNATURE_KINDS)}"
+        )
+
+    if not (signature_data.signature_image_base64 or signature_data.signature_strokes or signature_data.signature_text):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Provide an image, strokes or text for the saved signature"
+        )
+
+    saved_signature = SavedSignature(
+        user_id=current_user.id,
+        kind=signature_data.kind,
+        label=signature_data.label,
+    )
+
+    if signature_data.signature_strokes:
+        try:
+            saved_signature.signature_strokes = normalize_signature_strokes(signature_data.signature_strokes)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid signature strokes: {str(e)}"
+            )
+    elif signature_data.signature_image_base64:
+        try:
+            image_data = base64.b64decode(signature_data.signature_image_base64)
+            saved_signature.image_path = store_saved_signature_image(current_user.id, image_data)
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Failed to save signature image: {str(e)}"
+            )
+    else:
+        saved_signature.signature_text = signature_data.signature_text
+        saved_signature.signature_font = signature_data.signature_font or "cursive"
+
+    db.add(saved_signature)
+    db.commit()
+    db.refresh(saved_signature)
+
+    return saved_signature
+
+
+@router.delete("/{saved_signature_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_saved_signature(
+        saved_signature_id: int,
+        current_user: User = Depends(get_current_user),
+        db: Session = Depends(get_db)
+):
+    saved_signature = db.query(SavedSignature).filter(
+        SavedSignature.id == saved_signature_id,
+        SavedSignature.user_id == current_user.id
+    ).first()
+
+    if not saved_signature:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Saved signature not found"
+        )
+
+    image_path = saved_signature.image_path
+    db.delete(saved_signature)
+    db.commit()
+
+    # Signed fields keep pointing at the asset, so it goes with the last of them.
+    remove_signature_image(db, image_path)
+
+    return None
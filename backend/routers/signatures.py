@@ -1,15 +1,18 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Request, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 from pydantic import BaseModel
 from database import get_db
 from models.user import User
 from models.document_signer import DocumentSigner
 from models.document import Document, DocumentStatus
 from models.signature import Signature, SignatureStatus
+from models.saved_signature import SavedSignature
 from schemas.signature import SignatureCreate, SignatureSign, SignatureResponse
 from services.audit_service import create_audit_log, AuditActions
-from services.email_service import verify_signing_token
-from middleware.auth_middleware import get_current_user
+from middleware.signing_session import SigningSession, get_signing_session, invalidate_signing_sessions
+from services.pdf_service import normalize_signature_strokes
+from services.saved_signature_service import remove_signature_image
+from middleware.auth_middleware import get_current_user, get_token_user, TokenUser
 from fastapi.responses import FileResponse
 from typing import List, Optional
 import base64
@@ -57,6 +60,56 @@ def _get_signature_with_auth(
 
     return signature
 
+
+def _clear_signature_content(signature: Signature):
+    # A re-sign replaces whatever was drawn, uploaded or typed before.
+    # pdf_service renders strokes ahead of the image and text, so stale
+    # strokes would otherwise win over the new signature.
+    signature.signature_image_path = None
+    signature.signature_strokes = None
+    signature.signature_text = None
+    signature.signature_font = None
+
+
+def _has_signature_content(data: SignatureSign) -> bool:
+    return bool(
+        data.signature_text or data.signature_image_base64
+        or data.signature_strokes or data.saved_signature_id
+    )
+
+
+def _apply_saved_signature(
+    signature: Signature,
+    saved_signature_id: int,
+    user_id: Optional[int],
+    db: Session,
+):
+
+    saved_signature = db.query(SavedSignature).filter(
+        SavedSignature.id == saved_signature_id,
+        SavedSignature.user_id == user_id
+    ).first()
+
+    if not saved_signature:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Saved signature not found",
+        )
+
+    field_type = signature.signature_type or "signature"
+    if saved_signature.kind != field_type:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"A saved {saved_signature.kind} profile cannot fill {field_type} fields",
+        )
+
+    _clear_signature_content(signature)
+    signature.signature_image_path = saved_signature.image_path
+    signature.signature_strokes = saved_signature.signature_strokes
+    if saved_signature.signature_text:
+        signature.signature_text = saved_signature.signature_text
+        signature.signature_font = saved_signature.signature_font or "cursive"
+
 @router.post("/", response_model=SignatureResponse, status_code=status.HTTP_201_CREATED)
 def create_signature_placeholder(
         signature_data: SignatureCreate,
@@ -101,7 +154,7 @@ def create_signature_placeholder(
 @router.get("/document/{document_id}", response_model=List[SignatureResponse])
 def get_document_signatures(
         document_id: int,
-        current_user: User = Depends(get_current_user),
+        current_user: TokenUser = Depends(get_token_user),
         db: Session = Depends(get_db)
 ):
     document = db.query(Document).filter(
@@ -147,6 +200,7 @@ def get_document_signatures(
             "signed_at": sig.signed_at.isoformat() if sig.signed_at else None,
             "signature_text": sig.signature_text,
             "signature_image_path": sig.signature_image_path,
+            "signature_strokes": sig.signature_strokes,
             "signature_font": sig.signature_font,
             "signer_name": signer_name,
             "signer_email": signer_user.email if signer_user else None,
@@ -173,6 +227,10 @@ def sign_signature(
             detail="Signature placeholder not found"
         )
 
+    previous_image = signature.signature_image_path
+    if _has_signature_content(signature_sign):
+        _clear_signature_content(signature)
+
     if signature_sign.signature_text:
         signature.signature_text = signature_sign.signature_text
         signature.signature_font = signature_sign.signature_font or "cursive"
@@ -196,11 +254,25 @@ def sign_signature(
                 detail=f"Failed to save signature image: {str(e)}"
             )
 
+    if signature_sign.signature_strokes:
+        try:
+            signature.signature_strokes = normalize_signature_strokes(signature_sign.signature_strokes)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid signature strokes: {str(e)}"
+            )
+
+    if signature_sign.saved_signature_id:
+        _apply_saved_signature(signature, signature_sign.saved_signature_id, current_user.id, db)
+
     signature.status = SignatureStatus.SIGNED
     signature.signed_at = datetime.utcnow()
 
     db.commit()
     db.refresh(signature)
+    if previous_image != signature.signature_image_path:
+        remove_signature_image(db, previous_image)
 
     create_audit_log(
         db=db,
@@ -294,7 +366,7 @@ def update_signature_size(
 @router.get("/{signature_id}/image")
 def get_signature_image(
         signature_id: int,
-        current_user: User = Depends(get_current_user),
+        current_user: TokenUser = Depends(get_token_user),
         db: Session = Depends(get_db)
 ):
 
@@ -348,48 +420,37 @@ def delete_signature(
     if not is_signer and not is_owner:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
 
-    if signature.signature_image_path and os.path.exists(signature.signature_image_path):
-        os.remove(signature.signature_image_path)
+    image_path = signature.signature_image_path
 
     db.delete(signature)
     db.commit()
+    remove_signature_image(db, image_path)
 
     return None
 
 
 @router.get("/public/{token}")
 def get_public_signatures(
-        token: str,
+        session: SigningSession = Depends(get_signing_session),
         db: Session = Depends(get_db)
 ):
+    document_id = session.document_id
 
-    payload = verify_signing_token(token)
-    if not payload:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid or expired signing link"
-        )
-
-    document_id = payload.get("document_id")
-
-    signatures = db.query(Signature).filter(
+    signatures = db.query(Signature).options(joinedload(Signature.signer)).filter(
         Signature.document_id == document_id
     ).all()
 
+    signer_names = dict(db.query(DocumentSigner.signer_email, DocumentSigner.signer_name).filter(
+        DocumentSigner.document_id == document_id
+    ).all())
+
     result = []
     for sig in signatures:
         signer_user = sig.signer
 
         signer_name = None
         if signer_user:
-            doc_signer = db.query(DocumentSigner).filter(
-                DocumentSigner.document_id == document_id,
-                DocumentSigner.signer_email == signer_user.email
-            ).first()
-            if doc_signer and doc_signer.signer_name:
-                signer_name = doc_signer.signer_name
-            else:
-                signer_name = signer_user.name
+            signer_name = signer_names.get(signer_user.email) or signer_user.name
 
         result.append({
             "id": sig.id,
@@ -406,6 +467,7 @@ def get_public_signatures(
             "signed_at": sig.signed_at.isoformat() if sig.signed_at else None,
             "signature_text": sig.signature_text,
             "signature_image_path": sig.signature_image_path,
+            "signature_strokes": sig.signature_strokes,
             "signature_font": sig.signature_font,
             "signer_name": signer_name,
             "signer_email": signer_user.email if signer_user else None,
@@ -415,35 +477,15 @@ def get_public_signatures(
 
 @router.post("/public/{token}")
 def create_public_signature(
-        token: str,
         signature_data: PublicSignatureCreate,
+        session: SigningSession = Depends(get_signing_session),
         db: Session = Depends(get_db)
 ):
+    document_id = session.document_id
+    signer_email = session.signer_email
+    signer_id = session.user_id
 
-    from services.email_service import verify_signing_token
-
-    payload = verify_signing_token(token)
-
-    if not payload:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid or expired signing link"
-        )
-
-    document_id = payload.get("document_id")
-    signer_email = payload.get("signer_email")
-
-    document = db.query(Document).filter(Document.id == document_id).first()
-
-    if not document:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Document not found"
-        )
-
-    signer = db.query(User).filter(User.email == signer_email).first()
-
-    if not signer:
+    if signer_id is None:
         signer = User(
             name=signer_email.split('@')[0].capitalize(),
             email=signer_email,
@@ -452,12 +494,14 @@ def create_public_signature(
         db.add(signer)
         db.commit()
         db.refresh(signer)
+        signer_id = signer.id
+        invalidate_signing_sessions(document_id)
 
     print(f"🔍 PUBLIC: Creating signature with type: {signature_data.signature_type}")
 
     signature = Signature(
         document_id=document_id,
-        signer_id=signer.id,
+        signer_id=signer_id,
         page_number=signature_data.page_number,
         x_position=signature_data.x_position,
         y_position=signature_data.y_position,
@@ -478,7 +522,7 @@ def create_public_signature(
         action=AuditActions.PUBLIC_SIGNATURE_ADDED,
         description=f"Signature placeholder added by {signer_email} via public link",
         document_id=document_id,
-        user_id=signer.id
+        user_id=signer_id
     )
 
     return signature
@@ -486,21 +530,15 @@ def create_public_signature(
 
 @router.post("/public/{token}/{signature_id}/sign")
 def sign_public_signature(
-        token: str,
         signature_id: int,
         signature_data: SignatureSign,
+        session: SigningSession = Depends(get_signing_session),
         db: Session = Depends(get_db)
 ):
-    from services.email_service import verify_signing_token
-
-    payload = verify_signing_token(token)
-    if not payload:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid or expired signing link"
-        )
-
-    signature = db.query(Signature).filter(Signature.id == signature_id).first()
+    signature = db.query(Signature).filter(
+        Signature.id == signature_id,
+        Signature.document_id == session.document_id
+    ).first()
     if not signature:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -508,6 +546,9 @@ def sign_public_signature(
         )
 
     document_id = signature.document_id
+    previous_image = signature.signature_image_path
+    if _has_signature_content(signature_data):
+        _clear_signature_content(signature)
 
     if signature_data.signature_image_base64:
         try:
@@ -529,23 +570,37 @@ def sign_public_signature(
                 detail="Failed to save signature image"
             )
 
+    if signature_data.signature_strokes:
+        try:
+            signature.signature_strokes = normalize_signature_strokes(signature_data.signature_strokes)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid signature strokes: {str(e)}"
+            )
+
     signature.signature_text = signature_data.signature_text
     signature.signature_font = signature_data.signature_font
+
+    signer_email = session.signer_email
+
+    if signature_data.saved_signature_id:
+        _apply_saved_signature(signature, signature_data.saved_signature_id, session.user_id, db)
+
     signature.status = SignatureStatus.SIGNED
     signature.signed_at = datetime.utcnow()
 
     db.commit()
     db.refresh(signature)
-
-    signer_email = payload.get("signer_email")
-    signer = db.query(User).filter(User.email == signer_email).first()
+    if previous_image != signature.signature_image_path:
+        remove_signature_image(db, previous_image)
 
     create_audit_log(
         db=db,
         action=AuditActions.SIGNATURE_SIGNED,
         description=f"Signature signed by {signer_email} via public link",
         document_id=document_id,
-        user_id=signer.id if signer else None
+        user_id=session.user_id
     )
 
     return {
@@ -563,25 +618,24 @@ def sign_public_signature(
         "signed_at": signature.signed_at.isoformat() if signature.signed_at else None,
         "signature_text": signature.signature_text,
         "signature_image_path": signature.signature_image_path,
+        "signature_strokes": signature.signature_strokes,
         "signature_font": signature.signature_font
     }
 
 @router.put("/public/{token}/{signature_id}/size")
 def update_public_signature_size(
-    token: str,
     signature_id: int,
     width: float = Query(...),
     height: float = Query(...),
     x_position: float = Query(...),
     y_position: float = Query(...),
+    session: SigningSession = Depends(get_signing_session),
     db: Session = Depends(get_db)
 ):
-
-    payload = verify_signing_token(token)
-    if not payload:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or expired signing link")
-
-    signature = db.query(Signature).filter(Signature.id == signature_id).first()
+    signature = db.query(Signature).filter(
+        Signature.id == signature_id,
+        Signature.document_id == session.document_id
+    ).first()
     if not signature:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Signature not found")
     signature.width = max(0.05, min(0.95, width))
@@ -600,20 +654,14 @@ def update_public_signature_size(
 
 @router.delete("/public/{token}/{signature_id}")
 def delete_public_signature(
-        token: str,
         signature_id: int,
+        session: SigningSession = Depends(get_signing_session),
         db: Session = Depends(get_db)
 ):
-    from services.email_service import verify_signing_token
-
-    payload = verify_signing_token(token)
-    if not payload:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid or expired signing link"
-        )
-
-    signature = db.query(Signature).filter(Signature.id == signature_id).first()
+    signature = db.query(Signature).filter(
+        Signature.id == signature_id,
+        Signature.document_id == session.document_id
+    ).first()
     if not signature:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -621,21 +669,20 @@ def delete_public_signature(
         )
 
     document_id = signature.document_id
-    if signature.signature_image_path and os.path.exists(signature.signature_image_path):
-        os.remove(signature.signature_image_path)
+    image_path = signature.signature_image_path
 
     db.delete(signature)
     db.commit()
+    remove_signature_image(db, image_path)
 
-    signer_email = payload.get("signer_email")
-    signer = db.query(User).filter(User.email == signer_email).first()
+    signer_email = session.signer_email
 
     create_audit_log(
         db=db,
         action=AuditActions.SIGNATURE_DELETED,
         description=f"Signature deleted by {signer_email} via public link",
         document_id=document_id,
-        user_id=signer.id if signer else None
+        user_id=session.user_id
     )
 
     return {"message": "Signature deleted successfully"}
@@ -643,22 +690,16 @@ def delete_public_signature(
 
 @router.put("/public/{token}/{signature_id}/position")
 def update_public_signature_position(
-        token: str,
         signature_id: int,
         x_position: float = Query(...),
         y_position: float = Query(...),
+        session: SigningSession = Depends(get_signing_session),
         db: Session = Depends(get_db)
 ):
-    from services.email_service import verify_signing_token
-
-    payload = verify_signing_token(token)
-    if not payload:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid or expired signing link"
-        )
-
-    signature = db.query(Signature).filter(Signature.id == signature_id).first()
+    signature = db.query(Signature).filter(
+        Signature.id == signature_id,
+        Signature.document_id == session.document_id
+    ).first()
     if not signature:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -680,6 +721,7 @@ def update_public_signature_position(
         "signed_at": signature.signed_at.isoformat() if signature.signed_at else None,
         "signature_text": signature.signature_text,
         "signature_image_path": signature.signature_image_path,
+        "signature_strokes": signature.signature_strokes,
         "signature_font": signature.signature_font
     }
 
@@ -689,15 +731,14 @@ def update_public_signature_position(
 
     db.commit()
 
-    signer_email = payload.get("signer_email")
-    signer = db.query(User).filter(User.email == signer_email).first()
+    signer_email = session.signer_email
 
     create_audit_log(
         db=db,
         action=AuditActions.SIGNATURE_POSITION_UPDATED,
         description=f"Signature position updated by {signer_email} via public link",
         document_id=document_id,
-        user_id=signer.id if signer else None
+        user_id=session.user_id
     )
 
 
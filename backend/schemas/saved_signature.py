@@ -0,0 +1,27 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import datetime
+
+
+class SavedSignatureCreate(BaseModel):
+    kind: str = "signature"
+    label: Optional[str] = None
+    signature_image_base64: Optional[str] = None
+    signature_strokes: Optional[List[List[float]]] = None
+    signature_text: Optional[str] = None
+    signature_font: Optional[str] = "cursive"
+
+
+class SavedSignatureResponse(BaseModel):
+    id: int
+    user_id: int
+    kind: str
+    label: Optional[str]
+    image_path: Optional[str]
+    signature_strokes: Optional[str]
+    signature_text: Optional[str]
+    signature_font: Optional[str]
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
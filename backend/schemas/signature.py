@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 
@@ -16,6 +16,8 @@ class SignatureCreate(BaseModel):
 class SignatureSign(BaseModel):
     signature_text: Optional[str] = None
     signature_image_base64: Optional[str] = None
+    signature_strokes: Optional[List[List[float]]] = None
+    saved_signature_id: Optional[int] = None
     signature_font: Optional[str] = "cursive"
 
 
@@ -30,6 +32,7 @@ class SignatureResponse(BaseModel):
     height: float
     signature_text: Optional[str]
     signature_image_path: Optional[str]
+    signature_strokes: Optional[str] = None
     signature_font: Optional[str]
     signature_type: Optional[str]
     status: str
@@ -0,0 +1,42 @@
+import base64
+import os
+
+from utils.cache import LRUCache
+
+EMAIL_ATTACHMENT_CACHE_BYTES = int(os.getenv("EMAIL_ATTACHMENT_CACHE_BYTES", 64 * 1024 * 1024))
+EMAIL_ATTACHMENT_CACHE_SIZE = int(os.getenv("EMAIL_ATTACHMENT_CACHE_SIZE", 32))
+
+# Keyed by (path, mtime_ns, size, variant): re-signing a document rewrites
+# the file, which changes the key, so stale encodings are never served.
+attachment_cache = LRUCache(
+    max_entries=EMAIL_ATTACHMENT_CACHE_SIZE,
+    max_bytes=EMAIL_ATTACHMENT_CACHE_BYTES,
+)
+
+
+def _encode(data: bytes, variant: str) -> str:
+    if variant == "mime":
+        # Same 76-column line wrapping email.encoders.encode_base64 produces.
+        return base64.encodebytes(data).decode("ascii")
+    return base64.b64encode(data).decode("ascii")
+
+
+def get_encoded_attachment(path: str, variant: str = "base64") -> str:
+    """
+    Base64 for a file, read and encoded once per file version.
+    variant is "base64" (SendGrid JSON) or "mime" (line-wrapped SMTP part).
+    """
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size, variant)
+
+    encoded = attachment_cache.get(key)
+    if encoded is None:
+        with open(path, "rb") as f:
+            encoded = _encode(f.read(), variant)
+        attachment_cache.set(key, encoded)
+
+    return encoded
+
+
+def get_attachment_cache_stats() -> dict:
+    return attachment_cache.stats()
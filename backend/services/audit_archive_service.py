@@ -0,0 +1,282 @@
+import gzip
+import io
+import json
+import os
+import re
+from datetime import date, datetime, time, timezone
+from typing import List, Optional, Tuple
+
+from sqlalchemy import and_, func, select, text
+from sqlalchemy.orm import Session
+
+from database import SessionLocal
+from models.audit_log import AuditLog
+from services.audit_chain_service import anchor_archived_entries
+from services.scheduler import PeriodicJob
+
+AUDIT_RETENTION_MONTHS = int(os.getenv("AUDIT_RETENTION_MONTHS", 24))
+AUDIT_PARTITION_PREMAKE_MONTHS = int(os.getenv("AUDIT_PARTITION_PREMAKE_MONTHS", 2))
+AUDIT_ARCHIVE_DIR = os.getenv("AUDIT_ARCHIVE_DIR", "./archives/audit_logs")
+AUDIT_ARCHIVE_BATCH_SIZE = int(os.getenv("AUDIT_ARCHIVE_BATCH_SIZE", 5000))
+AUDIT_MAINTENANCE_INTERVAL = float(os.getenv("AUDIT_MAINTENANCE_INTERVAL", 86400))
+AUDIT_MAINTENANCE_LOCK_KEY = int(os.getenv("AUDIT_MAINTENANCE_LOCK_KEY", 7_120_431))
+
+PARTITION_NAME = re.compile(r"^audit_logs_y(\d{4})m(\d{2})$")
+
+
+def month_start(day: date) -> date:
+    return date(day.year, day.month, 1)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def month_bound(month: date) -> datetime:
+    # Timezone-aware, so timestamptz bounds don't depend on the session's
+    # TimeZone setting (same as the rollup service's day bounds).
+    return datetime.combine(month, time.min, tzinfo=timezone.utc)
+
+
+def utc_date(moment: datetime) -> date:
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc)
+    return moment.date()
+
+
+def partition_name(month: date) -> str:
+    return f"audit_logs_y{month.year}m{month.month:02d}"
+
+
+def is_partitioned(db: Session) -> bool:
+    """True when audit_logs is a Postgres partitioned table (see Migrate.py)."""
+    if db.get_bind().dialect.name != "postgresql":
+        return False
+    relkind = db.execute(text(
+        "SELECT relkind FROM pg_class WHERE oid = to_regclass('audit_logs')"
+    )).scalar()
+    return relkind == "p"
+
+
+def _create_month_partition(db: Session, month: date):
+    name = partition_name(month)
+    start, end = month_bound(month), month_bound(add_months(month, 1))
+    bounds = f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+
+    stray = db.execute(text(
+        "SELECT 1 FROM audit_logs_default WHERE created_at >= :start AND created_at < :end LIMIT 1"
+    ), {"start": start, "end": end}).scalar()
+    if not stray:
+        db.execute(text(f"CREATE TABLE {name} PARTITION OF audit_logs {bounds}"))
+        return
+
+    # Rows that already landed in the default partition would make the
+    # new partition's bounds overlap it, so move them across first.
+    db.execute(text("LOCK TABLE audit_logs_default IN ACCESS EXCLUSIVE MODE"))
+    db.execute(text(f"CREATE TABLE {name} (LIKE audit_logs INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"))
+    moved = db.execute(text(f"""
+        WITH moved AS (
+            DELETE FROM audit_logs_default
+            WHERE created_at >= :start AND created_at < :end
+            RETURNING *
+        )
+        INSERT INTO {name} SELECT * FROM moved
+    """), {"start": start, "end": end}).rowcount
+    db.execute(text(f"ALTER TABLE audit_logs ATTACH PARTITION {name} {bounds}"))
+    print(f"⚠️  Moved {moved} audit log(s) from audit_logs_default into {name}")
+
+
+def ensure_audit_partitions(db: Session, today: Optional[date] = None) -> List[str]:
+    """
+    Create this month's partition and the next AUDIT_PARTITION_PREMAKE_MONTHS
+    ahead of time, so inserts never land in the default partition. Each
+    month is created in its own transaction.
+    """
+    current = month_start(today or datetime.utcnow().date())
+    created = []
+    for offset in range(AUDIT_PARTITION_PREMAKE_MONTHS + 1):
+        month = add_months(current, offset)
+        name = partition_name(month)
+        exists = db.execute(text("SELECT to_regclass(:name)"), {"name": name}).scalar()
+        if exists:
+            continue
+        _create_month_partition(db, month)
+        db.commit()
+        created.append(name)
+    return created
+
+
+def row_to_ndjson(row) -> str:
+    record = {}
+    for key, value in row._mapping.items():
+        record[key] = value.isoformat() if isinstance(value, (datetime, date)) else value
+    return json.dumps(record, ensure_ascii=False)
+
+
+def export_ndjson(db: Session, query, month: date) -> Tuple[str, int]:
+    """
+    Stream query results into a gzip NDJSON file for the month. Written to
+    a temporary name and renamed once complete, and never overwrites an
+    earlier archive of the same month.
+    """
+    os.makedirs(AUDIT_ARCHIVE_DIR, exist_ok=True)
+    base = os.path.join(AUDIT_ARCHIVE_DIR, f"audit_logs_{month.year}_{month.month:02d}")
+    path = f"{base}.ndjson.gz"
+    if os.path.exists(path):
+        path = f"{base}-{int(datetime.utcnow().timestamp())}.ndjson.gz"
+    partial = f"{path}.partial"
+
+    rows = 0
+    result = db.execute(query.execution_options(stream_results=True, yield_per=AUDIT_ARCHIVE_BATCH_SIZE))
+    with open(partial, "wb") as raw:
+        with io.TextIOWrapper(gzip.GzipFile(fileobj=raw, mode="wb"), encoding="utf-8") as archive:
+            for row in result:
+                archive.write(row_to_ndjson(row))
+                archive.write("\n")
+                rows += 1
+        # Durable before the rows are dropped from the database.
+        raw.flush()
+        os.fsync(raw.fileno())
+
+    os.replace(partial, path)
+    return path, rows
+
+
+def _expired_partitions(db: Session, cutoff: date) -> List[Tuple[str, date]]:
+    names = db.execute(text("""
+        SELECT child.relname
+        FROM pg_inherits
+        JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+        JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+        WHERE parent.relname = 'audit_logs'
+    """)).scalars().all()
+
+    expired = []
+    for name in names:
+        match = PARTITION_NAME.match(name)
+        if not match:
+            continue
+        month = date(int(match.group(1)), int(match.group(2)), 1)
+        if add_months(month, 1) <= cutoff:
+            expired.append((name, month))
+    return sorted(expired, key=lambda item: item[1])
+
+
+def _month_range(month: date) -> tuple:
+    return (
+        AuditLog.created_at >= month_bound(month),
+        AuditLog.created_at < month_bound(add_months(month, 1)),
+    )
+
+
+def _anchor_month(db: Session, month: date) -> int:
+    # The last entry of each document's chain within the month.
+    in_month = _month_range(month)
+    latest = select(
+        AuditLog.document_id, func.max(AuditLog.chain_seq).label("seq")
+    ).where(*in_month, AuditLog.chain_seq.isnot(None)).group_by(AuditLog.document_id).subquery()
+
+    entries = db.execute(
+        select(AuditLog.document_id, AuditLog.chain_seq, AuditLog.entry_hash).join(
+            latest, and_(AuditLog.document_id == latest.c.document_id, AuditLog.chain_seq == latest.c.seq)
+        ).where(*in_month)
+    ).all()
+    return anchor_archived_entries(db, entries)
+
+
+def _archive_partitions(db: Session, cutoff: date) -> List[dict]:
+    archived = []
+    for name, month in _expired_partitions(db, cutoff):
+        path, rows = export_ndjson(db, text(f"SELECT * FROM {name} ORDER BY id"), month)
+        _anchor_month(db, month)
+        db.execute(text(f"ALTER TABLE audit_logs DETACH PARTITION {name}"))
+        db.execute(text(f"DROP TABLE {name}"))
+        db.commit()
+        print(f"✅ Archived audit partition {name}: {rows} row(s) → {path}")
+        archived.append({"month": month.isoformat(), "rows": rows, "path": path})
+    return archived
+
+
+def _archive_rows(db: Session, cutoff: date) -> List[dict]:
+    # Fallback for unpartitioned tables (SQLite, or Postgres before the
+    # migration): export month by month, then delete in batches.
+    oldest = db.query(func.min(AuditLog.created_at)).scalar()
+    if oldest is None:
+        return []
+
+    archived = []
+    month = month_start(utc_date(oldest))
+    while month < cutoff:
+        in_month = _month_range(month)
+
+        path, rows = export_ndjson(
+            db, select(*AuditLog.__table__.columns).where(*in_month).order_by(AuditLog.id), month
+        )
+        if rows:
+            _anchor_month(db, month)
+            db.commit()
+            while True:
+                ids = [row_id for (row_id,) in db.query(AuditLog.id).filter(*in_month).limit(AUDIT_ARCHIVE_BATCH_SIZE)]
+                if not ids:
+                    break
+                db.query(AuditLog).filter(AuditLog.id.in_(ids)).delete(synchronize_session=False)
+                db.commit()
+            print(f"✅ Archived audit logs for {month:%Y-%m}: {rows} row(s) → {path}")
+            archived.append({"month": month.isoformat(), "rows": rows, "path": path})
+        else:
+            os.remove(path)
+
+        month = add_months(month, 1)
+    return archived
+
+
+def archive_expired_audit_logs(db: Session, today: Optional[date] = None) -> List[dict]:
+    """
+    Export every whole month older than AUDIT_RETENTION_MONTHS to
+    AUDIT_ARCHIVE_DIR and remove it from the database. Rollups in
+    audit_daily_rollups are kept, so summaries still cover archived days.
+    """
+    if AUDIT_RETENTION_MONTHS <= 0:
+        return []
+
+    cutoff = add_months(month_start(today or datetime.utcnow().date()), -AUDIT_RETENTION_MONTHS)
+    if is_partitioned(db):
+        return _archive_partitions(db, cutoff)
+    return _archive_rows(db, cutoff)
+
+
+def run_audit_maintenance() -> dict:
+    """
+    One pass of partition upkeep and archival. On Postgres the pass holds
+    a session advisory lock on its own connection, so when several
+    workers run the job only one does the work and the rest skip.
+    """
+    db = SessionLocal()
+    lock = None
+    try:
+        if db.get_bind().dialect.name == "postgresql":
+            lock = db.get_bind().connect()
+            if not lock.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": AUDIT_MAINTENANCE_LOCK_KEY}).scalar():
+                return {"skipped": "another worker is running audit maintenance"}
+
+        created = ensure_audit_partitions(db) if is_partitioned(db) else []
+        archived = archive_expired_audit_logs(db)
+        return {
+            "partitions_created": created,
+            "archived_months": len(archived),
+            "archived_rows": sum(entry["rows"] for entry in archived),
+        }
+    finally:
+        db.close()
+        if lock is not None:
+            lock.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": AUDIT_MAINTENANCE_LOCK_KEY})
+            lock.close()
+
+
+audit_maintenance_job = PeriodicJob(
+    "audit_maintenance",
+    AUDIT_MAINTENANCE_INTERVAL,
+    run_audit_maintenance,
+    initial_delay=30,
+)
@@ -0,0 +1,224 @@
+import hashlib
+import hmac
+import json
+import os
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import select, text
+from sqlalchemy.orm import Session
+
+from models.audit_chain_head import AuditChainHead
+from models.audit_checkpoint import AuditCheckpoint
+from models.audit_log import AuditLog
+from utils.security import SECRET_KEY
+
+AUDIT_CHECKPOINT_INTERVAL = int(os.getenv("AUDIT_CHECKPOINT_INTERVAL", 1000))
+AUDIT_CHAIN_KEY = os.getenv("AUDIT_CHAIN_KEY", SECRET_KEY).encode("utf-8")
+AUDIT_VERIFY_BATCH_SIZE = int(os.getenv("AUDIT_VERIFY_BATCH_SIZE", 2000))
+# First key of the two-int pg_advisory_xact_lock used to serialize appends.
+AUDIT_CHAIN_LOCK_NAMESPACE = int(os.getenv("AUDIT_CHAIN_LOCK_NAMESPACE", 7_120_432))
+
+CHAIN_COLUMNS = (
+    AuditLog.chain_seq, AuditLog.prev_hash, AuditLog.entry_hash,
+    AuditLog.action, AuditLog.description, AuditLog.user_id,
+    AuditLog.ip_address, AuditLog.user_agent, AuditLog.created_at,
+)
+
+
+def _timestamp(value: datetime) -> str:
+    # Postgres hands back aware datetimes and SQLite naive UTC ones.
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value.isoformat(timespec="microseconds")
+
+
+def hash_entry(document_id: int, entry) -> str:
+    payload = json.dumps([
+        document_id, entry.chain_seq, entry.prev_hash,
+        entry.action, entry.description, entry.user_id,
+        entry.ip_address, entry.user_agent, _timestamp(entry.created_at),
+    ], separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def sign_link(document_id: int, seq: int, entry_hash: str) -> str:
+    message = f"{document_id}:{seq}:{entry_hash}".encode("utf-8")
+    return hmac.new(AUDIT_CHAIN_KEY, message, hashlib.sha256).hexdigest()
+
+
+def _signed(record, document_id: int) -> bool:
+    return hmac.compare_digest(record.signature, sign_link(document_id, record.seq, record.entry_hash))
+
+
+def append_to_chain(db: Session, audit_log: AuditLog):
+    """
+    Link a new document entry to the previous one. On Postgres a
+    transaction-scoped advisory lock per document is held until the caller
+    commits, so concurrent entries are chained one after another rather
+    than forking, without locking the document row itself. SQLite already
+    serializes writers.
+    """
+    document_id = audit_log.document_id
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(
+            text("SELECT pg_advisory_xact_lock(:namespace, :document_id)"),
+            {"namespace": AUDIT_CHAIN_LOCK_NAMESPACE, "document_id": document_id}
+        )
+
+    head = db.get(AuditChainHead, document_id)
+    audit_log.chain_seq = head.seq + 1 if head else 1
+    audit_log.prev_hash = head.entry_hash if head else None
+    audit_log.created_at = datetime.now(timezone.utc)
+    audit_log.entry_hash = hash_entry(document_id, audit_log)
+
+    signature = sign_link(document_id, audit_log.chain_seq, audit_log.entry_hash)
+    if head is None:
+        head = AuditChainHead(document_id=document_id)
+        db.add(head)
+    head.seq = audit_log.chain_seq
+    head.entry_hash = audit_log.entry_hash
+    head.signature = signature
+
+    if audit_log.chain_seq % AUDIT_CHECKPOINT_INTERVAL == 0:
+        db.add(AuditCheckpoint(
+            document_id=document_id,
+            seq=audit_log.chain_seq,
+            entry_hash=audit_log.entry_hash,
+            signature=signature
+        ))
+
+
+def anchor_archived_entries(db: Session, entries) -> int:
+    """
+    Sign a checkpoint at each (document_id, chain_seq, entry_hash) about
+    to be archived, normally the last archived entry of each document, so
+    verification can resume after the archived prefix. The caller commits
+    together with the archival. Entries already checkpointed are skipped.
+    """
+    anchored = 0
+    for document_id, seq, entry_hash in entries:
+        exists = db.query(AuditCheckpoint.id).filter(
+            AuditCheckpoint.document_id == document_id,
+            AuditCheckpoint.seq == seq
+        ).first()
+        if exists:
+            continue
+        db.add(AuditCheckpoint(
+            document_id=document_id,
+            seq=seq,
+            entry_hash=entry_hash,
+            signature=sign_link(document_id, seq, entry_hash)
+        ))
+        anchored += 1
+    return anchored
+
+
+def verify_document_chain(db: Session, document_id: int, full: bool = False) -> dict:
+    """
+    Re-hash a document's trail. By default only the entries after the
+    latest signed checkpoint are read, so the cost is bounded by
+    AUDIT_CHECKPOINT_INTERVAL however long the history is. With `full`,
+    every stored entry is re-hashed and every checkpoint checked against
+    the recomputed chain. In both modes a prefix removed by archival is
+    accepted only when a signed checkpoint (written at archive time)
+    vouches for the entry just before the first one kept.
+    """
+    head = db.get(AuditChainHead, document_id)
+    report = {
+        "document_id": document_id,
+        "valid": True,
+        "mode": "full" if full else "incremental",
+        "head_seq": head.seq if head else 0,
+        "head_hash": head.entry_hash if head else None,
+        "checkpoint_seq": None,
+        "verified_from_seq": None,
+        "archived_through_seq": None,
+        "verified_entries": 0,
+        "error": None,
+    }
+
+    def fail(seq: Optional[int], reason: str) -> dict:
+        report["valid"] = False
+        report["error"] = {"seq": seq, "reason": reason}
+        return report
+
+    if head is None:
+        return report
+    if not _signed(head, document_id):
+        return fail(head.seq, "chain head signature does not match")
+
+    def resume_after_archive(next_seq: int) -> Optional[dict]:
+        # The entries before next_seq were archived; resume from the
+        # signed checkpoint of the last archived entry.
+        nonlocal seq, prev_hash
+        anchor = db.query(AuditCheckpoint).filter(
+            AuditCheckpoint.document_id == document_id,
+            AuditCheckpoint.seq == next_seq - 1
+        ).first()
+        if anchor is None:
+            return fail(seq + 1, "entry is missing or duplicated")
+        if not _signed(anchor, document_id):
+            return fail(anchor.seq, "checkpoint signature does not match")
+        seq, prev_hash = anchor.seq, anchor.entry_hash
+        report["archived_through_seq"] = anchor.seq
+        return None
+
+    checkpoints = {}
+    seq, prev_hash = 0, None
+    if full:
+        for checkpoint in db.query(AuditCheckpoint).filter(AuditCheckpoint.document_id == document_id):
+            checkpoints[checkpoint.seq] = checkpoint
+    else:
+        checkpoint = db.query(AuditCheckpoint).filter(
+            AuditCheckpoint.document_id == document_id
+        ).order_by(AuditCheckpoint.seq.desc()).first()
+        if checkpoint:
+            if not _signed(checkpoint, document_id):
+                return fail(checkpoint.seq, "checkpoint signature does not match")
+            seq, prev_hash = checkpoint.seq, checkpoint.entry_hash
+            report["checkpoint_seq"] = checkpoint.seq
+
+    entries = db.execute(
+        select(*CHAIN_COLUMNS).where(
+            AuditLog.document_id == document_id,
+            AuditLog.chain_seq >= seq
+        ).order_by(AuditLog.chain_seq).execution_options(yield_per=AUDIT_VERIFY_BATCH_SIZE)
+    )
+
+    for entry in entries:
+        if entry.chain_seq == seq:
+            # The checkpointed entry itself, unless it has been archived.
+            if entry.entry_hash != prev_hash or hash_entry(document_id, entry) != entry.entry_hash:
+                return fail(seq, "entry does not match its signed checkpoint")
+            report["verified_from_seq"] = seq
+            report["verified_entries"] += 1
+            continue
+
+        if report["verified_from_seq"] is None:
+            report["verified_from_seq"] = entry.chain_seq
+            if entry.chain_seq > seq + 1 and resume_after_archive(entry.chain_seq):
+                return report
+
+        if entry.chain_seq != seq + 1:
+            return fail(seq + 1, "entry is missing or duplicated")
+        if entry.prev_hash != prev_hash:
+            return fail(entry.chain_seq, "entry does not link to the previous one")
+        if hash_entry(document_id, entry) != entry.entry_hash:
+            return fail(entry.chain_seq, "entry was modified")
+
+        checkpoint = checkpoints.get(entry.chain_seq)
+        if checkpoint and (checkpoint.entry_hash != entry.entry_hash or not _signed(checkpoint, document_id)):
+            return fail(entry.chain_seq, "entry does not match its signed checkpoint")
+
+        seq, prev_hash = entry.chain_seq, entry.entry_hash
+        report["verified_entries"] += 1
+
+    if report["verified_from_seq"] is None and seq < head.seq:
+        # Every entry after the starting point has been archived.
+        if resume_after_archive(head.seq + 1):
+            return report
+
+    if seq != head.seq or prev_hash != head.entry_hash:
+        return fail(seq + 1, "trail ends before the signed chain head (entries deleted or archived)")
+    return report
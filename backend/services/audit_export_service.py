@@ -0,0 +1,88 @@
+import csv
+import io
+import os
+from datetime import datetime
+from typing import Iterator, Optional
+
+from sqlalchemy import or_, select
+
+from database import SessionLocal
+from models.audit_log import AuditLog
+from models.document import Document
+from services.audit_archive_service import row_to_ndjson
+
+AUDIT_EXPORT_BATCH_SIZE = int(os.getenv("AUDIT_EXPORT_BATCH_SIZE", 1000))
+
+EXPORT_COLUMNS = (
+    "id", "created_at", "action", "description",
+    "user_id", "document_id", "ip_address", "user_agent",
+    "chain_seq", "prev_hash", "entry_hash",
+)
+
+
+def build_export_query(
+        owner_id: int,
+        document_id: Optional[int] = None,
+        user_id: Optional[int] = None,
+        action: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None
+):
+    """
+    Everything the caller may see: their own activity plus all activity on
+    documents they own, narrowed by the optional filters.
+    """
+    owned_documents = select(Document.id).where(Document.owner_id == owner_id)
+    query = select(*[AuditLog.__table__.c[name] for name in EXPORT_COLUMNS]).where(
+        or_(AuditLog.user_id == owner_id, AuditLog.document_id.in_(owned_documents))
+    )
+
+    if document_id is not None:
+        query = query.where(AuditLog.document_id == document_id)
+    if user_id is not None:
+        query = query.where(AuditLog.user_id == user_id)
+    if action:
+        query = query.where(AuditLog.action == action)
+    if since:
+        query = query.where(AuditLog.created_at >= since)
+    if until:
+        query = query.where(AuditLog.created_at < until)
+
+    return query.order_by(AuditLog.created_at, AuditLog.id)
+
+
+def _iter_rows(query) -> Iterator[list]:
+    """
+    Batches of rows from a server-side cursor. Opens its own session:
+    the request's session is closed before a streamed body is sent.
+    """
+    db = SessionLocal()
+    try:
+        result = db.execute(query.execution_options(yield_per=AUDIT_EXPORT_BATCH_SIZE))
+        for partition in result.partitions():
+            yield partition
+    finally:
+        db.close()
+
+
+def stream_ndjson(query) -> Iterator[str]:
+    for rows in _iter_rows(query):
+        yield "".join(row_to_ndjson(row) + "\n" for row in rows)
+
+
+def stream_csv(query) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    writer.writerow(EXPORT_COLUMNS)
+    yield buffer.getvalue()
+
+    for rows in _iter_rows(query):
+        buffer.seek(0)
+        buffer.truncate()
+        for row in rows:
+            writer.writerow([
+                value.isoformat() if isinstance(value, datetime) else value
+                for value in row
+            ])
+        yield buffer.getvalue()
@@ -0,0 +1,72 @@
+import base64
+import os
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from sqlalchemy import select, tuple_
+
+from models.audit_log import AuditLog
+
+AUDIT_PAGE_SIZE = int(os.getenv("AUDIT_PAGE_SIZE", 100))
+AUDIT_MAX_PAGE_SIZE = int(os.getenv("AUDIT_MAX_PAGE_SIZE", 1000))
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_audit_cursor(log) -> str:
+    raw = f"{log.created_at.isoformat()}|{log.id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_audit_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, log_id = base64.urlsafe_b64decode(padded).decode("utf-8").split("|")
+        return datetime.fromisoformat(created_at), int(log_id)
+    except Exception:
+        raise InvalidCursor("Invalid cursor")
+
+
+def user_audit_logs_query(
+        user_id: int,
+        since: Optional[datetime] = None,
+        document_id: Optional[int] = None,
+        action: Optional[str] = None
+):
+    """Served by ix_audit_logs_user_keyset (user_id, created_at, id)."""
+    query = select(AuditLog).where(AuditLog.user_id == user_id)
+    if since:
+        query = query.where(AuditLog.created_at >= since)
+    if document_id:
+        query = query.where(AuditLog.document_id == document_id)
+    if action:
+        query = query.where(AuditLog.action == action)
+    return query
+
+
+def document_audit_logs_query(document_id: int):
+    """Served by ix_audit_logs_document_keyset (document_id, created_at, id)."""
+    return select(AuditLog).where(AuditLog.document_id == document_id)
+
+
+def keyset_page(query, cursor: Optional[str] = None, limit: int = AUDIT_PAGE_SIZE):
+    """
+    Newest first, one page after `cursor`. Seeking on (created_at, id)
+    instead of OFFSET keeps every page an index range scan however deep
+    the client pages, and id breaks ties between equal timestamps.
+    """
+    if cursor:
+        created_at, log_id = decode_audit_cursor(cursor)
+        query = query.where(tuple_(AuditLog.created_at, AuditLog.id) < tuple_(created_at, log_id))
+
+    # One extra row tells us whether another page follows.
+    return query.order_by(AuditLog.created_at.desc(), AuditLog.id.desc()).limit(limit + 1)
+
+
+def split_page(logs: List[AuditLog], limit: int) -> Tuple[List[AuditLog], Optional[str]]:
+    if len(logs) <= limit:
+        return logs, None
+    logs = logs[:limit]
+    return logs, encode_audit_cursor(logs[-1])
@@ -0,0 +1,178 @@
+import os
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import and_, func, insert, or_, select
+from sqlalchemy.orm import Session
+
+from database import SessionLocal
+from models.audit_daily_rollup import AuditDailyRollup
+from models.audit_log import AuditLog
+from models.audit_rollup_watermark import AuditRollupWatermark
+from services.scheduler import PeriodicJob
+
+AUDIT_ROLLUP_INTERVAL = float(os.getenv("AUDIT_ROLLUP_INTERVAL", 3600))
+AUDIT_ROLLUP_MAX_DAYS = int(os.getenv("AUDIT_ROLLUP_MAX_DAYS", 31))
+
+WATERMARK_NAME = "audit_daily"
+
+
+def _as_utc(moment: datetime) -> datetime:
+    # Naive datetimes in this codebase are UTC (datetime.utcnow).
+    if moment.tzinfo is None:
+        return moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(timezone.utc)
+
+
+def _day_start(day: date) -> datetime:
+    # Timezone-aware, so timestamptz comparisons don't depend on the
+    # session's TimeZone setting.
+    return datetime.combine(day, time.min, tzinfo=timezone.utc)
+
+
+def _utc_day(db: Session):
+    if db.bind.dialect.name == "postgresql":
+        return func.date(func.timezone("UTC", AuditLog.created_at))
+    return func.date(AuditLog.created_at)
+
+
+def rolled_up_through(db: Session) -> Optional[date]:
+    """
+    Last UTC day that is fully represented in the rollup table. Tables
+    rolled up before the watermark existed fall back to their newest day.
+    """
+    through_day = db.query(AuditRollupWatermark.through_day).filter(
+        AuditRollupWatermark.name == WATERMARK_NAME
+    ).scalar()
+    if through_day is None:
+        through_day = db.query(func.max(AuditDailyRollup.day)).scalar()
+    return through_day
+
+
+def _advance_watermark(db: Session, through_day: date):
+    db.merge(AuditRollupWatermark(name=WATERMARK_NAME, through_day=through_day))
+
+
+def rollup_audit_days(db: Session, start: date, end: date) -> int:
+    """
+    Rebuild the rollup rows for days in [start, end) with one GROUP BY.
+    Deleting first makes re-running a range harmless.
+    """
+    db.query(AuditDailyRollup).filter(
+        AuditDailyRollup.day >= start,
+        AuditDailyRollup.day < end
+    ).delete(synchronize_session=False)
+
+    day = _utc_day(db)
+    aggregated = select(
+        AuditLog.user_id,
+        day,
+        AuditLog.action,
+        func.count(),
+        func.max(AuditLog.created_at),
+    ).where(
+        AuditLog.user_id.isnot(None),
+        AuditLog.created_at >= _day_start(start),
+        AuditLog.created_at < _day_start(end),
+    ).group_by(AuditLog.user_id, day, AuditLog.action)
+
+    result = db.execute(insert(AuditDailyRollup).from_select(
+        ["user_id", "day", "action", "count", "last_at"], aggregated
+    ))
+    return result.rowcount or 0
+
+
+def refresh_audit_rollups() -> dict:
+    """
+    Roll up every completed day since the last run, in chunks of
+    AUDIT_ROLLUP_MAX_DAYS committed separately so a first backfill over a
+    long history never holds one huge transaction. Today is left to the
+    live query in summarize_audit_activity.
+    """
+    db = SessionLocal()
+    try:
+        today = datetime.utcnow().date()
+        last_day = rolled_up_through(db)
+        if last_day is not None:
+            start = last_day + timedelta(days=1)
+        else:
+            first_log = db.query(func.min(AuditLog.created_at)).scalar()
+            if first_log is None:
+                return {"days": 0, "rows": 0}
+            start = _as_utc(first_log).date()
+
+        days = rows = 0
+        while start < today:
+            end = min(start + timedelta(days=AUDIT_ROLLUP_MAX_DAYS), today)
+            rows += rollup_audit_days(db, start, end)
+            _advance_watermark(db, end - timedelta(days=1))
+            db.commit()
+            days += (end - start).days
+            start = end
+
+        if days:
+            print(f"✅ Rolled up {days} day(s) of audit logs into {rows} row(s)")
+        return {"days": days, "rows": rows}
+    finally:
+        db.close()
+
+
+def summarize_audit_activity(db: Session, user_id: int, since: datetime, now: Optional[datetime] = None) -> dict:
+    """
+    Action counts for one user since `since`. Whole days come from the
+    rollup table; the partial first day and anything newer than the last
+    rolled-up day are aggregated live from audit_logs, which the
+    (user_id, created_at, id) index keeps to a narrow range scan.
+    """
+    now = _as_utc(now or datetime.utcnow())
+    since = _as_utc(since)
+    first_full_day = since.date() + timedelta(days=1)
+    last_day = rolled_up_through(db)
+
+    action_counts = {}
+    most_recent = None
+
+    if last_day is not None and last_day >= first_full_day:
+        rollup_rows = db.query(
+            AuditDailyRollup.action,
+            func.sum(AuditDailyRollup.count),
+            func.max(AuditDailyRollup.last_at),
+        ).filter(
+            AuditDailyRollup.user_id == user_id,
+            AuditDailyRollup.day >= first_full_day,
+            AuditDailyRollup.day <= last_day
+        ).group_by(AuditDailyRollup.action).all()
+
+        for action, count, last_at in rollup_rows:
+            action_counts[action] = int(count)
+            most_recent = max(most_recent, last_at) if most_recent else last_at
+
+        live_range = or_(
+            and_(AuditLog.created_at >= since, AuditLog.created_at < _day_start(first_full_day)),
+            AuditLog.created_at >= _day_start(last_day + timedelta(days=1)),
+        )
+    else:
+        live_range = AuditLog.created_at >= since
+
+    live_rows = db.query(
+        AuditLog.action,
+        func.count(),
+        func.max(AuditLog.created_at),
+    ).filter(
+        AuditLog.user_id == user_id,
+        live_range,
+        AuditLog.created_at <= now
+    ).group_by(AuditLog.action).all()
+
+    for action, count, last_at in live_rows:
+        action_counts[action] = action_counts.get(action, 0) + count
+        most_recent = max(most_recent, last_at) if most_recent else last_at
+
+    return {
+        "total_activities": sum(action_counts.values()),
+        "action_breakdown": action_counts,
+        "most_recent": most_recent,
+    }
+
+
+audit_rollup_job = PeriodicJob("audit_rollup", AUDIT_ROLLUP_INTERVAL, refresh_audit_rollups)
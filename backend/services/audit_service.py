@@ -1,5 +1,6 @@
 from sqlalchemy.orm import Session
 from models.audit_log import AuditLog
+from services.audit_chain_service import append_to_chain
 from datetime import datetime
 from typing import Optional
 
@@ -21,6 +22,8 @@ def create_audit_log(
         ip_address=ip_address,
         user_agent=user_agent
     )
+    if document_id is not None:
+        append_to_chain(db, audit_log)
     db.add(audit_log)
     db.commit()
     return audit_log
@@ -46,4 +49,6 @@ class AuditActions:
     SIGNED_PDF_SENT = "SIGNED_PDF_SENT"
 
     PUBLIC_DOCUMENT_ACCESSED = "PUBLIC_DOCUMENT_ACCESSED"
-    PUBLIC_SIGNATURE_ADDED = "PUBLIC_SIGNATURE_ADDED"
\ No newline at end of file
+    PUBLIC_SIGNATURE_ADDED = "PUBLIC_SIGNATURE_ADDED"
+
+    AUDIT_LOG_EXPORTED = "AUDIT_LOG_EXPORTED"
\ No newline at end of file
@@ -0,0 +1,37 @@
+import asyncio
+import os
+from typing import Any, Awaitable, Callable, Iterable, Optional
+
+EMAIL_FANOUT_CONCURRENCY = int(os.getenv("EMAIL_FANOUT_CONCURRENCY", 10))
+
+
+async def fan_out(
+        items: Iterable[Any],
+        send: Callable[[Any], Awaitable[Any]],
+        recipient: Callable[[Any], str],
+        concurrency: Optional[int] = None
+) -> list:
+    """
+    Run send(item) for every item with at most `concurrency` in flight.
+
+    Returns one result dict per item, in input order:
+    {"recipient", "success", "error"}. A send that raises or returns a
+    falsy value is reported as failed; it never cancels the others.
+    Provider 429s are absorbed by the transports (see SendGridClient),
+    so a throttled batch slows down instead of failing.
+    """
+    semaphore = asyncio.Semaphore(concurrency or EMAIL_FANOUT_CONCURRENCY)
+
+    async def run(item):
+        async with semaphore:
+            try:
+                outcome = await send(item)
+                return {
+                    "recipient": recipient(item),
+                    "success": bool(outcome),
+                    "error": None if outcome else "Provider reported failure",
+                }
+            except Exception as e:
+                return {"recipient": recipient(item), "success": False, "error": str(e)}
+
+    return await asyncio.gather(*(run(item) for item in items))
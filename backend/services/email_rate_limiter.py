@@ -0,0 +1,88 @@
+import asyncio
+import os
+from time import monotonic
+
+EMAIL_RATE_LIMITS = {
+    # provider: (messages per second, burst). A rate of 0 disables limiting.
+    "smtp": (
+        float(os.getenv("EMAIL_RATE_LIMIT_SMTP", 5)),
+        int(os.getenv("EMAIL_RATE_BURST_SMTP", 10)),
+    ),
+    "sendgrid": (
+        float(os.getenv("EMAIL_RATE_LIMIT_SENDGRID", 10)),
+        int(os.getenv("EMAIL_RATE_BURST_SENDGRID", 50)),
+    ),
+}
+
+
+class TokenBucket:
+    """
+    Async token bucket that makes callers wait for budget instead of failing.
+
+    Waiters are served in arrival order. A request for more tokens than
+    the burst size is allowed and leaves the bucket in debt, so a large
+    batch delays the traffic behind it rather than being rejected.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = max(capacity, 1)
+        self._tokens = float(self.capacity)
+        self._updated = monotonic()
+        self._lock = asyncio.Lock()
+
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.acquired = 0       # tokens
+        self.acquires = 0       # acquire() calls
+        self.delayed = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def _refill(self):
+        now = monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, tokens: int = 1) -> float:
+        """Wait until `tokens` are available; returns the seconds spent waiting."""
+        if self.rate <= 0:
+            return 0.0
+
+        start = monotonic()
+        self.queue_depth += 1
+        self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+        try:
+            async with self._lock:
+                self._refill()
+                needed = min(tokens, self.capacity)
+                if self._tokens < needed:
+                    await asyncio.sleep((needed - self._tokens) / self.rate)
+                    self._refill()
+                self._tokens -= tokens
+        finally:
+            self.queue_depth -= 1
+
+        waited = monotonic() - start
+        self.acquired += tokens
+        self.acquires += 1
+        if waited > 0.001:
+            self.delayed += 1
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+        return waited
+
+    def stats(self) -> dict:
+        calls = self.acquires or 1
+        return {
+            "rate_per_sec": self.rate,
+            "burst": self.capacity,
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "acquired": self.acquired,
+            "acquires": self.acquires,
+            "delayed": self.delayed,
+            "total_wait_seconds": round(self.total_wait, 3),
+            "max_wait_ms": round(self.max_wait * 1000, 1),
+            "avg_wait_ms": round(self.total_wait * 1000 / calls, 2),
+        }
@@ -0,0 +1,50 @@
+import os
+from typing import Tuple
+
+from jinja2 import Environment, FileSystemLoader, StrictUndefined, select_autoescape
+
+EMAIL_TEMPLATES_DIR = os.getenv(
+    "EMAIL_TEMPLATES_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "templates", "email")
+)
+
+# auto_reload is off so a template is compiled once per process and the
+# compiled code is reused for every send; .html is autoescaped, .txt is not.
+template_env = Environment(
+    loader=FileSystemLoader(EMAIL_TEMPLATES_DIR),
+    autoescape=select_autoescape(enabled_extensions=("html",), default_for_string=True),
+    auto_reload=False,
+    cache_size=-1,
+    undefined=StrictUndefined,
+    keep_trailing_newline=True,
+)
+
+EMAIL_TEMPLATES = (
+    "signing_request",
+    "document_signed",
+    "signer_download",
+    "signed_pdf",
+    "document_rejected",
+    "password_reset",
+    "reminder_digest",
+)
+
+
+def render_email_part(name: str, extension: str, **context) -> str:
+    context.setdefault("routed_from", None)
+    return template_env.get_template(f"{name}.{extension}").render(context)
+
+
+def render_email(name: str, **context) -> Tuple[str, str]:
+    """
+    Render the HTML and plain-text parts of an email template.
+    Missing context variables raise instead of rendering blank.
+    """
+    return render_email_part(name, "html", **context), render_email_part(name, "txt", **context)
+
+
+def warm_email_templates():
+    """Compile every email template up front so the first send doesn't pay for it."""
+    for name in EMAIL_TEMPLATES:
+        template_env.get_template(f"{name}.html")
+        template_env.get_template(f"{name}.txt")
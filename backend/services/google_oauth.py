@@ -0,0 +1,195 @@
+import asyncio
+import os
+import re
+from time import monotonic
+from typing import Optional
+
+import httpx
+from dotenv import load_dotenv
+from jose import JWTError, jwt
+
+load_dotenv()
+
+GOOGLE_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID")
+GOOGLE_CLIENT_SECRET = os.getenv("GOOGLE_CLIENT_SECRET")
+GOOGLE_REDIRECT_URI = os.getenv("GOOGLE_REDIRECT_URI", "http://localhost:5173/auth/google/callback")
+
+# Overridable so the flow can run against a local mock OAuth server.
+GOOGLE_AUTH_URL = os.getenv("GOOGLE_AUTH_URL", "https://accounts.google.com/o/oauth2/v2/auth")
+GOOGLE_TOKEN_URL = os.getenv("GOOGLE_TOKEN_URL", "https://oauth2.googleapis.com/token")
+GOOGLE_JWKS_URL = os.getenv("GOOGLE_JWKS_URL", "https://www.googleapis.com/oauth2/v3/certs")
+GOOGLE_ISSUERS = tuple(
+    os.getenv("GOOGLE_ISSUERS", "https://accounts.google.com,accounts.google.com").split(",")
+)
+
+GOOGLE_HTTP_TIMEOUT = float(os.getenv("GOOGLE_HTTP_TIMEOUT", 10))
+GOOGLE_MAX_CONNECTIONS = int(os.getenv("GOOGLE_MAX_CONNECTIONS", 10))
+GOOGLE_JWKS_DEFAULT_TTL = float(os.getenv("GOOGLE_JWKS_DEFAULT_TTL", 3600))
+
+
+class GoogleOAuthError(Exception):
+    def __init__(self, detail: str, status_code: Optional[int] = None):
+        super().__init__(detail)
+        self.detail = detail
+        self.status_code = status_code
+
+
+class GoogleOAuthClient:
+    """
+    Async client for the authorization-code flow.
+
+    One pooled httpx.AsyncClient is reused for the token exchange and JWKS
+    fetches. The id_token returned with the tokens is verified locally
+    against Google's signing keys, which are cached for as long as the
+    JWKS response's Cache-Control allows, so a login costs one round-trip.
+    """
+
+    def __init__(
+            self,
+            client_id: str,
+            client_secret: str,
+            redirect_uri: str,
+            token_url: str = GOOGLE_TOKEN_URL,
+            jwks_url: str = GOOGLE_JWKS_URL,
+            issuers: tuple = GOOGLE_ISSUERS,
+            timeout: float = GOOGLE_HTTP_TIMEOUT,
+            max_connections: int = GOOGLE_MAX_CONNECTIONS
+    ):
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.redirect_uri = redirect_uri
+        self.token_url = token_url
+        self.jwks_url = jwks_url
+        self.issuers = issuers
+
+        self._client = httpx.AsyncClient(
+            timeout=httpx.Timeout(timeout),
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+                keepalive_expiry=30.0,
+            ),
+        )
+        self._keys = {}
+        self._keys_expire_at = 0.0
+        self._keys_lock = asyncio.Lock()
+
+        self.code_exchanges = 0
+        self.jwks_fetches = 0
+        self.verification_failures = 0
+
+    async def exchange_code(self, code: str) -> dict:
+        response = await self._client.post(self.token_url, data={
+            "code": code,
+            "client_id": self.client_id,
+            "client_secret": self.client_secret,
+            "redirect_uri": self.redirect_uri,
+            "grant_type": "authorization_code",
+        })
+        self.code_exchanges += 1
+
+        if response.status_code != 200:
+            try:
+                description = response.json().get("error_description", "Unknown error")
+            except ValueError:
+                description = "Unknown error"
+            raise GoogleOAuthError(f"Google token exchange failed: {description}", response.status_code)
+
+        return response.json()
+
+    async def _fetch_keys(self):
+        response = await self._client.get(self.jwks_url)
+        response.raise_for_status()
+        self.jwks_fetches += 1
+
+        ttl = GOOGLE_JWKS_DEFAULT_TTL
+        match = re.search(r"max-age=(\d+)", response.headers.get("cache-control", ""))
+        if match:
+            ttl = int(match.group(1))
+
+        self._keys = {key["kid"]: key for key in response.json().get("keys", [])}
+        self._keys_expire_at = monotonic() + ttl
+
+    async def get_signing_key(self, kid: str) -> Optional[dict]:
+        """
+        Signing key by id. An unknown kid forces one refresh, which is how
+        key rotation shows up before the cached set has expired.
+        """
+        if kid in self._keys and monotonic() < self._keys_expire_at:
+            return self._keys[kid]
+
+        async with self._keys_lock:
+            if kid not in self._keys or monotonic() >= self._keys_expire_at:
+                await self._fetch_keys()
+        return self._keys.get(kid)
+
+    async def verify_id_token(self, id_token: str) -> dict:
+        try:
+            header = jwt.get_unverified_header(id_token)
+            key = await self.get_signing_key(header.get("kid"))
+            if key is None:
+                raise GoogleOAuthError("Unknown ID token signing key")
+
+            claims = jwt.decode(
+                id_token,
+                key,
+                algorithms=[key.get("alg", "RS256")],
+                audience=self.client_id,
+                issuer=self.issuers,
+                options={"verify_at_hash": False},
+            )
+        except JWTError as e:
+            self.verification_failures += 1
+            raise GoogleOAuthError(f"Invalid ID token: {e}")
+        except GoogleOAuthError:
+            self.verification_failures += 1
+            raise
+
+        if not claims.get("email") or not claims.get("email_verified"):
+            self.verification_failures += 1
+            raise GoogleOAuthError("Google account email is not verified")
+
+        return claims
+
+    async def authenticate(self, code: str) -> dict:
+        """Exchange an authorization code and return the verified ID token claims."""
+        tokens = await self.exchange_code(code)
+        if "id_token" not in tokens:
+            raise GoogleOAuthError("Google did not return an ID token; is the 'openid' scope requested?")
+        return await self.verify_id_token(tokens["id_token"])
+
+    async def close(self):
+        await self._client.aclose()
+
+    def stats(self) -> dict:
+        return {
+            "code_exchanges": self.code_exchanges,
+            "jwks_fetches": self.jwks_fetches,
+            "cached_keys": len(self._keys),
+            "verification_failures": self.verification_failures,
+        }
+
+
+_google_oauth_client: Optional[GoogleOAuthClient] = None
+
+
+def get_google_oauth_client() -> GoogleOAuthClient:
+    global _google_oauth_client
+    if _google_oauth_client is None:
+        _google_oauth_client = GoogleOAuthClient(
+            client_id=GOOGLE_CLIENT_ID,
+            client_secret=GOOGLE_CLIENT_SECRET,
+            redirect_uri=GOOGLE_REDIRECT_URI,
+        )
+    return _google_oauth_client
+
+
+async def close_google_oauth_client():
+    global _google_oauth_client
+    if _google_oauth_client is not None:
+        await _google_oauth_client.close()
+        _google_oauth_client = None
+
+
+def get_google_oauth_stats() -> Optional[dict]:
+    return _google_oauth_client.stats() if _google_oauth_client else None
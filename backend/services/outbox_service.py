@@ -0,0 +1,247 @@
+import asyncio
+import json
+import os
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy.orm import Session
+from database import SessionLocal
+from models.email_outbox import EmailOutbox
+from services.email_fanout import fan_out
+from services.signing_links import SignerGone, attach_signing_links
+from services.email_service import (
+    send_signing_request_email,
+    send_document_signed_email,
+    send_signer_download_email,
+    send_signer_download_batch,
+    send_document_rejected_email,
+    send_reminder_digest_email,
+)
+
+OUTBOX_POLL_INTERVAL = float(os.getenv("OUTBOX_POLL_INTERVAL", 5))
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", 20))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", 6))
+OUTBOX_BACKOFF_SECONDS = float(os.getenv("OUTBOX_BACKOFF_SECONDS", 30))
+OUTBOX_MAX_BACKOFF_SECONDS = float(os.getenv("OUTBOX_MAX_BACKOFF_SECONDS", 3600))
+OUTBOX_LEASE_SECONDS = float(os.getenv("OUTBOX_LEASE_SECONDS", 300))
+
+EMAIL_SENDERS = {
+    "signing_request": send_signing_request_email,
+    "document_signed": send_document_signed_email,
+    "signer_download": send_signer_download_email,
+    "signer_download_batch": send_signer_download_batch,
+    "document_rejected": send_document_rejected_email,
+    "reminder_digest": send_reminder_digest_email,
+}
+
+
+def enqueue_email(db: Session, kind: str, recipient: str, **kwargs) -> EmailOutbox:
+    """
+    Stage an email in the outbox. The row is only added to the session;
+    it is committed together with the caller's state change.
+    """
+    if kind not in EMAIL_SENDERS:
+        raise ValueError(f"Unknown email kind: {kind}")
+
+    entry = EmailOutbox(
+        kind=kind,
+        recipient=recipient,
+        payload=json.dumps(kwargs),
+        status="pending",
+        next_attempt_at=datetime.utcnow(),
+    )
+    db.add(entry)
+    return entry
+
+
+def _backoff(attempts: int) -> timedelta:
+    return timedelta(seconds=min(OUTBOX_BACKOFF_SECONDS * 2 ** (attempts - 1), OUTBOX_MAX_BACKOFF_SECONDS))
+
+
+def claim_due_emails(limit: int = OUTBOX_BATCH_SIZE) -> list:
+    """
+    Lease due rows to this worker. Rows left in "sending" by a crashed
+    worker become due again once their lease expires.
+    """
+    db = SessionLocal()
+    try:
+        now = datetime.utcnow()
+        entries = db.query(EmailOutbox).filter(
+            EmailOutbox.status.in_(["pending", "sending"]),
+            EmailOutbox.next_attempt_at <= now
+        ).order_by(EmailOutbox.next_attempt_at).limit(limit).with_for_update(skip_locked=True).all()
+
+        claimed = []
+        for entry in entries:
+            entry.status = "sending"
+            entry.next_attempt_at = now + timedelta(seconds=OUTBOX_LEASE_SECONDS)
+            claimed.append((entry.id, entry.kind, json.loads(entry.payload)))
+
+        db.commit()
+        return claimed
+    finally:
+        db.close()
+
+
+def record_delivery(
+        entry_id: int,
+        success: Optional[bool],
+        error: Optional[str] = None,
+        payload: Optional[dict] = None
+) -> str:
+    db = SessionLocal()
+    try:
+        entry = db.query(EmailOutbox).filter(EmailOutbox.id == entry_id).first()
+        if not entry:
+            return "missing"
+
+        if success is None:
+            entry.status = "cancelled"
+            entry.last_error = error
+        elif success:
+            entry.status = "sent"
+            entry.sent_at = datetime.utcnow()
+            entry.last_error = None
+        else:
+            entry.attempts += 1
+            entry.last_error = error
+            if payload is not None:
+                entry.payload = json.dumps(payload)
+            if entry.attempts >= OUTBOX_MAX_ATTEMPTS:
+                entry.status = "dead"
+            else:
+                entry.status = "pending"
+                entry.next_attempt_at = datetime.utcnow() + _backoff(entry.attempts)
+
+        db.commit()
+        return entry.status
+    finally:
+        db.close()
+
+
+async def deliver_email(kind: str, payload: dict):
+    """
+    Returns (success, error, retry_payload); success is None when the
+    email no longer has a recipient and should be cancelled. Batch
+    senders return per-recipient results; on partial failure
+    retry_payload narrows the row to the recipients that still need
+    the email. Signing links are minted here, never stored in the row.
+    """
+    try:
+        message = await asyncio.to_thread(attach_signing_links, kind, payload)
+    except SignerGone as e:
+        return None, str(e), None
+    except Exception as e:
+        return False, str(e), None
+
+    try:
+        outcome = await EMAIL_SENDERS[kind](**message)
+    except Exception as e:
+        return False, str(e), None
+
+    if isinstance(outcome, list):
+        failed = [r for r in outcome if not r["success"]]
+        if not failed:
+            return True, None, None
+
+        failed_emails = {r["recipient"] for r in failed}
+        error = "; ".join(f"{r['recipient']}: {r['error']}" for r in failed)
+        retry_payload = dict(
+            payload,
+            recipients=[r for r in payload["recipients"] if r["to_email"] in failed_emails]
+        )
+        return False, error, retry_payload
+
+    return bool(outcome), None if outcome else "Provider reported failure", None
+
+
+class OutboxWorker:
+    """
+    Background task that drains the email outbox with retries,
+    exponential backoff and dead-lettering after OUTBOX_MAX_ATTEMPTS.
+    """
+
+    def __init__(self, poll_interval: float = OUTBOX_POLL_INTERVAL):
+        self.poll_interval = poll_interval
+        self._task = None
+        self._loop = None
+        self._wake = None
+        self.delivered = 0
+        self.retried = 0
+        self.dead_lettered = 0
+        self.cancelled = 0
+
+    def start(self):
+        if self._task is None:
+            self._loop = asyncio.get_running_loop()
+            self._wake = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def wake(self):
+        """
+        Ask the worker to poll now instead of waiting for the next tick.
+        Safe to call from request threads after the outbox row is committed.
+        """
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._wake.set)
+
+    async def _process(self, claimed_entry: tuple) -> bool:
+        entry_id, kind, payload = claimed_entry
+        success, error, retry_payload = await deliver_email(kind, payload)
+        status = await asyncio.to_thread(record_delivery, entry_id, success, error, retry_payload)
+
+        if status == "sent":
+            self.delivered += 1
+        elif status == "cancelled":
+            self.cancelled += 1
+            print(f"⚠️  Outbox email {entry_id} ({kind}) cancelled: {error}")
+        elif status == "dead":
+            self.dead_lettered += 1
+            print(f"❌ Outbox email {entry_id} ({kind}) dead-lettered: {error}")
+        else:
+            self.retried += 1
+            print(f"⚠️  Outbox email {entry_id} ({kind}) failed, will retry: {error}")
+
+        return bool(success)
+
+    async def drain_once(self) -> int:
+        claimed = await asyncio.to_thread(claim_due_emails)
+        await fan_out(claimed, self._process, recipient=lambda entry: str(entry[0]))
+        return len(claimed)
+
+    async def _run(self):
+        while True:
+            self._wake.clear()
+            try:
+                processed = await self.drain_once()
+            except Exception as e:
+                print(f"❌ Outbox worker error: {e}")
+                processed = 0
+
+            if processed:
+                continue
+
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def stats(self) -> dict:
+        return {
+            "running": self._task is not None,
+            "delivered": self.delivered,
+            "retried": self.retried,
+            "dead_lettered": self.dead_lettered,
+            "cancelled": self.cancelled,
+        }
+
+
+outbox_worker = OutboxWorker()
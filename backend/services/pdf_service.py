@@ -1,16 +1,188 @@
 import fitz
+import json
 import os
 from datetime import datetime
+from functools import lru_cache
 from io import BytesIO
 from PIL import Image, ImageDraw, ImageFont
+from utils.cache import LRUCache
 import logging
 
 logger = logging.getLogger(__name__)
 
+STROKE_COORD_PRECISION = 3
+STROKE_SIMPLIFY_TOLERANCE = 0.0015
+STROKE_WIDTH_RATIO = 0.04
+MAX_STROKE_POINTS = 20000
+SIGNATURE_IMAGE_CACHE_SIZE = int(os.getenv("SIGNATURE_IMAGE_CACHE_SIZE", 128))
+TEXT_SIGNATURE_CACHE_SIZE = int(os.getenv("TEXT_SIGNATURE_CACHE_SIZE", 512))
+TEXT_SIGNATURE_CACHE_BYTES = int(os.getenv("TEXT_SIGNATURE_CACHE_BYTES", 16 * 1024 * 1024))
+
+FONT_PATHS = [
+    "C:/Windows/Fonts/BRUSHSCI.TTF",
+    "C:/Windows/Fonts/FREESCPT.TTF",
+    "C:/Windows/Fonts/MISTRAL.TTF",
+    "/usr/share/fonts/truetype/liberation/LiberationSerif-Italic.ttf",
+    "/System/Library/Fonts/Supplemental/Bradley Hand Bold.ttf",
+]
+
+# Rendered text-signature PNGs, shared across documents within this worker.
+text_signature_cache = LRUCache(
+    max_entries=TEXT_SIGNATURE_CACHE_SIZE,
+    max_bytes=TEXT_SIGNATURE_CACHE_BYTES,
+)
+
+
+@lru_cache(maxsize=SIGNATURE_IMAGE_CACHE_SIZE)
+def _read_signature_image(path: str, mtime_ns: int) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def load_signature_image(path: str) -> bytes:
+    """
+    Read signature image bytes, reusing the cached copy until the file changes.
+    Saved signature assets are shared by many documents, so they stay warm.
+    """
+    return _read_signature_image(path, os.stat(path).st_mtime_ns)
+
+
+def _simplify_stroke(points: list, tolerance: float) -> list:
+    # Iterative Douglas-Peucker: keep only points that bend the line.
+    if len(points) < 3:
+        return points
+
+    keep = [False] * len(points)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+
+    while stack:
+        first, last = stack.pop()
+        (x1, y1), (x2, y2) = points[first], points[last]
+        dx, dy = x2 - x1, y2 - y1
+        length = (dx * dx + dy * dy) ** 0.5
+
+        max_dist, index = 0.0, None
+        for i in range(first + 1, last):
+            px, py = points[i]
+            if length:
+                dist = abs(dy * px - dx * py + x2 * y1 - y2 * x1) / length
+            else:
+                dist = ((px - x1) ** 2 + (py - y1) ** 2) ** 0.5
+            if dist > max_dist:
+                max_dist, index = dist, i
+
+        if index is not None and max_dist > tolerance:
+            keep[index] = True
+            stack.append((first, index))
+            stack.append((index, last))
+
+    return [point for point, kept in zip(points, keep) if kept]
+
+
+def normalize_signature_strokes(strokes) -> str:
+    """
+    Validate canvas strokes and encode them compactly for storage.
+
+    Each stroke is a flat list of alternating x/y values normalized to the
+    canvas box (0..1), e.g. [x0, y0, x1, y1, ...]. Points are clamped,
+    rounded and simplified before being returned as a JSON string.
+    """
+    if not isinstance(strokes, list) or not strokes:
+        raise ValueError("Signature strokes must be a non-empty list")
+
+    encoded = []
+    total_points = 0
+    for stroke in strokes:
+        if not isinstance(stroke, list) or len(stroke) < 2 or len(stroke) % 2 != 0:
+            raise ValueError("Each stroke must be a flat list of x/y pairs")
+
+        total_points += len(stroke) // 2
+        if total_points > MAX_STROKE_POINTS:
+            raise ValueError(f"Signature exceeds {MAX_STROKE_POINTS} points")
+
+        points = []
+        for i in range(0, len(stroke), 2):
+            point = (
+                round(max(0.0, min(1.0, float(stroke[i]))), STROKE_COORD_PRECISION),
+                round(max(0.0, min(1.0, float(stroke[i + 1]))), STROKE_COORD_PRECISION),
+            )
+            if not points or points[-1] != point:
+                points.append(point)
+
+        encoded.append([
+            value
+            for point in _simplify_stroke(points, STROKE_SIMPLIFY_TOLERANCE)
+            for value in point
+        ])
+
+    return json.dumps(encoded, separators=(",", ":"))
+
+
+def draw_signature_strokes(page, rect, strokes, color=(0, 0, 0)):
+    """
+    Draw stored strokes onto a page as vector paths scaled into rect.
+    """
+    if isinstance(strokes, str):
+        strokes = json.loads(strokes)
+
+    shape = page.new_shape()
+    for stroke in strokes:
+        points = [
+            (rect.x0 + stroke[i] * rect.width, rect.y0 + stroke[i + 1] * rect.height)
+            for i in range(0, len(stroke) - 1, 2)
+        ]
+        if not points:
+            continue
+        if len(points) == 1:
+            points.append(points[0])
+        shape.draw_polyline(points)
+
+    # One finish() strokes every polyline with a single set of operators.
+    shape.finish(
+        color=color,
+        width=max(0.75, rect.height * STROKE_WIDTH_RATIO),
+        closePath=False,
+        lineCap=1,
+        lineJoin=1,
+    )
+    shape.commit()
+
+
+@lru_cache(maxsize=1)
+def _available_font_paths() -> tuple:
+    return tuple(path for path in FONT_PATHS if os.path.exists(path))
+
+
+def _load_signature_font(font_size: int):
+    for font_path in _available_font_paths():
+        try:
+            return ImageFont.truetype(font_path, font_size)
+        except:
+            continue
+
+    return ImageFont.load_default()
+
 
 def create_signature_image_from_text(text: str, width: int, height: int, font_name: str = "cursive",
                                      signature_type: str = "signature"):
 
+    cache_key = (text, width, height, font_name, signature_type)
+    cached = text_signature_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    image_bytes = _render_text_signature(text, width, height, signature_type)
+    text_signature_cache.set(cache_key, image_bytes)
+    return image_bytes
+
+
+def get_text_signature_cache_stats() -> dict:
+    return text_signature_cache.stats()
+
+
+def _render_text_signature(text: str, width: int, height: int, signature_type: str) -> bytes:
+
     img = Image.new('RGBA', (width, height), color=(255, 255, 255, 0))
     draw = ImageDraw.Draw(img)
 
@@ -21,28 +193,7 @@ def create_signature_image_from_text(text: str, width: int, height: int, font_na
     else:
         font_size = int(height * 0.6)
 
-    try:
-        font_paths = [
-            "C:/Windows/Fonts/BRUSHSCI.TTF",
-            "C:/Windows/Fonts/FREESCPT.TTF",
-            "C:/Windows/Fonts/MISTRAL.TTF",
-            "/usr/share/fonts/truetype/liberation/LiberationSerif-Italic.ttf",
-            "/System/Library/Fonts/Supplemental/Bradley Hand Bold.ttf",
-        ]
-
-        font = None
-        for font_path in font_paths:
-            if os.path.exists(font_path):
-                try:
-                    font = ImageFont.truetype(font_path, font_size)
-                    break
-                except:
-                    continue
-
-        if not font:
-            font = ImageFont.load_default()
-    except:
-        font = ImageFont.load_default()
+    font = _load_signature_font(font_size)
 
     bbox = draw.textbbox((0, 0), text, font=font)
     text_width = bbox[2] - bbox[0]
@@ -69,6 +220,7 @@ def generate_signed_pdf(original_pdf_path: str, signatures: list, output_path: s
         logger.info(f"PDF opened successfully. Pages: {len(doc)}")
 
         signed_count = 0
+        embedded_images = {}
 
         for sig in signatures:
             if sig.status != "signed":
@@ -91,9 +243,20 @@ def generate_signed_pdf(original_pdf_path: str, signatures: list, output_path: s
             sig_rect = fitz.Rect(x, y, x + width, y + height)
             try:
 
-                if sig.signature_image_path and os.path.exists(sig.signature_image_path):
+                if sig.signature_strokes:
+                    logger.info(f"Drawing vector signature strokes for sig {sig.id}")
+                    draw_signature_strokes(page, sig_rect, sig.signature_strokes)
+                    signed_count += 1
+
+                elif sig.signature_image_path and os.path.exists(sig.signature_image_path):
                     logger.info(f"Inserting hand-drawn signature from: {sig.signature_image_path}")
-                    page.insert_image(sig_rect, filename=sig.signature_image_path)
+                    xref = embedded_images.get(sig.signature_image_path)
+                    if xref:
+                        page.insert_image(sig_rect, xref=xref)
+                    else:
+                        embedded_images[sig.signature_image_path] = page.insert_image(
+                            sig_rect, stream=load_signature_image(sig.signature_image_path)
+                        )
                     signed_count += 1
 
                 elif sig.signature_text:
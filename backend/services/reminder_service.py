@@ -0,0 +1,128 @@
+import os
+from datetime import datetime, timedelta
+from itertools import groupby
+
+from sqlalchemy import func, or_, update
+from sqlalchemy.orm import aliased
+
+from database import SessionLocal
+from models.document import Document, DocumentStatus
+from models.document_signer import DocumentSigner
+from models.user import User
+from services.outbox_service import enqueue_email, outbox_worker
+from services.scheduler import PeriodicJob
+
+REMINDER_DIGEST_ENABLED = os.getenv("REMINDER_DIGEST_ENABLED", "true").lower() == "true"
+REMINDER_INTERVAL_HOURS = float(os.getenv("REMINDER_INTERVAL_HOURS", 24))
+REMINDER_MIN_AGE_HOURS = float(os.getenv("REMINDER_MIN_AGE_HOURS", 24))
+REMINDER_CHECK_INTERVAL = float(os.getenv("REMINDER_CHECK_INTERVAL", 3600))
+
+
+def find_due_reminders(db, now: datetime) -> list:
+    """
+    One query for every pending signer that is due a reminder.
+
+    A signer is due when their request is older than REMINDER_MIN_AGE_HOURS,
+    they were not reminded in the last REMINDER_INTERVAL_HOURS, their link
+    has not expired, and, for ordered signing, it is their turn.
+    Rows come back sorted by signer_email so they can be grouped in order.
+    """
+    other = aliased(DocumentSigner)
+    current_turn = (
+        db.query(func.min(other.signing_order))
+        .filter(other.document_id == DocumentSigner.document_id, other.status == "pending")
+        .correlate(DocumentSigner)
+        .scalar_subquery()
+    )
+
+    return db.query(DocumentSigner, Document.title, User.name).join(
+        Document, Document.id == DocumentSigner.document_id
+    ).join(
+        User, User.id == Document.owner_id
+    ).filter(
+        DocumentSigner.status == "pending",
+        Document.status == DocumentStatus.PENDING,
+        DocumentSigner.created_at <= now - timedelta(hours=REMINDER_MIN_AGE_HOURS),
+        or_(DocumentSigner.token_expires_at.is_(None), DocumentSigner.token_expires_at > now),
+        or_(
+            DocumentSigner.last_reminded_at.is_(None),
+            DocumentSigner.last_reminded_at <= now - timedelta(hours=REMINDER_INTERVAL_HOURS)
+        ),
+        DocumentSigner.signing_order <= current_turn
+    ).order_by(
+        DocumentSigner.signer_email, DocumentSigner.created_at
+    ).all()
+
+
+def claim_due_reminders(db, rows: list, now: datetime) -> list:
+    """
+    Stamp last_reminded_at with a conditional UPDATE and keep only the
+    rows it actually changed. The reminder job runs in every worker; a
+    second worker that read the same due signers blocks on the row locks
+    and, once the first commits, no longer matches the condition, so
+    each signer is claimed by exactly one run.
+    """
+    if not rows:
+        return rows
+
+    claimed = set(db.execute(
+        update(DocumentSigner).where(
+            DocumentSigner.id.in_([row[0].id for row in rows]),
+            or_(
+                DocumentSigner.last_reminded_at.is_(None),
+                DocumentSigner.last_reminded_at <= now - timedelta(hours=REMINDER_INTERVAL_HOURS)
+            )
+        ).values(last_reminded_at=now).returning(DocumentSigner.id).execution_options(synchronize_session=False)
+    ).scalars())
+    return [row for row in rows if row[0].id in claimed]
+
+
+def send_reminder_digests() -> dict:
+    """
+    Queue one digest email per signer covering all of their pending
+    documents. The signers are claimed and the digests queued in one
+    transaction, so a re-run or a second worker does not remind them again.
+    """
+    db = SessionLocal()
+    try:
+        now = datetime.utcnow()
+        rows = claim_due_reminders(db, find_due_reminders(db, now), now)
+
+        digests = 0
+        for signer_email, group in groupby(rows, key=lambda row: row[0].signer_email):
+            group = list(group)
+            documents = []
+            for signer, document_title, sender_name in group:
+                # The outbox mints each signing_url at delivery.
+                documents.append({
+                    "document_id": signer.document_id,
+                    "document_title": document_title,
+                    "sender_name": sender_name,
+                    "expires_at": signer.token_expires_at.strftime("%B %d, %Y") if signer.token_expires_at else None,
+                })
+
+            enqueue_email(
+                db,
+                "reminder_digest",
+                signer_email,
+                signer_email=signer_email,
+                signer_name=group[0][0].signer_name,
+                documents=documents,
+            )
+            digests += 1
+
+        db.commit()
+        if digests:
+            outbox_worker.wake()
+            print(f"✅ Queued {digests} reminder digest(s) covering {len(rows)} pending request(s)")
+
+        return {"digests": digests, "pending_requests": len(rows)}
+    finally:
+        db.close()
+
+
+reminder_digest_job = PeriodicJob(
+    "reminder_digest",
+    REMINDER_CHECK_INTERVAL if REMINDER_DIGEST_ENABLED else 0,
+    send_reminder_digests,
+)
@@ -0,0 +1,70 @@
+import os
+import uuid
+from io import BytesIO
+from PIL import Image
+from sqlalchemy.orm import Session
+
+from models.saved_signature import SavedSignature
+from models.signature import Signature
+
+SIGNATURES_DIR = "./signatures"
+SAVED_SIGNATURES_DIR = os.path.join(SIGNATURES_DIR, "saved")
+SAVED_SIGNATURE_KINDS = ("signature", "initials")
+SAVED_SIGNATURE_PADDING = 4
+
+
+def normalize_signature_image(image_data: bytes) -> bytes:
+    """
+    Convert an uploaded signature to an RGBA PNG cropped to its ink,
+    so every later embed reuses the same small asset.
+    """
+    img = Image.open(BytesIO(image_data)).convert("RGBA")
+
+    bbox = img.getchannel("A").getbbox()
+    if bbox:
+        left, top, right, bottom = bbox
+        img = img.crop((
+            max(0, left - SAVED_SIGNATURE_PADDING),
+            max(0, top - SAVED_SIGNATURE_PADDING),
+            min(img.width, right + SAVED_SIGNATURE_PADDING),
+            min(img.height, bottom + SAVED_SIGNATURE_PADDING),
+        ))
+
+    out = BytesIO()
+    img.save(out, format="PNG", optimize=True)
+    return out.getvalue()
+
+
+def store_saved_signature_image(user_id: int, image_data: bytes) -> str:
+    os.makedirs(SAVED_SIGNATURES_DIR, exist_ok=True)
+
+    image_path = os.path.join(SAVED_SIGNATURES_DIR, f"user_{user_id}_{uuid.uuid4().hex}.png")
+    with open(image_path, "wb") as f:
+        f.write(normalize_signature_image(image_data))
+
+    return image_path
+
+
+def is_saved_signature_asset(path: str) -> bool:
+    if not path:
+        return False
+    saved_dir = os.path.abspath(SAVED_SIGNATURES_DIR)
+    return os.path.commonpath([os.path.abspath(path), saved_dir]) == saved_dir
+
+
+def remove_signature_image(db: Session, path: str):
+    """
+    Delete a signature image once nothing references it; call after the
+    referencing rows are committed away. Saved profile assets are shared
+    by the profile and every field it was applied to, so they go with
+    the last of those.
+    """
+    if not path:
+        return
+    if is_saved_signature_asset(path):
+        if db.query(SavedSignature.id).filter(SavedSignature.image_path == path).first():
+            return
+        if db.query(Signature.id).filter(Signature.signature_image_path == path).first():
+            return
+    if os.path.exists(path):
+        os.remove(path)
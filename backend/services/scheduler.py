@@ -0,0 +1,64 @@
+import asyncio
+from datetime import datetime
+from typing import Callable, Optional
+
+
+class PeriodicJob:
+    """
+    Runs a synchronous job in a worker thread every `interval` seconds
+    for the lifetime of the app. Jobs must be idempotent: every worker
+    process runs its own schedule, so the job itself has to decide what
+    is due (e.g. from timestamps in the database).
+    """
+
+    def __init__(self, name: str, interval: float, job: Callable[[], object], initial_delay: float = 60.0):
+        self.name = name
+        self.interval = interval
+        self.job = job
+        self.initial_delay = initial_delay
+        self._task = None
+
+        self.runs = 0
+        self.failures = 0
+        self.last_run_at: Optional[datetime] = None
+        self.last_result = None
+
+    def start(self):
+        if self._task is None and self.interval > 0:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def run_once(self):
+        try:
+            self.last_result = await asyncio.to_thread(self.job)
+            self.runs += 1
+        except Exception as e:
+            self.failures += 1
+            print(f"❌ Scheduled job '{self.name}' failed: {e}")
+        finally:
+            self.last_run_at = datetime.utcnow()
+        return self.last_result
+
+    async def _run(self):
+        await asyncio.sleep(self.initial_delay)
+        while True:
+            await self.run_once()
+            await asyncio.sleep(self.interval)
+
+    def stats(self) -> dict:
+        return {
+            "running": self._task is not None,
+            "interval_seconds": self.interval,
+            "runs": self.runs,
+            "failures": self.failures,
+            "last_run_at": self.last_run_at.isoformat() if self.last_run_at else None,
+            "last_result": self.last_result,
+        }
@@ -0,0 +1,104 @@
+import asyncio
+from time import monotonic
+from typing import Optional
+
+import httpx
+
+
+class SendGridError(Exception):
+    def __init__(self, status_code: int, body: str, retry_after: Optional[float] = None):
+        super().__init__(f"SendGrid returned {status_code}: {body[:200]}")
+        self.status_code = status_code
+        self.body = body
+        self.retry_after = retry_after
+
+
+class SendGridClient:
+    """
+    Async client for the SendGrid v3 mail/send endpoint.
+
+    A single httpx.AsyncClient is kept open so consecutive sends reuse
+    keep-alive connections instead of doing a TLS handshake per email.
+    base_url can point at a local mock server.
+
+    A 429 pauses every caller sharing the client until Retry-After has
+    passed, then the request is retried (up to max_retries times), so a
+    concurrent fan-out backs off together instead of hammering the API.
+    """
+
+    def __init__(
+            self,
+            api_key: str,
+            base_url: str = "https://api.sendgrid.com",
+            timeout: float = 10.0,
+            connect_timeout: float = 5.0,
+            max_connections: int = 10,
+            max_retries: int = 3,
+            default_retry_after: float = 1.0
+    ):
+        self._client = httpx.AsyncClient(
+            base_url=base_url,
+            headers={
+                "Authorization": f"Bearer {api_key}",
+                "Content-Type": "application/json",
+            },
+            timeout=httpx.Timeout(timeout, connect=connect_timeout),
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+                keepalive_expiry=30.0,
+            ),
+        )
+        self.max_retries = max_retries
+        self.default_retry_after = default_retry_after
+        self._paused_until = 0.0
+
+        self.requests_sent = 0
+        self.failures = 0
+        self.rate_limited = 0
+
+    async def _wait_if_paused(self):
+        delay = self._paused_until - monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def send(self, payload: dict) -> int:
+        for attempt in range(self.max_retries + 1):
+            await self._wait_if_paused()
+
+            try:
+                response = await self._client.post("/v3/mail/send", json=payload)
+            except httpx.HTTPError:
+                # Timeouts and connection errors count as failures too.
+                self.failures += 1
+                raise
+            self.requests_sent += 1
+
+            if response.status_code < 400:
+                return response.status_code
+
+            retry_after = response.headers.get("Retry-After")
+            error = SendGridError(
+                response.status_code,
+                response.text,
+                float(retry_after) if retry_after and retry_after.isdigit() else None,
+            )
+
+            if response.status_code == 429 and attempt < self.max_retries:
+                self.rate_limited += 1
+                delay = error.retry_after or self.default_retry_after * 2 ** attempt
+                self._paused_until = max(self._paused_until, monotonic() + delay)
+                continue
+
+            self.failures += 1
+            raise error
+
+    async def close(self):
+        await self._client.aclose()
+
+    def stats(self) -> dict:
+        return {
+            "requests_sent": self.requests_sent,
+            "failures": self.failures,
+            "rate_limited": self.rate_limited,
+        }
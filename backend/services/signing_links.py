@@ -0,0 +1,133 @@
+import os
+from datetime import datetime, timedelta
+
+from sqlalchemy.orm import Session
+
+from database import SessionLocal
+from models.document_signer import DocumentSigner
+from models.signing_link import SigningLink
+from services.email_service import (
+    BACKEND_URL, FRONTEND_URL, SIGNING_TOKEN_EXPIRE_HOURS, generate_signing_token
+)
+from services.signing_token_cache import token_digest, verified_tokens
+
+SIGNING_LINKS_PER_SIGNER = int(os.getenv("SIGNING_LINKS_PER_SIGNER", 50))
+
+
+class SignerGone(LookupError):
+    """The signer an outbox email was queued for no longer exists."""
+
+
+def issue_signing_link(db: Session, signer: DocumentSigner) -> str:
+    """
+    Mint a signing link for this signer and record its digest, so the
+    link resolves to exactly this row. The caller commits before the
+    link leaves the process. Expired links are pruned, and only the
+    newest SIGNING_LINKS_PER_SIGNER stay valid.
+    """
+    if signer.id is None:
+        db.flush()
+
+    now = datetime.utcnow()
+    token = generate_signing_token(signer.document_id, signer.signer_email)
+    db.add(SigningLink(
+        digest=token_digest(token),
+        signer_id=signer.id,
+        expires_at=now + timedelta(hours=SIGNING_TOKEN_EXPIRE_HOURS),
+    ))
+
+    db.query(SigningLink).filter(
+        SigningLink.signer_id == signer.id,
+        SigningLink.expires_at <= now
+    ).delete(synchronize_session=False)
+
+    stale = db.query(SigningLink.digest).filter(
+        SigningLink.signer_id == signer.id
+    ).order_by(SigningLink.created_at.desc()).offset(SIGNING_LINKS_PER_SIGNER).all()
+    if stale:
+        db.query(SigningLink).filter(
+            SigningLink.digest.in_([digest for (digest,) in stale])
+        ).delete(synchronize_session=False)
+
+    return token
+
+
+def revoke_signing_links(db: Session, document_id: int, signer_email: str = None) -> int:
+    """
+    Invalidate every link issued so far for this document, or for one of
+    its signers, e.g. after they reject it or when the request is re-sent.
+    The rows are deleted in the caller's transaction, so every worker
+    stops accepting the links once it commits.
+    """
+    query = db.query(SigningLink.digest).join(
+        DocumentSigner, DocumentSigner.id == SigningLink.signer_id
+    ).filter(DocumentSigner.document_id == document_id)
+    if signer_email is not None:
+        query = query.filter(DocumentSigner.signer_email == signer_email)
+
+    digests = [digest for (digest,) in query.all()]
+    if digests:
+        db.query(SigningLink).filter(SigningLink.digest.in_(digests)).delete(synchronize_session=False)
+        for digest in digests:
+            verified_tokens.pop(digest)
+
+    return len(digests)
+
+
+def _find_signer(db: Session, document_id: int, signer_email: str):
+    return db.query(DocumentSigner).filter(
+        DocumentSigner.document_id == document_id,
+        DocumentSigner.signer_email == signer_email
+    ).first()
+
+
+def attach_signing_links(kind: str, payload: dict) -> dict:
+    """
+    Outbox payloads never carry links. Right before delivery, mint the
+    links an email needs and return the payload to send; the stored row
+    keeps the link-free original for retries. Raises SignerGone when
+    nobody is left to send to.
+    """
+    if kind not in ("signing_request", "reminder_digest", "signer_download_batch"):
+        return payload
+
+    db = SessionLocal()
+    try:
+        if kind == "signing_request":
+            signer = _find_signer(db, payload["document_id"], payload["signer_email"])
+            if signer is None:
+                raise SignerGone(f"{payload['signer_email']} is no longer a signer")
+            message = dict(payload, token=issue_signing_link(db, signer))
+
+        elif kind == "reminder_digest":
+            documents = []
+            for document in payload["documents"]:
+                signer = _find_signer(db, document["document_id"], payload["signer_email"])
+                if signer is None or signer.status != "pending":
+                    continue
+                token = issue_signing_link(db, signer)
+                entry = {key: value for key, value in document.items() if key != "document_id"}
+                documents.append(dict(entry, signing_url=f"{FRONTEND_URL}/sign/{token}"))
+            if not documents:
+                raise SignerGone(f"{payload['signer_email']} has nothing left to sign")
+            message = dict(payload, documents=documents)
+
+        else:
+            recipients = []
+            for recipient in payload["recipients"]:
+                signer = _find_signer(db, payload["document_id"], recipient["to_email"])
+                if signer is None:
+                    continue
+                token = issue_signing_link(db, signer)
+                recipients.append(dict(
+                    recipient,
+                    download_url=f"{BACKEND_URL}/api/documents/public/{token}/download-signed"
+                ))
+            if not recipients:
+                raise SignerGone("None of the signers exist anymore")
+            message = {"document_title": payload["document_title"], "recipients": recipients}
+
+        db.commit()
+        return message
+    finally:
+        db.close()
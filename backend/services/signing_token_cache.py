@@ -0,0 +1,39 @@
+import hashlib
+import os
+import time
+from typing import Optional
+
+from utils.cache import LRUCache
+
+SIGNING_TOKEN_CACHE_SIZE = int(os.getenv("SIGNING_TOKEN_CACHE_SIZE", 4096))
+
+# Verified payloads keyed by sha256(token), so raw links are never held
+# as cache keys. Only successfully verified tokens are cached.
+verified_tokens = LRUCache(max_entries=SIGNING_TOKEN_CACHE_SIZE)
+
+def token_digest(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def get_cached_payload(digest: str) -> Optional[dict]:
+    """
+    Cached payload for a token digest, or None if it was never verified
+    or has expired. Revocation is enforced by the signing_links lookup.
+    """
+    payload = verified_tokens.get(digest)
+    if payload is None:
+        return None
+
+    if payload.get("exp", 0) <= time.time():
+        verified_tokens.pop(digest)
+        return None
+
+    return payload
+
+
+def cache_payload(digest: str, payload: dict):
+    verified_tokens.set(digest, payload)
+
+
+def get_signing_token_cache_stats() -> dict:
+    return verified_tokens.stats()
@@ -0,0 +1,207 @@
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+from time import monotonic
+from typing import Optional
+
+import aiosmtplib
+
+# Failures that leave the session unusable. SMTPServerDisconnected and
+# SMTPConnectError are ConnectionErrors; a read timeout mid-command
+# leaves the session in an unknown state.
+CONNECTION_ERRORS = (ConnectionError, aiosmtplib.SMTPTimeoutError)
+
+
+class _PooledSMTP(aiosmtplib.SMTP):
+    """
+    Records whether the current message reached DATA. Once it has, a
+    dropped connection may still have delivered it, so it is not resent.
+    """
+    data_started = False
+
+    async def data(self, message, **kwargs):
+        self.data_started = True
+        return await super().data(message, **kwargs)
+
+
+class SMTPConnectionPool:
+    """
+    Bounded pool of authenticated SMTP connections.
+
+    Connections are reused across messages so a fan-out pays the
+    TCP + STARTTLS + AUTH handshake once per connection instead of once
+    per recipient. Idle connections are health-checked with NOOP before
+    reuse and dropped when stale; a send whose connection fails before
+    DATA is retried once on a fresh one.
+    """
+
+    def __init__(
+            self,
+            hostname: str,
+            port: int,
+            username: Optional[str] = None,
+            password: Optional[str] = None,
+            start_tls: bool = True,
+            max_size: int = 4,
+            idle_timeout: float = 60.0,
+            health_check_interval: float = 15.0,
+            timeout: float = 30.0
+    ):
+        self.hostname = hostname
+        self.port = port
+        self.username = username
+        self.password = password
+        self.start_tls = start_tls
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+        self.timeout = timeout
+
+        self._idle = deque()
+        self._semaphore = asyncio.Semaphore(max_size)
+        self._in_use = 0
+
+        self.connections_opened = 0
+        self.connections_reused = 0
+        self.reconnects = 0
+        self.messages_sent = 0
+
+    async def _connect(self) -> _PooledSMTP:
+        client = _PooledSMTP(
+            hostname=self.hostname,
+            port=self.port,
+            username=self.username,
+            password=self.password,
+            start_tls=self.start_tls,
+            timeout=self.timeout,
+        )
+        await client.connect()
+        self.connections_opened += 1
+        return client
+
+    async def _discard(self, client: aiosmtplib.SMTP):
+        try:
+            if client.is_connected:
+                await client.quit()
+        except Exception:
+            client.close()
+
+    async def _acquire(self) -> aiosmtplib.SMTP:
+        while self._idle:
+            client, last_used = self._idle.pop()
+            idle_for = monotonic() - last_used
+
+            if not client.is_connected or idle_for > self.idle_timeout:
+                await self._discard(client)
+                continue
+
+            if idle_for > self.health_check_interval:
+                try:
+                    await client.noop()
+                except aiosmtplib.SMTPException:
+                    await self._discard(client)
+                    continue
+
+            self.connections_reused += 1
+            return client
+
+        return await self._connect()
+
+    def _release(self, client: _PooledSMTP):
+        if client.is_connected:
+            self._idle.append((client, monotonic()))
+
+    @asynccontextmanager
+    async def connection(self):
+        """
+        Borrow a live connection. It goes back to the pool unless the
+        block failed at the connection level; a server reply such as a
+        refused recipient leaves the session usable (sendmail has RSET it).
+        """
+        async with self._semaphore:
+            client = await self._acquire()
+            client.data_started = False
+            self._in_use += 1
+            try:
+                yield client
+            except (aiosmtplib.SMTPResponseException, aiosmtplib.SMTPRecipientsRefused) as e:
+                if getattr(e, "code", None) == 421:
+                    await self._discard(client)
+                else:
+                    self._release(client)
+                raise
+            except BaseException:
+                await self._discard(client)
+                raise
+            else:
+                self._release(client)
+            finally:
+                self._in_use -= 1
+
+    async def send_message(self, message):
+        for attempt in range(2):
+            client = None
+            try:
+                async with self.connection() as client:
+                    response = await client.send_message(message)
+                self.messages_sent += 1
+                return response
+            except CONNECTION_ERRORS:
+                if attempt or (client is not None and client.data_started):
+                    raise
+                self.reconnects += 1
+
+    async def send_messages(self, messages: list) -> list:
+        """
+        Send a batch over a single borrowed connection.
+
+        Returns one entry per message: None on success or the error text.
+        A rejected message does not stop the batch. If the connection
+        drops, messages that never reached DATA are retried once on a
+        fresh one; the one in flight during DATA is reported, not resent.
+        """
+        results = [None] * len(messages)
+        pending = list(range(len(messages)))
+
+        for attempt in range(2):
+            try:
+                async with self.connection() as client:
+                    while pending:
+                        index = pending[0]
+                        client.data_started = False
+                        try:
+                            await client.send_message(messages[index])
+                            self.messages_sent += 1
+                        except CONNECTION_ERRORS as e:
+                            if client.data_started:
+                                results[index] = f"Connection lost during DATA, delivery unknown: {e}"
+                                pending.pop(0)
+                            raise
+                        except aiosmtplib.SMTPException as e:
+                            results[index] = str(e)
+                        pending.pop(0)
+                return results
+            except CONNECTION_ERRORS as e:
+                if attempt or not pending:
+                    for index in pending:
+                        results[index] = str(e)
+                    return results
+                self.reconnects += 1
+
+        return results
+
+    async def close(self):
+        while self._idle:
+            client, _ = self._idle.pop()
+            await self._discard(client)
+
+    def stats(self) -> dict:
+        return {
+            "max_size": self.max_size,
+            "idle": len(self._idle),
+            "in_use": self._in_use,
+            "connections_opened": self.connections_opened,
+            "connections_reused": self.connections_reused,
+            "reconnects": self.reconnects,
+            "messages_sent": self.messages_sent,
+        }
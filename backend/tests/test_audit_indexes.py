@@ -0,0 +1,51 @@
+"""
+EXPLAIN the keyset-paginated audit log queries against a freshly created
+schema and check each one is served by its (user_id or document_id, created_at, id) index.
+Runs on SQLite; set TEST_POSTGRES_URL to also check a Postgres database.
+"""
+import os
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
+
+import models  # noqa: F401 - registers every table on Base.metadata
+from check_audit_indexes import INDEX_COLUMNS, QUERIES, check_plans, explain
+from database import Base
+
+TEST_POSTGRES_URL = os.getenv("TEST_POSTGRES_URL")
+
+
+@pytest.fixture(scope="module")
+def sqlite_conn():
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    with engine.connect() as conn:
+        yield conn
+    engine.dispose()
+
+
+@pytest.mark.parametrize("label", list(QUERIES))
+def test_keyset_query_uses_its_index_on_sqlite(sqlite_conn, label):
+    statement, index = QUERIES[label]
+    plan, full_scan = explain(sqlite_conn, statement)
+
+    assert not full_scan, plan
+    assert any(f"USING INDEX {index}" in line or f"USING COVERING INDEX {index}" in line for line in plan), plan
+
+
+def test_every_expected_index_exists_on_the_model():
+    index_names = {index.name for index in models.AuditLog.__table__.indexes}
+    assert set(INDEX_COLUMNS) <= index_names
+    assert "ix_audit_logs_user_created" not in index_names
+
+
+@pytest.mark.skipif(not TEST_POSTGRES_URL, reason="TEST_POSTGRES_URL is not set")
+def test_keyset_queries_use_their_indexes_on_postgres():
+    engine = create_engine(TEST_POSTGRES_URL)
+    Base.metadata.create_all(engine)
+    try:
+        with engine.connect() as conn:
+            assert check_plans(conn) == []
+    finally:
+        engine.dispose()
@@ -0,0 +1,97 @@
+"""
+Re-signing a field replaces its previous content: pdf_service renders
+strokes ahead of the image and text, so stale strokes must not survive.
+"""
+import base64
+import contextlib
+import io
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+with contextlib.redirect_stdout(io.StringIO()):
+    import main
+from database import Base, get_db
+from models import Document, Signature, User
+from models.signature import SignatureStatus
+from utils.security import create_user_access_token
+
+STROKES = [[0.1, 0.1, 0.5, 0.5, 0.9, 0.2]]
+PNG = base64.b64encode(b"\x89PNG\r\n\x1a\n").decode()
+
+
+@pytest.fixture
+def client_and_session(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    TestSession = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+
+    def override_get_db():
+        db = TestSession()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    main.app.dependency_overrides[get_db] = override_get_db
+    yield TestClient(main.app), TestSession
+    main.app.dependency_overrides.pop(get_db, None)
+    engine.dispose()
+
+
+def _placeholder(TestSession):
+    db = TestSession()
+    user = User(name="Owner", email="owner@example.com", password="x")
+    db.add(user)
+    db.commit()
+    document = Document(owner_id=user.id, title="t", original_filename="t.pdf", file_path="t.pdf")
+    db.add(document)
+    db.commit()
+    signature = Signature(
+        document_id=document.id, signer_id=user.id, page_number=1,
+        x_position=10, y_position=10, width=150, height=50, status=SignatureStatus.PENDING
+    )
+    db.add(signature)
+    db.commit()
+    ids = signature.id, create_user_access_token(user)
+    db.close()
+    return ids
+
+
+def _stored(TestSession, signature_id):
+    db = TestSession()
+    try:
+        return db.get(Signature, signature_id)
+    finally:
+        db.close()
+
+
+def test_resign_replaces_previous_content(client_and_session):
+    client, TestSession = client_and_session
+    signature_id, token = _placeholder(TestSession)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    def sign(**body):
+        response = client.post(f"/api/signatures/{signature_id}/sign", json=body, headers=headers)
+        assert response.status_code == 200, response.text
+        return _stored(TestSession, signature_id)
+
+    signature = sign(signature_strokes=STROKES)
+    assert signature.signature_strokes
+
+    signature = sign(signature_text="Owner", signature_font="cursive")
+    assert signature.signature_strokes is None
+    assert signature.signature_text == "Owner"
+
+    signature = sign(signature_image_base64=PNG)
+    assert signature.signature_text is None
+    assert signature.signature_image_path
+
+    signature = sign(signature_strokes=STROKES)
+    assert signature.signature_strokes
+    assert signature.signature_image_path is None
+    assert signature.signature_text is None
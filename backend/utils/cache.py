@@ -0,0 +1,105 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+
+class LRUCache:
+    """
+    Thread-safe LRU cache bounded by entry count and, optionally, total size.
+    With ttl set, entries also expire that many seconds after being stored.
+    Keeps hit/miss counters so callers can report cache effectiveness.
+    """
+
+    def __init__(
+            self,
+            max_entries: int = 256,
+            max_bytes: Optional[int] = None,
+            weigher: Callable[[Any], int] = len,
+            ttl: Optional[float] = None
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.weigher = weigher
+        self.ttl = ttl
+
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default=None):
+        with self._lock:
+            if key not in self._data:
+                self.misses += 1
+                return default
+
+            value, size, expires_at = self._data[key]
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                self._bytes -= size
+                self.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value):
+        size = self.weigher(value) if self.max_bytes else 0
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+
+        with self._lock:
+            if self.max_bytes and size > self.max_bytes:
+                return
+
+            if key in self._data:
+                self._bytes -= self._data.pop(key)[1]
+
+            self._data[key] = (value, size, expires_at)
+            self._bytes += size
+
+            while len(self._data) > self.max_entries or (self.max_bytes and self._bytes > self.max_bytes):
+                _, (_, evicted_size, _) = self._data.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def pop(self, key: Hashable, default=None):
+        with self._lock:
+            if key not in self._data:
+                return default
+            value, size, _ = self._data.pop(key)
+            self._bytes -= size
+            return value
+
+    def pop_matching(self, predicate: Callable[[Any], bool]) -> int:
+        """Drop every entry whose value satisfies predicate; returns how many."""
+        with self._lock:
+            keys = [key for key, (value, _, _) in self._data.items() if predicate(value)]
+            for key in keys:
+                self._bytes -= self._data.pop(key)[1]
+            return len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._data),
+                "max_entries": self.max_entries,
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
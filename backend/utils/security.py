@@ -1,14 +1,36 @@
 from passlib.context import CryptContext
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from jose import JWTError, jwt
-from typing import Optional
+from typing import Optional, Tuple
 import os
 from dotenv import load_dotenv
 
 load_dotenv()
 
 # Password hashing configuration
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# min/max pinned to the configured cost so hashes made with any other cost
+# are reported as needing an update and get rehashed on the next login.
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", 12))
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", min(4, os.cpu_count() or 1)))
+
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=BCRYPT_ROUNDS,
+    bcrypt__min_rounds=BCRYPT_ROUNDS,
+    bcrypt__max_rounds=BCRYPT_ROUNDS,
+)
+
+# bcrypt releases the GIL, so a few dedicated threads hash in parallel.
+# Async handlers await it without holding a request threadpool thread,
+# and its size caps concurrent hashing so a login burst cannot take
+# every CPU or starve the sync endpoints.
+_password_executor = ThreadPoolExecutor(
+    max_workers=PASSWORD_HASH_WORKERS,
+    thread_name_prefix="password-hash",
+)
 
 # JWT configuration
 SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-here")
@@ -16,18 +38,21 @@ ALGORITHM = os.getenv("ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 30))
 
 
-def hash_password(password: str) -> str:
-    """
-    Hash a password using bcrypt
-    Truncates password to 72 bytes to comply with bcrypt limits
-    """
+def _truncate_password(password: str) -> str:
     # Truncate to 72 bytes if needed (bcrypt limitation)
     password_bytes = password.encode('utf-8')
     if len(password_bytes) > 72:
         password_bytes = password_bytes[:72]
         password = password_bytes.decode('utf-8', errors='ignore')
+    return password
+
 
-    return pwd_context.hash(password)
+def hash_password(password: str) -> str:
+    """
+    Hash a password using bcrypt
+    Truncates password to 72 bytes to comply with bcrypt limits
+    """
+    return pwd_context.hash(_truncate_password(password))
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -35,13 +60,34 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     Verify a password against its hash
     Truncates password to 72 bytes to comply with bcrypt limits
     """
-    # Truncate to 72 bytes if needed (bcrypt limitation)
-    password_bytes = plain_password.encode('utf-8')
-    if len(password_bytes) > 72:
-        password_bytes = password_bytes[:72]
-        plain_password = password_bytes.decode('utf-8', errors='ignore')
+    try:
+        return pwd_context.verify(_truncate_password(plain_password), hashed_password)
+    except ValueError:
+        # Not a bcrypt hash (e.g. Google-only accounts)
+        return False
+
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password and, if its hash uses a different cost than
+    BCRYPT_ROUNDS, also return a replacement hash to store.
+    """
+    try:
+        return pwd_context.verify_and_update(_truncate_password(plain_password), hashed_password)
+    except ValueError:
+        return False, None
+
 
-    return pwd_context.verify(plain_password, hashed_password)
+async def hash_password_in_executor(password: str) -> str:
+    """hash_password on the dedicated password executor"""
+    return await asyncio.get_running_loop().run_in_executor(_password_executor, hash_password, password)
+
+
+async def verify_and_update_password_in_executor(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """verify_and_update_password on the dedicated password executor"""
+    return await asyncio.get_running_loop().run_in_executor(
+        _password_executor, verify_and_update_password, plain_password, hashed_password
+    )
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -61,6 +107,19 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
+def create_user_access_token(user) -> str:
+    """
+    Access token that carries enough about the user (id, name, token
+    version) for read-only endpoints to authorize without loading them.
+    """
+    return create_access_token(data={
+        "sub": user.email,
+        "uid": user.id,
+        "name": user.name,
+        "ver": user.token_version or 0,
+    })
+
+
 def verify_token(token: str) -> Optional[dict]:
     """
     Verify and decode a JWT token
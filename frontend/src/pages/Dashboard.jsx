@@ -89,7 +89,7 @@ function Dashboard() {
               return {
                 ...doc,
                 isOwned: false,
-                signingToken: signerForCurrentUser?.signing_token,
+                isSigner: Boolean(signerForCurrentUser),
                 signerStatus: signerForCurrentUser?.status,
                 rejectionReason: signerForCurrentUser?.rejection_reason,
               };
@@ -152,13 +152,20 @@ function Dashboard() {
     }
   };
 
-  const handleSignDocument = (doc) => {
+  // Signing links are minted on demand; listing signers has no side effects.
+  const fetchSigningToken = async (doc) => {
+    const response = await api.post(`/api/documents/${doc.id}/signing-link`);
+    return response.data.signing_token;
+  };
+
+  const handleSignDocument = async (doc) => {
     if (doc.isOwned) {
       navigate(`/document/${doc.id}/sign`);
     } else {
-      if (doc.signingToken) {
-        navigate(`/sign/${doc.signingToken}`);
-      } else {
+      try {
+        if (!doc.isSigner) throw new Error('Not a signer');
+        navigate(`/sign/${await fetchSigningToken(doc)}`);
+      } catch (err) {
         toast.error('Signing link not available. Please contact the document sender.');
       }
     }
@@ -549,7 +556,8 @@ function Dashboard() {
                             if (doc.isOwned) {
                               response = await api.get(`/api/documents/${doc.id}/download-signed`, { responseType: 'blob' });
                             } else {
-                              response = await api.get(`/api/documents/public/${doc.signingToken}/download-signed`, { responseType: 'blob' });
+                              const signingToken = await fetchSigningToken(doc);
+                              response = await api.get(`/api/documents/public/${signingToken}/download-signed`, { responseType: 'blob' });
                             }
                             const blob = new Blob([response.data], { type: 'application/pdf' });
                             const url = window.URL.createObjectURL(blob);